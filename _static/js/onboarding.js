@@ -17,11 +17,55 @@
             medium: 'medium/01_functions_and_modules.html',
             hard: 'hard/01_advanced_functions_and_decorators.html'
         },
-        COLAB_BASE: 'https://colab.research.google.com/github/mykolas-perevicius/Education_Playground/blob/main/'
+        COLAB_BASE: 'https://colab.research.google.com/github/mykolas-perevicius/Education_Playground/blob/main/',
+        // Progress updates within this window are written to localStorage once
+        SAVE_DEBOUNCE_MS: 500,
+        // Deferred work runs when the browser is idle, or after this at the latest
+        IDLE_TIMEOUT_MS: 2000,
+        MODAL_DELAY_MS: 500
     };
 
     let basePath = '/';
 
+    const requestIdle = window.requestIdleCallback
+        ? (callback) => window.requestIdleCallback(callback, { timeout: CONFIG.IDLE_TIMEOUT_MS })
+        : (callback) => setTimeout(callback, 1);
+
+    // Record a User Timing entry (used by tests/test_onboarding_performance.py)
+    function measure(name, start) {
+        if (!window.performance || !performance.measure) return;
+        try {
+            performance.measure(name, { start, end: performance.now() });
+        } catch (err) {
+            // Older browsers only accept mark names; the entry is optional
+        }
+    }
+
+    // Run non-critical tasks in idle periods so they never block first paint
+    // or input on large pages. Each idle callback runs at least one task.
+    function runWhenIdle(tasks) {
+        const queue = tasks.slice();
+        const step = (deadline) => {
+            do {
+                const task = queue.shift();
+                const start = performance.now();
+                try {
+                    task();
+                } catch (err) {
+                    console.error('[onboarding] deferred task failed', err);
+                }
+                measure('onboarding:deferred', start);
+            } while (queue.length && deadline && deadline.timeRemaining() > 0);
+
+            if (queue.length) {
+                requestIdle(step);
+            }
+        };
+        if (queue.length) {
+            requestIdle(step);
+        }
+    }
+
     function computeBasePath() {
         const docOptions = document.getElementById('documentation_options');
         if (docOptions) {
@@ -78,11 +122,32 @@
     // Progress tracking
     class ProgressTracker {
         constructor() {
+            // Last JSON string read from or written to localStorage
+            this.raw = undefined;
+            this.saveTimer = null;
             this.data = this.load();
+
+            // Write pending progress before the page goes away
+            const flush = () => this.flush();
+            window.addEventListener('pagehide', flush);
+            document.addEventListener('visibilitychange', () => {
+                if (document.visibilityState === 'hidden') flush();
+            });
+            // Pick up progress written by other tabs
+            window.addEventListener('storage', (event) => {
+                if (event.key === CONFIG.STORAGE_KEY && this.saveTimer === null) {
+                    this.data = this.load();
+                }
+            });
         }
 
         load() {
             const stored = localStorage.getItem(CONFIG.STORAGE_KEY);
+            // Skip parsing when the stored progress has not changed
+            if (this.data && stored === this.raw) {
+                return this.data;
+            }
+            this.raw = stored;
             const data = stored ? JSON.parse(stored) : {
                 level: null,
                 completedLessons: [],
@@ -110,7 +175,20 @@
         }
 
         save() {
-            localStorage.setItem(CONFIG.STORAGE_KEY, JSON.stringify(this.data));
+            clearTimeout(this.saveTimer);
+            this.saveTimer = setTimeout(() => this.flush(), CONFIG.SAVE_DEBOUNCE_MS);
+        }
+
+        flush() {
+            if (this.saveTimer === null) return;
+            clearTimeout(this.saveTimer);
+            this.saveTimer = null;
+
+            const raw = JSON.stringify(this.data);
+            if (raw !== this.raw) {
+                localStorage.setItem(CONFIG.STORAGE_KEY, raw);
+                this.raw = raw;
+            }
         }
 
         setLevel(level) {
@@ -132,7 +210,9 @@
         }
 
         setLastVisited(path) {
-            this.data.lastVisited = normalizePath(path);
+            const normalized = normalizePath(path);
+            if (this.data.lastVisited === normalized) return;
+            this.data.lastVisited = normalized;
             this.save();
         }
 
@@ -149,8 +229,11 @@
         }
 
         reset() {
+            clearTimeout(this.saveTimer);
+            this.saveTimer = null;
             localStorage.removeItem(CONFIG.STORAGE_KEY);
             localStorage.removeItem(CONFIG.ONBOARDING_KEY);
+            this.data = null;
             this.data = this.load();
         }
     }
@@ -644,22 +727,15 @@
         }
     }
 
-    // Initialize everything when DOM is ready
+    // Initialize everything when DOM is ready. Only what changes the visible
+    // layout runs immediately; the rest waits for an idle period.
     function init() {
+        const start = performance.now();
         basePath = computeBasePath();
         const tracker = new ProgressTracker();
 
-        // Track current page
-        trackPageVisit(tracker);
-
-        // Show onboarding modal on first visit (homepage only)
-        if (window.location.pathname.endsWith('/') ||
-            window.location.pathname.endsWith('index.html') ||
-            window.location.pathname.endsWith('README.html')) {
-            const modal = new OnboardingModal(tracker);
-            // Show after a brief delay for better UX
-            setTimeout(() => modal.show(), 500);
-        }
+        // Fix sidebar toggles (Jupyter Book 1.0 compatibility)
+        syncSidebarToggleTargets();
 
         // Show continue learning banner
         const continueLearning = new ContinueLearning(tracker);
@@ -668,14 +744,24 @@
         // Add mark as complete buttons
         addCompleteButtons(tracker);
 
-        // Fix sidebar toggles (Jupyter Book 1.0 compatibility)
-        syncSidebarToggleTargets();
-
-        // Add mobile navigation
-        addMobileQuickNav();
-
         // Expose reset function globally for debugging
         window.resetProgress = () => tracker.reset();
+        measure('onboarding:critical', start);
+
+        runWhenIdle([
+            // Track current page
+            () => trackPageVisit(tracker),
+            // Add mobile navigation
+            addMobileQuickNav,
+            () => {
+                // Show onboarding modal on first visit (homepage only)
+                if (continueLearning.isHomepage()) {
+                    const modal = new OnboardingModal(tracker);
+                    // Show after a brief delay for better UX
+                    setTimeout(() => requestIdle(() => modal.show()), CONFIG.MODAL_DELAY_MS);
+                }
+            }
+        ]);
     }
 
     // Run when DOM is ready
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""Compare bytes on the wire and load time for the plain and precompressed site.
+
+The built site is served twice on loopback: once as plain files and once with
+the ``.br``/``.gz`` siblings from ``tools/precompress.py``. Every ``_toc.yml``
+page is then fetched from both, either over raw HTTP (page plus its CSS/JS,
+each asset counted once as a browser cache would) or, with ``--browser``,
+through Playwright using the per-page Navigation/Resource Timing metrics.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import re
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Set
+from urllib.parse import urljoin
+from urllib.request import Request, urlopen
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from tools.playwright_utils import collect_page_metrics, load_expected_paths, serve_directory
+from tools.precompress import available_encodings, precompress_site
+
+TOC_PATH = PROJECT_ROOT / "_toc.yml"
+DOCS_ROOT = PROJECT_ROOT / "_build" / "html"
+ACCEPT_ENCODING = "br, gzip"
+_ASSET = re.compile(r'<(?:link|script)\b[^>]*?\b(?:href|src)="([^"#]+\.(?:css|js)(?:\?[^"]*)?)"', re.IGNORECASE)
+
+LOGGER = logging.getLogger("education_playground.playwright.benchmark")
+
+
+def fetch(url: str) -> int:
+    """Return the number of body bytes on the wire (still encoded, if compressed)."""
+    with urlopen(Request(url, headers={"Accept-Encoding": ACCEPT_ENCODING})) as response:
+        return len(response.read())
+
+
+def crawl_http(base_url: str, pages: List[str]) -> Dict[str, float]:
+    """Fetch each page and its not-yet-seen assets; totals bytes and wall time."""
+    seen: Set[str] = set()
+    html_bytes = asset_bytes = 0
+    page_ms: List[float] = []
+    for rel_path in pages:
+        start = time.perf_counter()
+        url = urljoin(base_url, rel_path)
+        html_bytes += fetch(url)
+        # Compressed bodies are not parsed; asset URLs come from the plain file.
+        for asset in _ASSET.findall((DOCS_ROOT / rel_path).read_text(errors="replace")):
+            asset_url = urljoin(url, asset)
+            if asset_url not in seen:
+                seen.add(asset_url)
+                asset_bytes += fetch(asset_url)
+        page_ms.append((time.perf_counter() - start) * 1000)
+    return {
+        "html_bytes": html_bytes,
+        "asset_bytes": asset_bytes,
+        "total_bytes": html_bytes + asset_bytes,
+        "mean_ms": statistics.mean(page_ms) if page_ms else 0.0,
+    }
+
+
+async def crawl_browser(base_url: str, pages: List[str]) -> Dict[str, float]:
+    from playwright.async_api import async_playwright
+
+    transfer = 0
+    load_ms: List[float] = []
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        try:
+            page = await (await browser.new_context()).new_page()
+            for rel_path in pages:
+                await page.goto(urljoin(base_url, rel_path), wait_until="load")
+                metrics = await collect_page_metrics(page)
+                transfer += metrics.get("transfer_bytes") or 0
+                if metrics.get("load_ms") is not None:
+                    load_ms.append(metrics["load_ms"])
+        finally:
+            await browser.close()
+    return {
+        "total_bytes": transfer,
+        "mean_ms": statistics.mean(load_ms) if load_ms else 0.0,
+    }
+
+
+def run_benchmark(limit: int | None, use_browser: bool, mbps: float) -> None:
+    if not DOCS_ROOT.exists():
+        raise FileNotFoundError(
+            f"Built site not found at {DOCS_ROOT}. Run `bash scripts/build_book.sh` first."
+        )
+    report = precompress_site(DOCS_ROOT)
+    LOGGER.info(
+        "Precompressed %d file(s) with %s", report.files, ", ".join(report.compressed_bytes)
+    )
+    pages = sorted(rel for rel in load_expected_paths(TOC_PATH) if (DOCS_ROOT / rel).exists())[:limit]
+
+    results: Dict[str, Dict[str, float]] = {}
+    for label, precompressed in (("plain", False), ("precompressed", True)):
+        with serve_directory(DOCS_ROOT, precompressed=precompressed) as base_url:
+            if use_browser:
+                results[label] = asyncio.run(crawl_browser(base_url, pages))
+            else:
+                results[label] = crawl_http(base_url, pages)
+
+    plain, packed = results["plain"], results["precompressed"]
+    LOGGER.info(
+        "%-14s %14s %14s %12s %14s",
+        "site",
+        "HTML bytes",
+        "total bytes",
+        "ms/page",
+        f"s @ {mbps:g} Mbit/s",
+    )
+    for label, result in results.items():
+        LOGGER.info(
+            "%-14s %14s %14d %12.1f %14.2f",
+            label,
+            int(result["html_bytes"]) if "html_bytes" in result else "-",
+            int(result["total_bytes"]),
+            result["mean_ms"],
+            result["total_bytes"] * 8 / (mbps * 1e6),
+        )
+    LOGGER.info(
+        "%d page(s): %.1fx fewer bytes; %s %.1f -> %.1f ms per page%s",
+        len(pages),
+        plain["total_bytes"] / max(packed["total_bytes"], 1),
+        "load" if use_browser else "fetch",
+        plain["mean_ms"],
+        packed["mean_ms"],
+        "" if use_browser else " (loopback HTTP hides transfer time; see the Mbit/s column)",
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--limit",
+        type=int,
+        default=None,
+        help="Maximum number of _toc.yml pages to fetch (default: all).",
+    )
+    parser.add_argument(
+        "--browser",
+        action="store_true",
+        help="Load pages in headless Chromium instead of fetching them over raw HTTP.",
+    )
+    parser.add_argument(
+        "--mbps",
+        type=float,
+        default=10.0,
+        help="Link speed used to estimate transfer time for the totals (default: 10).",
+    )
+    parser.add_argument(
+        "--log-level",
+        default="INFO",
+        choices=["CRITICAL", "ERROR", "WARNING", "INFO", "DEBUG"],
+        help="Logging verbosity (default: INFO).",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=getattr(logging, args.log_level.upper()),
+        format="%(levelname)s %(message)s",
+    )
+    if "br" not in available_encodings():
+        LOGGER.warning("brotli is not installed; comparing against gzip only")
+    run_benchmark(args.limit, args.browser, args.mbps)
+
+
+if __name__ == "__main__":
+    main()
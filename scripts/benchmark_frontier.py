@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""Microbenchmark BFS frontier bookkeeping on synthetic site link graphs."""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import random
+import sys
+import time
+from collections import deque
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from tools.playwright_utils import CrawlFrontier
+
+LOGGER = logging.getLogger("education_playground.playwright.benchmark")
+
+
+def make_graph(pages: int, links: int, sidebar: int, seed: int) -> dict[str, list[str]]:
+    """Each page links to a shared sidebar block plus ``links`` random pages."""
+    rng = random.Random(seed)
+    names = [f"track{i % 7}/page{i:05d}.html" for i in range(pages)]
+    shared = names[:sidebar]
+    return {name: shared + rng.sample(names, links) for name in names}
+
+
+def crawl_deque(graph: dict[str, list[str]], start: str) -> int:
+    """The original crawl loop: deque plus a linear ``in queue`` scan per link."""
+    visited: set[str] = set()
+    queue = deque([start])
+    while queue:
+        rel_path = queue.popleft()
+        if rel_path in visited:
+            continue
+        visited.add(rel_path)
+        for candidate in graph[rel_path]:
+            if candidate in visited or candidate in queue:
+                continue
+            queue.append(candidate)
+    return len(visited)
+
+
+def crawl_frontier(graph: dict[str, list[str]], start: str) -> int:
+    frontier = CrawlFrontier([start], priority=list(graph)[:50])
+    visited = 0
+    while frontier:
+        rel_path = frontier.pop()
+        visited += 1
+        frontier.extend(graph[rel_path])
+    return visited
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--pages",
+        type=int,
+        nargs="+",
+        default=[1_000, 5_000, 10_000, 20_000],
+        help="Graph sizes to measure (default: 1000 5000 10000 20000).",
+    )
+    parser.add_argument("--links", type=int, default=10, help="Random links per page (default: 10).")
+    parser.add_argument("--sidebar", type=int, default=40, help="Links shared by every page (default: 40).")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for the graphs.")
+    parser.add_argument(
+        "--log-level",
+        default="INFO",
+        choices=["CRITICAL", "ERROR", "WARNING", "INFO", "DEBUG"],
+        help="Logging verbosity (default: INFO).",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=getattr(logging, args.log_level.upper()),
+        format="%(levelname)s %(message)s",
+    )
+
+    LOGGER.info("%8s %10s %12s %12s %9s", "pages", "links", "deque s", "frontier s", "speedup")
+    for pages in args.pages:
+        graph = make_graph(pages, args.links, min(args.sidebar, pages), args.seed)
+        start = next(iter(graph))
+        edges = sum(len(targets) for targets in graph.values())
+
+        begin = time.perf_counter()
+        legacy = crawl_deque(graph, start)
+        legacy_s = time.perf_counter() - begin
+
+        begin = time.perf_counter()
+        visited = crawl_frontier(graph, start)
+        frontier_s = time.perf_counter() - begin
+
+        if legacy != visited:
+            LOGGER.warning("Visited counts differ: %d vs %d", legacy, visited)
+        LOGGER.info(
+            "%8d %10d %12.3f %12.3f %8.0fx",
+            pages,
+            edges,
+            legacy_s,
+            frontier_s,
+            legacy_s / max(frontier_s, 1e-9),
+        )
+
+
+if __name__ == "__main__":
+    main()
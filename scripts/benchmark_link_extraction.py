@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""Compare per-anchor and single-evaluate link extraction on the built site."""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import statistics
+import sys
+import time
+from pathlib import Path
+from urllib.parse import urljoin
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from playwright.async_api import Page, async_playwright
+
+from tools.playwright_utils import (
+    extract_internal_links,
+    load_expected_paths,
+    normalize_internal_href,
+)
+
+TOC_PATH = PROJECT_ROOT / "_toc.yml"
+DOCS_ROOT = PROJECT_ROOT / "_build" / "html"
+BASE_URL = DOCS_ROOT.resolve().as_uri().rstrip("/") + "/"
+HOME_PAGE = "README.html"
+
+LOGGER = logging.getLogger("education_playground.playwright.benchmark")
+
+
+async def extract_per_anchor(page: Page) -> list[str]:
+    """The original approach: one IPC round-trip per anchor, no memoisation."""
+    links: list[str] = []
+    for anchor in await page.locator("a[href]").all():
+        href = await anchor.get_attribute("href")
+        if not href or href.startswith("#"):
+            continue
+        candidate = normalize_internal_href(BASE_URL, urljoin(page.url, href), home_page=HOME_PAGE)
+        if candidate and candidate not in links:
+            links.append(candidate)
+    return links
+
+
+async def time_call(factory, repeat: int) -> tuple[float, list[str]]:
+    """Return the best wall time in milliseconds over ``repeat`` runs."""
+    best = float("inf")
+    result: list[str] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = await factory()
+        best = min(best, (time.perf_counter() - start) * 1000)
+    return best, result
+
+
+async def run_benchmark(limit: int | None, repeat: int) -> None:
+    if not DOCS_ROOT.exists():
+        raise FileNotFoundError(
+            f"Built site not found at {DOCS_ROOT}. Run `bash scripts/build_book.sh` first."
+        )
+
+    pages = sorted(load_expected_paths(TOC_PATH))
+    pages = [rel for rel in pages if (DOCS_ROOT / rel).exists()][:limit]
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        page = await browser.new_page()
+        before: list[float] = []
+        after: list[float] = []
+        try:
+            LOGGER.info("%-52s %7s %10s %10s %8s", "page", "anchors", "before ms", "after ms", "speedup")
+            for rel_path in pages:
+                await page.goto(f"{BASE_URL}{rel_path}")
+                anchors = await page.locator("a[href]").count()
+                legacy_ms, legacy = await time_call(lambda: extract_per_anchor(page), repeat)
+                bulk_ms, bulk = await time_call(
+                    lambda: extract_internal_links(page, BASE_URL, home_page=HOME_PAGE), repeat
+                )
+                if legacy != bulk:
+                    LOGGER.warning("Link sets differ on %s", rel_path)
+                before.append(legacy_ms)
+                after.append(bulk_ms)
+                LOGGER.info(
+                    "%-52s %7d %10.1f %10.1f %7.1fx",
+                    rel_path,
+                    anchors,
+                    legacy_ms,
+                    bulk_ms,
+                    legacy_ms / max(bulk_ms, 1e-6),
+                )
+        finally:
+            await browser.close()
+
+    if before:
+        LOGGER.info(
+            "Mean per page: before %.1f ms, after %.1f ms (%.1fx faster) over %d pages",
+            statistics.mean(before),
+            statistics.mean(after),
+            statistics.mean(before) / max(statistics.mean(after), 1e-6),
+            len(before),
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--limit",
+        type=int,
+        default=None,
+        help="Maximum number of _toc.yml pages to measure (default: all).",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=3,
+        help="Runs per page and method; the fastest is reported (default: 3).",
+    )
+    parser.add_argument(
+        "--log-level",
+        default="INFO",
+        choices=["CRITICAL", "ERROR", "WARNING", "INFO", "DEBUG"],
+        help="Logging verbosity (default: INFO).",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=getattr(logging, args.log_level.upper()),
+        format="%(levelname)s %(message)s",
+    )
+    asyncio.run(run_benchmark(args.limit, max(args.repeat, 1)))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,8 @@
 #!/usr/bin/env bash
 
-# Build the Jupyter Book site with the repo-local configuration.
-# Usage: bash scripts/build_book.sh
+# Build the Jupyter Book site with the repo-local configuration. Only rebuilds
+# when a _toc.yml source, _config.yml or _static/ changed since the last build.
+# Usage: bash scripts/build_book.sh [--check | --force] [--jobs N|auto]
 
 set -euo pipefail
 
@@ -10,4 +11,4 @@ export PATH="$HOME/Library/Python/3.9/bin:$PATH"
 
 cd "$ROOT_DIR"
 echo "Building Jupyter Book from ${ROOT_DIR}"
-jupyter-book build .
+python3 tools/build_book.py "$@"
@@ -6,13 +6,13 @@ from __future__ import annotations
 import argparse
 import asyncio
 import contextlib
+import importlib.util
 import logging
 import shutil
 import sys
 import tempfile
-from collections import deque
 from pathlib import Path
-from typing import Deque, Set
+from typing import Set
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 if str(PROJECT_ROOT) not in sys.path:
@@ -20,7 +20,15 @@ if str(PROJECT_ROOT) not in sys.path:
 
 from playwright.async_api import Browser, Page, async_playwright
 
-from tools.playwright_utils import load_expected_paths, normalize_internal_href
+from tools.playwright_utils import (
+    CrawlFrontier,
+    LinkCanonicalizer,
+    block_heavy_resources,
+    extract_internal_links,
+    load_expected_paths,
+    serve_directory,
+)
+from tools.gif_stream import StreamingGifWriter
 
 ARTIFACTS_DIR = PROJECT_ROOT / "artifacts" / "showcase"
 ARTIFACTS_DIR.mkdir(parents=True, exist_ok=True)
@@ -107,6 +115,57 @@ async def launch_browser(playwright) -> tuple[Browser, str]:
     raise RuntimeError("Unable to launch a Playwright browser:\n" + "\n".join(errors))
 
 
+class FrameCapture:
+    """Capture page frames without holding up navigation.
+
+    ``capture`` starts a screenshot in the background and returns at once.
+    Finished images go into a bounded queue, and a consumer task passes them
+    to the GIF writer. ``settle`` waits for the pending screenshot and must be
+    called before the page navigates away.
+    """
+
+    def __init__(
+        self,
+        writer: StreamingGifWriter,
+        *,
+        full_page: bool = False,
+        image_type: str = "png",
+        quality: int = 80,
+        max_pending: int = 4,
+    ) -> None:
+        self.writer = writer
+        self.options: dict = {"full_page": full_page, "type": image_type}
+        if image_type == "jpeg":
+            self.options["quality"] = quality
+        self._frames: asyncio.Queue[bytes | None] = asyncio.Queue(maxsize=max(1, max_pending))
+        self._consumer = asyncio.create_task(self._consume())
+        self._shot: asyncio.Task | None = None
+
+    async def _consume(self) -> None:
+        while (frame := await self._frames.get()) is not None:
+            await asyncio.to_thread(self.writer.add, frame)
+
+    async def _screenshot(self, page: Page) -> None:
+        await self._frames.put(await page.screenshot(**self.options))
+
+    def capture(self, page: Page) -> None:
+        self._shot = asyncio.create_task(self._screenshot(page))
+
+    async def settle(self) -> None:
+        if self._shot is not None:
+            shot, self._shot = self._shot, None
+            try:
+                await shot
+            except Exception as exc:
+                LOGGER.warning("Unable to capture frame: %s", exc)
+
+    async def close(self) -> None:
+        """Flush captured frames into the writer (the writer itself stays open)."""
+        await self.settle()
+        await self._frames.put(None)
+        await self._consumer
+
+
 async def play_showcase(
     delay: float,
     limit: int | None,
@@ -114,6 +173,9 @@ async def play_showcase(
     video_out: Path | None,
     gif_out: Path | None,
     gif_speed: float,
+    fast: bool = False,
+    frame_format: str = "png",
+    full_page_frames: bool = False,
 ) -> None:
     if not DOCS_ROOT.exists():
         raise FileNotFoundError(
@@ -121,165 +183,166 @@ async def play_showcase(
         )
 
     visited: Set[str] = set()
-    queue: Deque[str] = deque([HOME_PAGE])
     expected = load_expected_paths(TOC_PATH)
+    queue = CrawlFrontier([HOME_PAGE], priority=expected)
     total_expected = len(expected)
     max_pages = total_expected + 25
 
     LOGGER.info("Expecting %s pages from _toc.yml", total_expected)
 
-    frame_paths: list[Path] = []
-    gif_frames_dir: Path | None = None
+    gif_writer: StreamingGifWriter | None = None
     if gif_out:
-        gif_frames_dir = ARTIFACTS_DIR / "frames"
-        if gif_frames_dir.exists():
-            shutil.rmtree(gif_frames_dir)
-        gif_frames_dir.mkdir(parents=True, exist_ok=True)
+        if importlib.util.find_spec("PIL") is None:
+            LOGGER.warning("Install `Pillow` to enable GIF rendering (`pip install pillow`).")
+        else:
+            # Frames are encoded and appended on a background thread as they arrive.
+            gif_writer = StreamingGifWriter(gif_out, duration=max(delay / gif_speed, 0.02))
 
-    recorded_video: Path | None = None
+    frames: FrameCapture | None = None
+    wait_until = "domcontentloaded" if fast else "load"
 
     try:
-        async with async_playwright() as p:
+        async with contextlib.AsyncExitStack() as stack:
+            base_url = stack.enter_context(serve_directory(DOCS_ROOT)) if fast else BASE_URL
+            p = await stack.enter_async_context(async_playwright())
             browser, browser_name = await launch_browser(p)
             context_kwargs = {"viewport": {"width": 1280, "height": 720}}
+            canonicalizer = LinkCanonicalizer(base_url, home_page=HOME_PAGE)
 
-        video_temp_dir: Path | None = None
-        if video_out:
-            video_temp_dir = Path(tempfile.mkdtemp(prefix="playwright-video-", dir=ARTIFACTS_DIR))
-            context_kwargs["record_video_dir"] = str(video_temp_dir)
-            context_kwargs["record_video_size"] = {"width": 1280, "height": 720}
-
-        context = await browser.new_context(**context_kwargs)
-        page = await context.new_page()
-        page.set_default_navigation_timeout(15_000)
-        page.set_default_timeout(15_000)
-
-        try:
-            step = 0
-            while queue:
-                rel_path = queue.popleft()
-                if rel_path in visited:
-                    continue
-
-                step += 1
-                url = f"{BASE_URL}{rel_path}"
-                LOGGER.info("[%s] Visiting %s (%s)", step, rel_path, browser_name)
-
-                await page.goto(url)
-                await page.evaluate(
-                    """
-                    (label) => {
-                        if (!window.__playwrightOverlay) {
-                            const el = document.createElement('div');
-                            el.style.position = 'fixed';
-                            el.style.top = '16px';
-                            el.style.left = '50%';
-                            el.style.transform = 'translateX(-50%)';
-                            el.style.zIndex = '9999';
-                            el.style.background = 'rgba(76, 175, 80, 0.9)';
-                            el.style.color = '#fff';
-                            el.style.padding = '10px 18px';
-                            el.style.borderRadius = '999px';
-                            el.style.fontFamily = 'system-ui, sans-serif';
-                            el.style.boxShadow = '0 10px 30px rgba(0,0,0,0.25)';
-                            el.style.pointerEvents = 'none';
-                            document.body.appendChild(el);
-                            window.__playwrightOverlay = el;
-                        }
-                        window.__playwrightOverlay.textContent = `▶ ${label}`;
-                    }
-                    """,
-                    rel_path,
+            video_temp_dir: Path | None = None
+            if video_out:
+                video_temp_dir = Path(tempfile.mkdtemp(prefix="playwright-video-", dir=ARTIFACTS_DIR))
+                context_kwargs["record_video_dir"] = str(video_temp_dir)
+                context_kwargs["record_video_size"] = {"width": 1280, "height": 720}
+
+            context = await browser.new_context(**context_kwargs)
+            if fast:
+                await block_heavy_resources(context)
+            page = await context.new_page()
+            if gif_writer:
+                frames = FrameCapture(
+                    gif_writer, full_page=full_page_frames, image_type=frame_format
                 )
+            page.set_default_navigation_timeout(15_000)
+            page.set_default_timeout(15_000)
+
+            try:
+                step = 0
+                while queue:
+                    rel_path = queue.pop()
+                    if rel_path in visited:
+                        continue
 
-                await perform_interactions(page, delay, interactions)
-
-                if gif_frames_dir:
-                    safe_name = rel_path.replace("/", "_")
-                    frame_path = gif_frames_dir / f"{step:03d}_{safe_name}.png"
-                    await page.screenshot(path=str(frame_path), full_page=True)
-                    frame_paths.append(frame_path)
+                    step += 1
+                    url = f"{base_url}{rel_path}"
+                    LOGGER.info("[%s] Visiting %s (%s)", step, rel_path, browser_name)
+
+                    await page.goto(url, wait_until=wait_until)
+                    await page.evaluate(
+                        """
+                        (label) => {
+                            if (!window.__playwrightOverlay) {
+                                const el = document.createElement('div');
+                                el.style.position = 'fixed';
+                                el.style.top = '16px';
+                                el.style.left = '50%';
+                                el.style.transform = 'translateX(-50%)';
+                                el.style.zIndex = '9999';
+                                el.style.background = 'rgba(76, 175, 80, 0.9)';
+                                el.style.color = '#fff';
+                                el.style.padding = '10px 18px';
+                                el.style.borderRadius = '999px';
+                                el.style.fontFamily = 'system-ui, sans-serif';
+                                el.style.boxShadow = '0 10px 30px rgba(0,0,0,0.25)';
+                                el.style.pointerEvents = 'none';
+                                document.body.appendChild(el);
+                                window.__playwrightOverlay = el;
+                            }
+                            window.__playwrightOverlay.textContent = `▶ ${label}`;
+                        }
+                        """,
+                        rel_path,
+                    )
 
-                await page.wait_for_load_state("networkidle")
-                with contextlib.suppress(Exception):
-                    await page.wait_for_timeout(int(delay * 1000))
+                    await perform_interactions(page, delay, interactions)
 
-                anchors = await page.locator("a[href]").all()
-                for anchor in anchors:
-                    href = await anchor.get_attribute("href")
-                    candidate = normalize_internal_href(BASE_URL, href, home_page=HOME_PAGE)
-                    if not candidate:
-                        continue
-                    if candidate in visited or candidate in queue:
-                        continue
-                    queue.append(candidate)
+                    if frames:
+                        # Runs alongside the waits below; settled before the next goto.
+                        frames.capture(page)
 
-                visited.add(rel_path)
+                    if not fast:
+                        await page.wait_for_load_state("networkidle")
+                    with contextlib.suppress(Exception):
+                        await page.wait_for_timeout(int(delay * 1000))
 
-                if expected.issubset(visited):
-                    LOGGER.info("Reached all %s pages listed in _toc.yml; stopping crawl.", total_expected)
-                    break
+                    queue.extend(
+                        await extract_internal_links(
+                            page, base_url, home_page=HOME_PAGE, canonicalizer=canonicalizer
+                        )
+                    )
+                    if frames:
+                        await frames.settle()
+
+                    visited.add(rel_path)
+
+                    if expected.issubset(visited):
+                        LOGGER.info("Reached all %s pages listed in _toc.yml; stopping crawl.", total_expected)
+                        break
+
+                    if limit is not None and step >= limit:
+                        break
+
+                    if len(visited) > max_pages:
+                        LOGGER.warning(
+                            "Visited %s pages, exceeding the allowed %s (expected %s). Aborting crawl.",
+                            len(visited),
+                            max_pages,
+                            total_expected,
+                        )
+                        break
+
+                LOGGER.info("Crawled %s pages; %s", len(visited), canonicalizer.stats())
+                missing = sorted(expected - visited)
+                if missing:
+                    LOGGER.warning("Missing pages from crawl:")
+                    for item in missing:
+                        LOGGER.warning("  - %s", item)
+                else:
+                    LOGGER.info("Reached every page listed in _toc.yml!")
 
-                if limit is not None and step >= limit:
-                    break
+                with contextlib.suppress(Exception):
+                    await page.wait_for_timeout(2000)
+            finally:
+                if frames:
+                    await frames.close()
+                if video_out:
+                    try:
+                        await page.close()
+                        if page.video:
+                            video_path = await page.video.path()
+                            video_out.parent.mkdir(parents=True, exist_ok=True)
+                            shutil.move(video_path, video_out)
+                            LOGGER.info("Video saved to %s", video_out)
+                        if video_temp_dir and video_temp_dir.exists():
+                            shutil.rmtree(video_temp_dir)
+                    except Exception as exc:
+                        LOGGER.warning("Unable to finalize video: %s", exc)
 
-                if len(visited) > max_pages:
-                    LOGGER.warning(
-                        "Visited %s pages, exceeding the allowed %s (expected %s). Aborting crawl.",
-                        len(visited),
-                        max_pages,
-                        total_expected,
-                    )
-                    break
-
-            missing = sorted(expected - visited)
-            if missing:
-                LOGGER.warning("Missing pages from crawl:")
-                for item in missing:
-                    LOGGER.warning("  - %s", item)
-            else:
-                LOGGER.info("Reached every page listed in _toc.yml!")
-
-            with contextlib.suppress(Exception):
-                await page.wait_for_timeout(2000)
-        finally:
-            recorded_video: Path | None = None
-            if video_out:
-                try:
-                    await page.close()
-                    if page.video:
-                        video_path = await page.video.path()
-                        video_out.parent.mkdir(parents=True, exist_ok=True)
-                        shutil.move(video_path, video_out)
-                        recorded_video = video_out
-                        LOGGER.info("Video saved to %s", video_out)
-                    if video_temp_dir and video_temp_dir.exists():
-                        shutil.rmtree(video_temp_dir)
-                except Exception as exc:
-                    LOGGER.warning("Unable to finalize video: %s", exc)
-
-            with contextlib.suppress(Exception):
-                await context.close()
-            with contextlib.suppress(Exception):
-                await browser.close()
+                with contextlib.suppress(Exception):
+                    await context.close()
+                with contextlib.suppress(Exception):
+                    await browser.close()
 
     except asyncio.CancelledError:
         LOGGER.info("Showcase cancelled; cleaning up.")
         raise
-
-    if gif_out and frame_paths and recorded_video is None:
-        try:
-            import imageio.v3 as imageio_v3
-
-            gif_out.parent.mkdir(parents=True, exist_ok=True)
-            frames = [imageio_v3.imread(frame) for frame in frame_paths]
-            duration = max(delay / gif_speed, 0.02)
-            imageio_v3.imwrite(gif_out, frames, loop=0, duration=duration)
-            LOGGER.info("GIF saved to %s", gif_out)
-        except ImportError:
-            LOGGER.warning("Install `imageio` to enable GIF rendering (`pip install imageio`).")
-        except Exception as exc:
-            LOGGER.warning("Unable to render GIF: %s", exc)
+    finally:
+        if gif_writer:
+            try:
+                frame_count = gif_writer.close()
+                LOGGER.info("GIF saved to %s (%d frames)", gif_out, frame_count)
+            except Exception as exc:
+                LOGGER.warning("Unable to render GIF: %s", exc)
 
 
 def parse_path(value: str | None) -> Path | None:
@@ -325,6 +388,28 @@ def main() -> None:
         default=3.0,
         help="Speed multiplier for GIF playback (default: 3.0 = ~3x faster than delay).",
     )
+    parser.add_argument(
+        "--frame-format",
+        choices=["png", "jpeg"],
+        default="png",
+        help="Screenshot encoding for GIF frames; jpeg is cheaper to capture (default: png).",
+    )
+    parser.add_argument(
+        "--full-page-frames",
+        action="store_true",
+        help=(
+            "Capture the full page for GIF frames instead of the viewport; only the "
+            "top of each frame fits the GIF canvas, so this is rarely worth the cost."
+        ),
+    )
+    parser.add_argument(
+        "--fast",
+        action="store_true",
+        help=(
+            "Serve the site over local HTTP, block images/fonts/media and skip "
+            "waiting for network idle on each page."
+        ),
+    )
     parser.add_argument(
         "--log-level",
         default="INFO",
@@ -347,6 +432,9 @@ def main() -> None:
                 video_out=args.video_out,
                 gif_out=args.gif_out,
                 gif_speed=max(args.gif_speed, 0.1),
+                fast=args.fast,
+                frame_format=args.frame_format,
+                full_page_frames=args.full_page_frames,
             )
         )
     except KeyboardInterrupt:
@@ -0,0 +1,110 @@
+"""Shared Playwright fixtures for the site tests.
+
+The browser is launched once per pytest session on a dedicated event loop and
+reused by every test; each test gets its own fresh ``BrowserContext`` so
+cookies, storage and routes never leak between tests. Coroutines that use the
+browser must run on the session loop via ``browser_session.run(...)``.
+"""
+
+import asyncio
+import logging
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+LOGGER = logging.getLogger(__name__)
+LOGGER.addHandler(logging.NullHandler())
+
+ENGINES = ("chromium", "firefox", "webkit")
+# Set SITE_BROWSER=firefox (for example) to try that engine first.
+PREFERRED_ENGINE = os.environ.get("SITE_BROWSER", "").lower()
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers",
+        "browser_context(**options): keyword arguments for the per-test Playwright browser context",
+    )
+
+
+class BrowserSession:
+    """One Playwright driver and browser shared by the whole test session."""
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self.playwright = None
+        self.browser = None
+        self.engine = None
+        self.error = None
+
+    def run(self, coro):
+        """Run ``coro`` to completion on the session loop."""
+        return self.loop.run_until_complete(coro)
+
+    async def _start(self):
+        from playwright.async_api import Error, async_playwright
+
+        self.playwright = await async_playwright().start()
+        errors = []
+        order = sorted(ENGINES, key=lambda name: name != PREFERRED_ENGINE)
+        for name in order:
+            try:
+                LOGGER.debug("Attempting to launch %s", name)
+                self.browser = await getattr(self.playwright, name).launch(headless=True)
+            except Error as exc:  # pragma: no cover - depends on environment capabilities
+                LOGGER.warning("Failed to launch %s: %s", name, exc)
+                errors.append(f"{name}: {exc}")
+                continue
+            self.engine = name
+            LOGGER.info("Launched %s %s for this test session", name, self.browser.version)
+            return
+        self.error = "; ".join(errors)
+
+    async def _stop(self):
+        if self.browser is not None:
+            await self.browser.close()
+        if self.playwright is not None:
+            await self.playwright.stop()
+
+    def start(self):
+        self.run(self._start())
+        return self
+
+    def close(self):
+        try:
+            self.run(self._stop())
+        finally:
+            self.loop.close()
+
+
+@pytest.fixture(scope="session")
+def browser_session():
+    """Launch the first engine that works (Chromium, Firefox, WebKit) once per session."""
+    pytest.importorskip("playwright.async_api")
+    session = BrowserSession().start()
+    try:
+        if session.browser is None:
+            pytest.skip(f"Playwright browser launch failed: {session.error}")
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def browser_context(browser_session, request):
+    """A fresh context on the shared browser, closed after the test.
+
+    Options come from ``@pytest.mark.browser_context(...)``, e.g.
+    ``java_script_enabled=False``.
+    """
+    marker = request.node.get_closest_marker("browser_context")
+    options = dict(marker.kwargs) if marker else {}
+    context = browser_session.run(browser_session.browser.new_context(**options))
+    yield context
+    browser_session.run(context.close())
@@ -0,0 +1,120 @@
+import os
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from tools import build_book as bb
+
+
+def _make_book(root: Path) -> None:
+    (root / "_toc.yml").write_text(
+        "format: jb-book\nroot: README\nchapters:\n"
+        "  - file: easy/README_EASY\n    sections:\n      - file: easy/01_intro\n"
+    )
+    (root / "_config.yml").write_text("title: Test\n")
+    (root / "README.md").write_text("# Home\n")
+    (root / "easy").mkdir()
+    (root / "easy" / "README_EASY.md").write_text("# Easy\n")
+    (root / "easy" / "01_intro.ipynb").write_text("{}")
+    (root / "_static" / "css").mkdir(parents=True)
+    (root / "_static" / "css" / "custom.css").write_text("body {}\n")
+
+
+def _fake_builder(root: Path) -> list:
+    """A stand-in for ``jupyter-book build`` that writes every page's HTML."""
+    script = (
+        "import pathlib, sys\n"
+        "root = pathlib.Path(sys.argv[1])\n"
+        "for page in ('README.html', 'easy/README_EASY.html', 'easy/01_intro.html'):\n"
+        "    out = root / '_build' / 'html' / page\n"
+        "    out.parent.mkdir(parents=True, exist_ok=True)\n"
+        "    out.write_text('<html></html>')\n"
+        "(root / 'calls.txt').open('a').write(' '.join(sys.argv[2:]) + '\\n')\n"
+    )
+    return [sys.executable, "-c", script, str(root)]
+
+
+def test_site_pages_resolve_sources(tmp_path):
+    _make_book(tmp_path)
+    assert bb.site_pages(tmp_path) == {
+        "README.html": "README.md",
+        "easy/01_intro.html": "easy/01_intro.ipynb",
+        "easy/README_EASY.html": "easy/README_EASY.md",
+    }
+    assert bb.global_inputs(tmp_path) == ["_toc.yml", "_config.yml", "_static/css/custom.css"]
+
+
+def test_build_skips_when_inputs_unchanged(tmp_path):
+    _make_book(tmp_path)
+    command = _fake_builder(tmp_path)
+
+    first = bb.build(tmp_path, command=command)
+    assert first.full and len(first.stale) == 3
+    second = bb.build(tmp_path, command=command)
+    assert second.up_to_date
+    assert (tmp_path / "calls.txt").read_text().splitlines() == ["--all"]
+
+
+def test_plan_reports_only_changed_pages(tmp_path):
+    _make_book(tmp_path)
+    bb.build(tmp_path, command=_fake_builder(tmp_path))
+    manifest = bb.BuildManifest(tmp_path / "_build" / bb.MANIFEST_NAME)
+
+    (tmp_path / "easy" / "01_intro.ipynb").write_text('{"cells": []}')
+    (tmp_path / "_build" / "html" / "README.html").unlink()
+    plan = bb.plan_build(tmp_path, manifest)
+    assert not plan.full
+    assert plan.changed == ["easy/01_intro.ipynb"]
+    assert plan.stale == ["README.html", "easy/01_intro.html"]
+
+    (tmp_path / "_static" / "css" / "custom.css").write_text("body { margin: 0 }\n")
+    plan = bb.plan_build(tmp_path, manifest)
+    assert plan.full and len(plan.stale) == 3
+
+
+def test_touch_without_edit_is_not_stale(tmp_path):
+    _make_book(tmp_path)
+    bb.build(tmp_path, command=_fake_builder(tmp_path))
+    source = tmp_path / "README.md"
+    stat = source.stat()
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    plan = bb.plan_build(tmp_path, bb.BuildManifest(tmp_path / "_build" / bb.MANIFEST_NAME))
+    assert plan.up_to_date and not plan.changed
+
+
+def test_tracks_group_pages_and_size_default_jobs(monkeypatch):
+    pages = ["README.html", "easy/01.html", "easy/02.html", "hard/01.html"]
+    assert bb.tracks(pages) == {
+        "root": ["README.html"],
+        "easy": ["easy/01.html", "easy/02.html"],
+        "hard": ["hard/01.html"],
+    }
+    monkeypatch.setattr(bb.os, "cpu_count", lambda: 2)
+    assert bb.default_jobs(pages) == 2
+    monkeypatch.setattr(bb.os, "cpu_count", lambda: 16)
+    assert bb.default_jobs(pages) == 3
+
+
+def test_parallel_build_uses_sphinx_workers(tmp_path, monkeypatch):
+    _make_book(tmp_path)
+    calls = []
+
+    def fake_sphinx_build(root, **kwargs):
+        calls.append(kwargs)
+        for page in bb.site_pages(root):
+            (root / "_build" / "html" / page).parent.mkdir(parents=True, exist_ok=True)
+            (root / "_build" / "html" / page).write_text("<html></html>")
+
+    monkeypatch.setattr(bb, "sphinx_build", fake_sphinx_build)
+
+    bb.build(tmp_path, jobs=4)
+    assert calls == [{"jobs": 4, "force_all": True, "freshenv": True, "toc_name": "_toc.yml"}]
+    assert bb.build(tmp_path, jobs=4).up_to_date and len(calls) == 1
+
+    # A content-only change reuses the cached environment.
+    (tmp_path / "easy" / "01_intro.ipynb").write_text('{"cells": []}')
+    bb.build(tmp_path, jobs=4)
+    assert calls[-1] == {"jobs": 4, "force_all": False, "freshenv": False, "toc_name": "_toc.yml"}
@@ -15,6 +15,12 @@ if str(PROJECT_ROOT) not in sys.path:
 from tools import check_notebooks as cn
 
 
+@pytest.fixture(autouse=True)
+def _isolated_cwd(tmp_path, monkeypatch):
+    """Keep .nbexec-cache writes out of the repository checkout."""
+    monkeypatch.chdir(tmp_path)
+
+
 def make_notebook(path: Path, code_cells: list[str]) -> None:
     nb = nbformat.v4.new_notebook()
     nb.cells = [nbformat.v4.new_code_cell(source=src) for src in code_cells]
@@ -280,3 +286,630 @@ def test_main_execution_failure(monkeypatch, tmp_path, caplog):
     exit_code = cn.main()
     assert exit_code == 1
     assert "Execution failed with exit code 2" in caplog.text
+
+
+def test_main_parallel_jobs(monkeypatch, tmp_path, caplog):
+    from concurrent.futures import ThreadPoolExecutor
+
+    good = tmp_path / "good.ipynb"
+    bad = tmp_path / "bad.ipynb"
+    slow = tmp_path / "slow.ipynb"
+    for path in (good, bad, slow):
+        make_notebook(path, ["print('hi')"])
+
+    def fake_execute(nb_path, timeout, **_):
+        if nb_path == slow:
+            raise subprocess.TimeoutExpired(cmd=["nbconvert"], timeout=timeout)
+        return 0 if nb_path == good else 3
+
+    monkeypatch.setattr(cn, "execute_notebook", fake_execute)
+    monkeypatch.setattr(
+        cn, "make_executor", lambda jobs, *_: ThreadPoolExecutor(max_workers=jobs)
+    )
+
+    caplog.set_level(logging.INFO)
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        ["check_notebooks", str(good), str(bad), str(slow), "--execute", "--jobs", "3"],
+    )
+
+    exit_code = cn.main()
+    assert exit_code == 1
+    assert f"[{good}] Execution succeeded" in caplog.text
+    assert f"[{bad}] Execution failed with exit code 3" in caplog.text
+    assert f"[{slow}] Execution timed out" in caplog.text
+
+
+def test_execute_parallel_all_succeed(monkeypatch, tmp_path):
+    from concurrent.futures import ThreadPoolExecutor
+
+    paths = [tmp_path / f"nb{i}.ipynb" for i in range(4)]
+    monkeypatch.setattr(cn, "execute_notebook", lambda *_, **__: 0)
+    monkeypatch.setattr(
+        cn, "make_executor", lambda jobs, *_: ThreadPoolExecutor(max_workers=jobs)
+    )
+
+    assert cn.execute_parallel(paths, timeout=5, jobs=2) == 0
+
+
+def test_execute_parallel_pools_by_engine(monkeypatch, tmp_path):
+    from concurrent.futures import ThreadPoolExecutor
+
+    paths = [tmp_path / f"nb{i}.ipynb" for i in range(4)]
+    estimates = {path: float(i) for i, path in enumerate(paths)}
+    pools = []
+    order = []
+
+    def fake_executor(jobs, log_level=logging.INFO, preload=()):
+        pools.append((jobs, list(preload)))
+        return ThreadPoolExecutor(max_workers=1)
+
+    def fake_run(nb_path, *_):
+        order.append(nb_path)
+        return cn.ExecutionOutcome(nb_path, 0, 0.0)
+
+    monkeypatch.setattr(cn, "make_executor", fake_executor)
+    monkeypatch.setattr(cn, "run_execution", fake_run)
+
+    # nbconvert: one shared pool fed longest-first, so idle workers pick up work.
+    assert cn.execute_parallel(paths, timeout=5, jobs=2, estimates=estimates) == 0
+    assert pools == [(2, [])] and order == paths[::-1]
+
+    # nbclient: one single-worker pool per non-empty warm-kernel lane.
+    pools.clear()
+    imports = {path: {"numpy"} for path in paths}
+    assert (
+        cn.execute_parallel(
+            paths, timeout=5, jobs=3, engine="nbclient", imports=imports
+        )
+        == 0
+    )
+    assert pools == [(1, ["numpy"])]
+
+
+def test_execution_cache_roundtrip_and_eviction(tmp_path):
+    nb_path = tmp_path / "cached.ipynb"
+    make_notebook(nb_path, ["import json\nprint(json.dumps({}))"])
+
+    key = cn.notebook_fingerprint(nb_path, {"json"})
+    cache = cn.ExecutionCache(tmp_path / "cache")
+    assert cache.get(key) is None
+
+    cache.put(key, cn.ExecutionOutcome(nb_path, 0, 1.5))
+    cache.put("timeout", cn.ExecutionOutcome(nb_path, None, 9.0))
+    hit = cache.get(key)
+    assert hit is not None and hit.cached and hit.returncode == 0
+    assert cache.get("timeout") is None
+
+    # Markdown edits keep the fingerprint; code edits change it.
+    nb = nbformat.read(nb_path, as_version=4)
+    nb.cells.append(nbformat.v4.new_markdown_cell("notes"))
+    nb_path.write_text(nbformat.writes(nb))
+    assert cn.notebook_fingerprint(nb_path, {"json"}) == key
+    # So do the engine and timeout, which can change the verdict.
+    assert cn.notebook_fingerprint(nb_path, {"json"}, engine="nbclient") != key
+    assert cn.notebook_fingerprint(nb_path, {"json"}, timeout=30) != key
+    make_notebook(nb_path, ["print('changed')"])
+    assert cn.notebook_fingerprint(nb_path, {"json"}) != key
+
+    expired = cn.ExecutionCache(tmp_path / "cache", max_age=-1)
+    assert expired.get(key) is None
+
+    cache.put(key, cn.ExecutionOutcome(nb_path, 0, 1.5))
+    tiny = cn.ExecutionCache(tmp_path / "cache", max_bytes=0)
+    assert tiny.evict() == 1
+    assert cache.get(key) is None
+
+
+def test_main_uses_cached_verdict(monkeypatch, tmp_path, caplog):
+    nb_path = tmp_path / "cached.ipynb"
+    make_notebook(nb_path, ["print('hi')"])
+    calls = []
+
+    def fake_execute(path, timeout, **_):
+        calls.append(path)
+        return 0
+
+    monkeypatch.setattr(cn, "execute_notebook", fake_execute)
+    caplog.set_level(logging.INFO)
+    argv = ["check_notebooks", str(nb_path), "--execute"]
+
+    monkeypatch.setattr(sys, "argv", argv)
+    assert cn.main() == 0
+    monkeypatch.setattr(sys, "argv", argv)
+    assert cn.main() == 0
+    assert len(calls) == 1
+    assert "cached verdict" in caplog.text
+
+    monkeypatch.setattr(sys, "argv", argv + ["--no-cache"])
+    assert cn.main() == 0
+    assert len(calls) == 2
+
+
+def test_module_version_resolution():
+    assert cn.module_version("json") == "stdlib"
+    assert cn.module_version("nbformat").startswith("nbformat==")
+    assert cn.module_version("no_such_module") == "unknown"
+
+
+def test_main_engine_selects_inprocess(monkeypatch, tmp_path, caplog):
+    nb_path = tmp_path / "engine.ipynb"
+    make_notebook(nb_path, ["print('hi')"])
+    calls = []
+
+    def fake_inprocess(path, timeout, **_):
+        calls.append((path, timeout))
+        return 0
+
+    def unexpected(*_, **__):
+        raise AssertionError("nbconvert engine should not be used")
+
+    monkeypatch.setattr(cn, "execute_notebook_inprocess", fake_inprocess)
+    monkeypatch.setattr(cn, "execute_notebook", unexpected)
+    caplog.set_level(logging.INFO)
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        ["check_notebooks", str(nb_path), "--execute", "--engine", "nbclient"],
+    )
+
+    assert cn.main() == 0
+    assert calls == [(nb_path, 600)]
+    assert "Execution succeeded" in caplog.text
+
+
+def test_execute_notebook_inprocess_reuses_kernel(tmp_path):
+    pytest.importorskip("nbclient")
+    pytest.importorskip("ipykernel")
+
+    first = tmp_path / "first.ipynb"
+    second = tmp_path / "second.ipynb"
+    make_notebook(first, ["leaked = 1", "1 / 0", "print('after error')"])
+    make_notebook(
+        second, ["import os\nassert 'leaked' not in globals()\nprint(os.getcwd())"]
+    )
+
+    pool = cn.KernelPool()
+    try:
+        assert cn.execute_notebook_inprocess(first, timeout=60, pool=pool) == 0
+        (km,) = pool._idle["python3"]
+        assert cn.execute_notebook_inprocess(second, timeout=60, pool=pool) == 0
+        assert pool._idle["python3"] == [km]
+    finally:
+        pool.shutdown()
+
+    executed = nbformat.read(tmp_path / ".nbexec-cache" / "second__executed.ipynb", 4)
+    outputs = executed.cells[0].outputs
+    assert outputs and outputs[0].get("output_type") == "stream"
+    assert outputs[0]["text"].strip() == str(tmp_path)
+
+
+def test_load_cell_profile_and_report(tmp_path, caplog):
+    nb_path = tmp_path / "profiled.ipynb"
+    nb = nbformat.v4.new_notebook()
+    nb.cells = [
+        nbformat.v4.new_markdown_cell("intro"),
+        nbformat.v4.new_code_cell("fast = 1"),
+        nbformat.v4.new_code_cell("   "),
+        nbformat.v4.new_code_cell("\n# heavy\nslow = sum(range(10))"),
+    ]
+    nb_path.write_text(nbformat.writes(nb))
+    records = tmp_path / "records.json"
+    records.write_text(
+        json.dumps(
+            [
+                {"wall_s": 0.01, "cpu_s": 0.01, "rss_delta_kb": 2048, "error": False},
+                {"wall_s": 2.5, "cpu_s": 2.4, "rss_delta_kb": None, "error": False},
+            ]
+        )
+    )
+
+    profile = cn.load_cell_profile(nb_path, records)
+    assert [cell["cell"] for cell in profile] == [1, 3]
+    assert profile[1]["source"] == "# heavy"
+    assert cn.load_cell_profile(nb_path, tmp_path / "absent.json") == []
+
+    caplog.set_level(logging.INFO)
+    outcome = cn.ExecutionOutcome(nb_path, 0, 3.0, profile=profile)
+    report_path = tmp_path / "reports" / "profile.json"
+    cn.write_profile_report([outcome], report_path, top=1)
+
+    report = json.loads(report_path.read_text())
+    assert report["notebooks"][str(nb_path)]["cells"] == profile
+    assert "Slowest 1 cell(s)" in caplog.text
+    assert "# heavy" in caplog.text and "fast = 1" not in caplog.text
+
+
+def test_main_profile_inprocess(monkeypatch, tmp_path):
+    pytest.importorskip("nbclient")
+    pytest.importorskip("ipykernel")
+
+    nb_path = tmp_path / "timed.ipynb"
+    mib = 1024 * 1024
+    make_notebook(
+        nb_path,
+        [
+            "import time\ntime.sleep(0.2)",
+            f"x = b'x' * {64 * mib}",
+            f"tmp = b'x' * {128 * mib}\ndel tmp",
+            "y = 1",
+        ],
+    )
+    report_path = tmp_path / "profile.json"
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        [
+            "check_notebooks",
+            str(nb_path),
+            "--execute",
+            "--engine",
+            "nbclient",
+            "--profile",
+            str(report_path),
+        ],
+    )
+
+    try:
+        assert cn.main() == 0
+    finally:
+        cn.kernel_pool().shutdown()
+
+    cells = json.loads(report_path.read_text())["notebooks"][str(nb_path)]["cells"]
+    assert [cell["cell"] for cell in cells] == [0, 1, 2, 3]
+    assert cells[0]["wall_s"] >= 0.2
+    assert {"cpu_s", "rss_kb", "rss_delta_kb", "peak_rss_kb"} <= set(cells[0])
+    if cells[1]["rss_delta_kb"] is not None:  # needs /proc/self/statm
+        assert cells[1]["rss_delta_kb"] >= 60 * 1024
+    if cells[2]["peak_rss_scope"] == "cell":  # needs /proc/self/clear_refs
+        # Memory allocated and freed within a cell shows in its own peak only.
+        assert cells[2]["peak_rss_kb"] - cells[1]["rss_kb"] >= 120 * 1024
+        assert abs(cells[2]["rss_delta_kb"]) < 16 * 1024
+        assert cells[3]["peak_rss_kb"] < cells[2]["peak_rss_kb"] - 100 * 1024
+
+
+def test_scan_imports_cache_reparses_only_changed_cells(monkeypatch, tmp_path):
+    first = tmp_path / "first.ipynb"
+    second = tmp_path / "second.ipynb"
+    make_notebook(
+        first, ["import json", "import os.path\nfrom collections import deque"]
+    )
+    make_notebook(second, ["import json", "import broken >>>"])
+    cache_path = tmp_path / "imports.json"
+
+    cache = cn.ImportCache(cache_path)
+    results = cn.scan_imports([first, second], jobs=2, cache=cache)
+    cache.save()
+    assert results == {first: {"json", "os", "collections"}, second: {"json"}}
+
+    parsed = []
+    real_cell_imports = cn.cell_imports
+
+    def counting_cell_imports(source):
+        parsed.append(source)
+        return real_cell_imports(source)
+
+    monkeypatch.setattr(cn, "cell_imports", counting_cell_imports)
+
+    warm = cn.ImportCache(cache_path)
+    assert cn.scan_imports([first, second], cache=warm) == results
+    assert parsed == []
+
+    make_notebook(second, ["import json", "import sqlite3"])
+    warm = cn.ImportCache(cache_path)
+    assert cn.scan_imports([first, second], cache=warm)[second] == {"json", "sqlite3"}
+    assert parsed == ["import sqlite3"]
+
+    warm.save()
+    stored = json.loads(cache_path.read_text())
+    assert cn._cell_key("import broken >>>") not in stored["cells"]
+
+
+def test_collect_imports_with_cell_cache(tmp_path):
+    nb_path = tmp_path / "cells.ipynb"
+    make_notebook(nb_path, ["import json", "import json", "from os import path"])
+    cell_cache = {}
+    assert cn.collect_imports(nb_path, cell_cache) == {"json", "os"}
+    assert len(cell_cache) == 2
+
+
+def test_check_modules_probe_modes(monkeypatch, tmp_path):
+    (tmp_path / "explodes_on_import.py").write_text("raise RuntimeError('boom')\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.setenv("PYTHONPATH", str(tmp_path))
+    monkeypatch.setattr(cn, "_PROBE_CACHE", {})
+    names = ["json", "explodes_on_import", "no_such_module"]
+
+    spec = {name: ok for name, ok, _ in cn.check_modules(names, probe="spec")}
+    assert spec == {"json": True, "explodes_on_import": True, "no_such_module": False}
+    assert "explodes_on_import" not in sys.modules
+
+    isolated = cn.check_modules(names, probe="subprocess", jobs=2)
+    detail = {name: (ok, msg) for name, ok, msg in isolated}
+    assert detail["json"][0] and not detail["no_such_module"][0]
+    assert detail["explodes_on_import"] == (False, "RuntimeError: boom")
+    assert "explodes_on_import" not in sys.modules
+
+
+def test_check_modules_memoizes_per_interpreter(monkeypatch):
+    monkeypatch.setattr(cn, "_PROBE_CACHE", {})
+    calls = []
+
+    def fake_spec(name):
+        calls.append(name)
+        return True, "ok (found)"
+
+    monkeypatch.setattr(cn, "_probe_spec", fake_spec)
+    cn.check_modules(["numpy", "pandas"], probe="spec")
+    cn.check_modules(["pandas", "torch"], probe="spec")
+    assert calls == ["numpy", "pandas", "torch"]
+
+    cn.check_modules(["numpy"], probe="spec", python="/other/python")
+    assert calls[-1] == "numpy" and len(calls) == 4
+
+
+def test_plan_schedule_longest_first_with_import_affinity(tmp_path):
+    a, b, c, d = (tmp_path / f"{name}.ipynb" for name in "abcd")
+    imports = {a: {"numpy", "os"}, b: {"torch"}, c: {"numpy"}, d: {"torch", "json"}}
+    estimates = {a: 10.0, b: 9.0, c: 4.0, d: 4.0}
+
+    lanes = cn.plan_schedule([d, c, b, a], imports, estimates, jobs=2)
+    assert lanes == [[a, c], [b, d]]
+    assert cn.plan_schedule([a, b], imports, estimates, jobs=8) == [[a], [b]]
+
+
+def test_timing_history_smooths_and_defaults_to_median(tmp_path):
+    path = tmp_path / "timings.json"
+    seen = [tmp_path / f"nb{i}.ipynb" for i in range(3)]
+    history = cn.TimingHistory(path)
+    for nb_path, duration in zip(seen, (1.0, 5.0, 9.0)):
+        history.update(nb_path, duration)
+    history.save()
+
+    reloaded = cn.TimingHistory(path)
+    reloaded.update(seen[0], 3.0)
+    estimates = reloaded.estimates([seen[0], tmp_path / "new.ipynb"])
+    assert estimates == {seen[0]: 2.0, tmp_path / "new.ipynb": 5.0}
+
+
+def test_changed_notebooks_since_ref(monkeypatch, tmp_path, caplog):
+    def git(*args):
+        subprocess.run(
+            ["git", "-c", "user.name=t", "-c", "user.email=t@t", *args],
+            cwd=tmp_path,
+            check=True,
+            capture_output=True,
+        )
+
+    code = tmp_path / "code.ipynb"
+    prose = tmp_path / "prose.ipynb"
+    same = tmp_path / "same.ipynb"
+    make_notebook(code, ["import json", "print(1)"])
+    make_notebook(same, ["print('same')"])
+    nb = nbformat.v4.new_notebook()
+    nb.cells = [nbformat.v4.new_markdown_cell("old"), nbformat.v4.new_code_cell("1")]
+    prose.write_text(nbformat.writes(nb))
+    git("init", "-q")
+    git("add", ".")
+    git("commit", "-q", "-m", "base")
+
+    make_notebook(code, ["import json", "print(2)"])
+    nb.cells[0].source = "new"
+    prose.write_text(nbformat.writes(nb))
+    make_notebook(tmp_path / "new.ipynb", ["import os"])
+
+    changed = cn.changed_notebooks("HEAD", cwd=tmp_path)
+    assert changed == {Path("code.ipynb"): [1], Path("new.ipynb"): [0]}
+
+    caplog.set_level(logging.INFO)
+    monkeypatch.setattr(
+        sys, "argv", ["check_notebooks", "code.ipynb", "--changed-since", "HEAD"]
+    )
+    assert cn.main() == 0
+    assert "1 notebook(s) changed since HEAD" in caplog.text
+    assert "Notebook: code.ipynb" in caplog.text
+    assert "new.ipynb" not in caplog.text
+
+    monkeypatch.setattr(sys, "argv", ["check_notebooks", "--changed-since", "nope"])
+    assert cn.main() == 1
+    assert "Cannot diff against nope" in caplog.text
+
+
+def test_main_streams_events_and_junit(monkeypatch, tmp_path):
+    import xml.etree.ElementTree as ET
+
+    good = tmp_path / "good.ipynb"
+    bad = tmp_path / "bad.ipynb"
+    missing = tmp_path / "missing.ipynb"
+    make_notebook(good, ["import json"])
+    make_notebook(bad, ["print(1)"])
+    make_notebook(missing, ["import no_such_module"])
+    monkeypatch.setattr(
+        cn, "execute_notebook", lambda nb_path, **_: 0 if nb_path == good else 2
+    )
+
+    events_path = tmp_path / "out" / "events.jsonl"
+    junit_path = tmp_path / "out" / "junit.xml"
+    argv = [str(good), str(bad), str(missing), "gone.ipynb", "--execute"]
+    argv += ["--events", str(events_path), "--junit", str(junit_path)]
+    monkeypatch.setattr(sys, "argv", ["check_notebooks", *argv])
+    assert cn.main() == 1
+
+    events = [json.loads(line) for line in events_path.read_text().splitlines()]
+    assert [event["event"] for event in events if event["notebook"] == str(good)] == [
+        "notebook_started",
+        "dependencies_checked",
+        "execution_finished",
+    ]
+    finished = {e["notebook"]: e for e in events if e["event"] == "execution_finished"}
+    assert finished[str(bad)]["returncode"] == 2
+    assert str(missing) not in finished
+    deps = {e["notebook"]: e for e in events if e["event"] == "dependencies_checked"}
+    assert deps[str(missing)]["missing"] == ["no_such_module"]
+
+    suite = ET.parse(junit_path).getroot()
+    assert (suite.get("tests"), suite.get("failures"), suite.get("errors")) == (
+        "4",
+        "2",
+        "1",
+    )
+    cases = {case.get("name"): case for case in suite}
+    assert len(cases[str(good)]) == 0
+    assert cases[str(bad)].find("failure").get("message").endswith("exit code 2")
+    assert cases["gone.ipynb"].find("error") is not None
+
+
+def test_main_streams_worker_crash_as_error(monkeypatch, tmp_path):
+    import xml.etree.ElementTree as ET
+    from concurrent.futures import ThreadPoolExecutor
+    from concurrent.futures.process import BrokenProcessPool
+
+    good = tmp_path / "good.ipynb"
+    crash = tmp_path / "crash.ipynb"
+    make_notebook(good, ["x = 1"])
+    make_notebook(crash, ["y = 2"])
+
+    def fake_run(nb_path, *_):
+        if nb_path == crash:
+            raise BrokenProcessPool("worker died")
+        return cn.ExecutionOutcome(nb_path, 0, 0.1)
+
+    monkeypatch.setattr(cn, "run_execution", fake_run)
+    monkeypatch.setattr(
+        cn, "make_executor", lambda jobs, *_: ThreadPoolExecutor(max_workers=jobs)
+    )
+
+    events_path = tmp_path / "events.jsonl"
+    junit_path = tmp_path / "junit.xml"
+    argv = [str(good), str(crash), "--execute", "--jobs", "2", "--no-cache"]
+    argv += ["--events", str(events_path), "--junit", str(junit_path)]
+    monkeypatch.setattr(sys, "argv", ["check_notebooks", *argv])
+    assert cn.main() == 1
+
+    events = [json.loads(line) for line in events_path.read_text().splitlines()]
+    failed = [e for e in events if e["event"] == "execution_failed"]
+    assert [(e["notebook"], e["error"]) for e in failed] == [
+        (str(crash), "BrokenProcessPool")
+    ]
+
+    suite = ET.parse(junit_path).getroot()
+    assert (suite.get("tests"), suite.get("failures"), suite.get("errors")) == (
+        "2",
+        "0",
+        "1",
+    )
+    cases = {case.get("name"): case for case in suite}
+    assert "worker died" in cases[str(crash)].find("error").get("message")
+
+
+def _notebook_with_outputs(path: Path) -> None:
+    nb = nbformat.v4.new_notebook()
+    cell = nbformat.v4.new_code_cell(source="plot()")
+    cell.outputs = [
+        nbformat.v4.new_output("stream", name="stdout", text="line\n" * 2000),
+        nbformat.v4.new_output(
+            "display_data",
+            data={
+                "image/png": "A" * 5000,
+                "text/html": "<b>x</b>" * 1000,
+                "text/plain": "<Figure>",
+            },
+            metadata={"image/png": {"width": 400}},
+        ),
+    ]
+    nb.cells = [
+        nbformat.v4.new_markdown_cell("# Title"),
+        cell,
+        nbformat.v4.new_code_cell("1 + 1"),
+    ]
+    path.write_text(nbformat.writes(nb))
+
+
+def test_notebook_size_strips_outputs_in_place(tmp_path):
+    nb_path = tmp_path / "heavy.ipynb"
+    _notebook_with_outputs(nb_path)
+
+    measured = cn.notebook_size(nb_path)
+    assert [cell.cell_type for cell in measured.cells] == ["markdown", "code", "code"]
+    assert (
+        measured.cells[1].image_bytes == 5000 and measured.cells[1].output_bytes > 15000
+    )
+    assert (
+        measured.stripped_outputs == 0
+        and measured.file_bytes == measured.original_bytes
+    )
+
+    stripped = cn.notebook_size(
+        nb_path, strip=True, max_output_bytes=1024, max_image_bytes=1024
+    )
+    assert stripped.stripped_outputs == 2
+    assert stripped.file_bytes < stripped.original_bytes // 4
+
+    nb = nbformat.read(nb_path, as_version=4)
+    nbformat.validate(nb)
+    stream, display = nb.cells[1].outputs
+    assert stream.text.endswith("KB total]\n") and stream.text.startswith("line\n")
+    assert set(display.data) == {"text/plain"} and display.metadata == {}
+    # The rewrite keeps nbformat's own layout, so a second pass is a no-op.
+    assert nb_path.read_text() == nbformat.writes(nb) + "\n"
+    before = nb_path.stat().st_mtime_ns
+    assert (
+        cn.notebook_size(
+            nb_path, strip=True, max_output_bytes=1024, max_image_bytes=1024
+        ).stripped_outputs
+        == 0
+    )
+    assert nb_path.stat().st_mtime_ns == before
+
+
+def test_strip_outputs_replaces_lone_image_with_placeholder():
+    output = {
+        "output_type": "display_data",
+        "data": {"image/png": "A" * 100},
+        "metadata": {},
+    }
+    raw = {"cells": [{"cell_type": "code", "outputs": [output]}]}
+    assert cn.strip_outputs(raw, max_output_bytes=1000, max_image_bytes=10) == 1
+    (text,) = raw["cells"][0]["outputs"][0]["data"]["text/plain"]
+    assert text.startswith("[image/png output removed")
+
+
+def test_main_sizes_enforces_budgets(monkeypatch, tmp_path, caplog):
+    _notebook_with_outputs(tmp_path / "heavy.ipynb")
+    make_notebook(tmp_path / "light.ipynb", ["x = 1"])
+    (tmp_path / "_build").mkdir()
+    make_notebook(tmp_path / "_build" / "copy.ipynb", ["y = 2"])
+    assert [path.name for path in cn.all_notebooks(tmp_path)] == [
+        "heavy.ipynb",
+        "light.ipynb",
+    ]
+
+    monkeypatch.setattr(
+        sys, "argv", ["check_notebooks.py", "--sizes", "--budget-cell-output-kb", "12"]
+    )
+    with caplog.at_level(logging.INFO):
+        assert cn.main() == 1
+    assert "over budget: cell 1 outputs" in caplog.text
+
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        [
+            "check_notebooks.py",
+            "--sizes",
+            "--strip",
+            "--jobs",
+            "2",
+            "--truncate-output-kb",
+            "4",
+            "--drop-image-kb",
+            "2",
+            "--budget-cell-output-kb",
+            "12",
+        ],
+    )
+    caplog.clear()
+    with caplog.at_level(logging.INFO):
+        assert cn.main() == 0
+    assert "2 notebook(s)" in caplog.text and "2 output(s) stripped" in caplog.text
@@ -0,0 +1,53 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from tools import check_site_links as csl
+from tools.playwright_utils import load_expected_paths
+
+
+def write_page(path: Path, *hrefs: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    anchors = "".join(f'<li><a class="ref" href="{href}">link</a></li>' for href in hrefs)
+    # Pad past one chunk so tags straddle chunk boundaries.
+    padding = "<span>x</span>" * (csl.CHUNK_SIZE // 10)
+    path.write_text(f"<html><body>{padding}<ul>{anchors}</ul>{padding}</body></html>")
+
+
+def test_check_site_reports_unreachable_and_broken(tmp_path):
+    site = tmp_path / "html"
+    write_page(site / "README.html", "easy/intro.html#top", "https://example.com/")
+    write_page(site / "easy" / "intro.html", "../README.html", "../medium/", "gone.html")
+    write_page(site / "medium" / "index.html", "#local", "../_static/style.css")
+    write_page(site / "orphan.html", "README.html")
+    write_page(site / "_static" / "macros.html", "nowhere.html")
+
+    report = csl.check_site(
+        site,
+        {"README.html", "easy/intro.html", "orphan.html", "hard/missing.html"},
+        jobs=2,
+    )
+
+    assert report.graph["easy/intro.html"] == [
+        "README.html",
+        "medium/index.html",
+        "easy/gone.html",
+    ]
+    assert "_static/macros.html" not in report.graph
+    assert report.reachable == {"README.html", "easy/intro.html", "medium/index.html"}
+    assert report.unreachable == ["orphan.html"]
+    assert report.unbuilt == ["hard/missing.html"]
+    assert report.broken == [("easy/intro.html", "easy/gone.html")]
+    assert not report.ok
+
+
+@pytest.mark.skipif(not csl.DEFAULT_SITE.exists(), reason="site not built")
+def test_built_site_links_static():
+    report = csl.check_site(csl.DEFAULT_SITE, load_expected_paths(csl.DEFAULT_TOC))
+    assert not report.unreachable and not report.unbuilt, (report.unreachable, report.unbuilt)
+    assert not report.broken, report.broken
@@ -0,0 +1,48 @@
+import io
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+Image = pytest.importorskip("PIL.Image")
+
+from tools.gif_stream import StreamingGifWriter, split_single_frame_gif
+
+
+def png_bytes(color, size):
+    buffer = io.BytesIO()
+    Image.new("RGB", size, color).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def test_streaming_gif_writer_appends_cropped_frames(tmp_path):
+    out = tmp_path / "nested" / "showcase.gif"
+    with StreamingGifWriter(out, size=(160, 100), duration=0.25, max_pending=1) as writer:
+        writer.add(png_bytes((255, 0, 0), (1280, 9000)))
+        writer.add(png_bytes((0, 0, 255), (640, 100)))
+        writer.add(png_bytes((0, 128, 0), (320, 1000)))
+    assert writer.frames == 3
+
+    with Image.open(out) as gif:
+        assert gif.size == (160, 100)
+        assert gif.n_frames == 3
+        assert gif.info["duration"] == 250 and gif.info["loop"] == 0
+        colors = []
+        for index in range(gif.n_frames):
+            gif.seek(index)
+            frame = gif.convert("RGB")
+            colors.append((frame.getpixel((5, 5)), frame.getpixel((5, 95))))
+    assert colors == [
+        ((255, 0, 0), (255, 0, 0)),
+        ((0, 0, 255), (255, 255, 255)),  # short page padded with background
+        ((0, 128, 0), (0, 128, 0)),
+    ]
+
+
+def test_split_single_frame_gif_rejects_other_formats():
+    with pytest.raises(ValueError):
+        split_single_frame_gif(png_bytes((0, 0, 0), (4, 4)))
@@ -0,0 +1,231 @@
+"""Main-thread cost of ``_static/js/onboarding.js`` on the largest built pages.
+
+Each page is loaded with the current site bundle ("after") and with a bundle
+built from ``tests/data/onboarding_baseline.js``, the script before its
+non-critical work was deferred ("before", served without ``defer`` as it used
+to be), with a returning visitor's progress seeded in
+localStorage. Blocking time is summed from Long Tasks (Chromium only) and
+written with load timings to ``SITE_ONBOARDING_REPORT``. It is too noisy on
+shared runners to assert by default; set ``SITE_ONBOARDING_COMPARE_TBT=1`` to
+fail when blocking time regresses.
+"""
+
+import json
+import logging
+import os
+import re
+import statistics
+import subprocess
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("playwright.async_api")
+
+from tools import build_book
+from tools.optimize_assets import bundle_text
+from tools.playwright_utils import collect_page_metrics, load_expected_paths, serve_directory
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+TOC_PATH = PROJECT_ROOT / "_toc.yml"
+DOCS_ROOT = PROJECT_ROOT / "_build" / "html"
+SCRIPT = "_static/js/onboarding.js"
+LARGEST_PAGES = int(os.environ.get("SITE_ONBOARDING_PAGES", "3"))
+REPEATS = int(os.environ.get("SITE_ONBOARDING_REPEATS", "3"))
+# Chromium only: slow the CPU down so script cost shows up as long tasks.
+CPU_THROTTLING = float(os.environ.get("SITE_ONBOARDING_CPU_THROTTLING", "4"))
+# onboarding.js before non-critical work was deferred (synchronous init,
+# progress rewritten on every load). Set ONBOARDING_BASELINE_REF to compare
+# against the script at another git revision instead.
+BASELINE_PATH = PROJECT_ROOT / "tests" / "data" / "onboarding_baseline.js"
+BASELINE_REF = os.environ.get("ONBOARDING_BASELINE_REF")
+COMPARE_TBT = os.environ.get("SITE_ONBOARDING_COMPARE_TBT", "0") != "0"
+REPORT_PATH = Path(
+    os.environ.get("SITE_ONBOARDING_REPORT", PROJECT_ROOT / "_build" / "onboarding-benchmark.json")
+)
+# Time after the load event for idle callbacks and debounced writes to run.
+SETTLE_MS = 1500
+NAV_TIMEOUT_MS = 30_000
+
+LOGGER = logging.getLogger(__name__)
+LOGGER.addHandler(logging.NullHandler())
+
+# Installed before any page script: records long tasks and localStorage writes.
+INSTRUMENT_JS = """
+(() => {
+    window.__longTasks = [];
+    window.__storageWrites = 0;
+    const supported = (PerformanceObserver.supportedEntryTypes || []).includes('longtask');
+    window.__longTaskSupported = supported;
+    if (supported) {
+        new PerformanceObserver((list) => {
+            for (const entry of list.getEntries()) window.__longTasks.push(entry.duration);
+        }).observe({ type: 'longtask', buffered: true });
+    }
+    const setItem = Storage.prototype.setItem;
+    Storage.prototype.setItem = function (key, value) {
+        if (key === 'education_playground_progress') window.__storageWrites += 1;
+        return setItem.call(this, key, value);
+    };
+})();
+"""
+
+COLLECT_JS = """
+() => ({
+    longTaskSupported: window.__longTaskSupported,
+    blockingMs: window.__longTasks.reduce((total, duration) => total + Math.max(0, duration - 50), 0),
+    longTasks: window.__longTasks.length,
+    storageWrites: window.__storageWrites,
+    onboardingMs: performance.getEntriesByType('measure')
+        .filter((entry) => entry.name.startsWith('onboarding:'))
+        .reduce((total, entry) => total + entry.duration, 0),
+})
+"""
+
+
+def _git(*args: str) -> str:
+    return subprocess.run(
+        ["git", *args], cwd=PROJECT_ROOT, check=True, capture_output=True, text=True
+    ).stdout
+
+
+def _baseline_script() -> str:
+    """The "before" script: the fixture, or ``onboarding.js`` at ``BASELINE_REF``."""
+    if BASELINE_REF:
+        return _git("show", f"{BASELINE_REF}:{SCRIPT}")
+    return BASELINE_PATH.read_text()
+
+
+def _largest_pages(count: int):
+    pages = [rel for rel in load_expected_paths(TOC_PATH) if (DOCS_ROOT / rel).exists()]
+    return sorted(pages, key=lambda rel: (DOCS_ROOT / rel).stat().st_size, reverse=True)[:count]
+
+
+def _seeded_progress(pages) -> str:
+    """A returning visitor who has completed every lesson."""
+    lessons = sorted(load_expected_paths(TOC_PATH))
+    return json.dumps(
+        {
+            "level": "medium",
+            "completedLessons": [f"/{rel}" for rel in lessons],
+            "lastVisited": f"/{pages[0]}",
+            "startedAt": "2025-01-01T00:00:00.000Z",
+        }
+    )
+
+
+async def _install_baseline(context, baseline_bundle: str) -> None:
+    """Serve ``baseline_bundle`` for the site bundle, loaded blocking as before."""
+
+    async def serve_bundle(route):
+        await route.fulfill(body=baseline_bundle, content_type="application/javascript")
+
+    async def undefer(route):
+        response = await route.fetch()
+        html = re.sub(r"<script defer (src=\"[^\"]*_static/js/site\.)", r"<script \1", await response.text())
+        await route.fulfill(response=response, body=html)
+
+    await context.route(re.compile(r".*/_static/js/site\.[0-9a-f]+\.js$"), serve_bundle)
+    await context.route(re.compile(r".*\.html$"), undefer)
+
+
+async def _measure(browser_session, base_url, pages, progress, baseline_bundle=None):
+    """Average metrics per page over ``REPEATS`` cold loads."""
+    results = {}
+    for rel_path in pages:
+        samples = []
+        for _ in range(REPEATS):
+            context = await browser_session.browser.new_context()
+            try:
+                await context.add_init_script(
+                    "try { localStorage.setItem('education_playground_progress', %s); } catch (err) {}"
+                    % json.dumps(progress)
+                )
+                await context.add_init_script(INSTRUMENT_JS)
+                if baseline_bundle is not None:
+                    await _install_baseline(context, baseline_bundle)
+                page = await context.new_page()
+                if browser_session.engine == "chromium" and CPU_THROTTLING > 1:
+                    cdp = await context.new_cdp_session(page)
+                    await cdp.send("Emulation.setCPUThrottlingRate", {"rate": CPU_THROTTLING})
+                await page.goto(base_url + rel_path, wait_until="load", timeout=NAV_TIMEOUT_MS)
+                await page.wait_for_timeout(SETTLE_MS)
+                sample = await page.evaluate(COLLECT_JS)
+                sample.update(await collect_page_metrics(page))
+                samples.append(sample)
+            finally:
+                await context.close()
+
+        def mean(key):
+            values = [sample[key] for sample in samples if sample.get(key) is not None]
+            return statistics.mean(values) if values else None
+
+        results[rel_path] = {
+            "long_task_supported": all(sample["longTaskSupported"] for sample in samples),
+            "blocking_ms": mean("blockingMs"),
+            "long_tasks": mean("longTasks"),
+            "storage_writes": mean("storageWrites"),
+            "onboarding_ms": mean("onboardingMs"),
+            "dom_content_loaded_ms": mean("dom_content_loaded_ms"),
+            "load_ms": mean("load_ms"),
+        }
+    return results
+
+
+def test_onboarding_main_thread_blocking(browser_session):
+    baseline = _baseline_script()
+    build_book.build(PROJECT_ROOT)
+    pages = _largest_pages(LARGEST_PAGES)
+    if not pages:
+        pytest.skip(f"Built site not found at {DOCS_ROOT}")
+    mobile_nav = (PROJECT_ROOT / "_static" / "js" / "mobile-nav.js").read_text()
+    baseline_bundle = bundle_text("js", [baseline, mobile_nav])
+    progress = _seeded_progress(pages)
+
+    async def run():
+        with serve_directory(DOCS_ROOT) as base_url:
+            before = await _measure(browser_session, base_url, pages, progress, baseline_bundle)
+            after = await _measure(browser_session, base_url, pages, progress)
+        return before, after
+
+    before, after = browser_session.run(run())
+
+    REPORT_PATH.parent.mkdir(parents=True, exist_ok=True)
+    REPORT_PATH.write_text(
+        json.dumps(
+            {
+                "engine": browser_session.engine,
+                "baseline": BASELINE_REF or str(BASELINE_PATH.relative_to(PROJECT_ROOT)),
+                "cpu_throttling": CPU_THROTTLING if browser_session.engine == "chromium" else 1,
+                "repeats": REPEATS,
+                "pages": {rel: {"before": before[rel], "after": after[rel]} for rel in pages},
+            },
+            indent=2,
+        )
+        + "\n"
+    )
+    LOGGER.info("%-48s %12s %12s %s", "page", "TBT before", "TBT after", "progress writes")
+    for rel in pages:
+        LOGGER.info(
+            "%-48s %12s %12s %s -> %s",
+            rel,
+            before[rel]["blocking_ms"],
+            after[rel]["blocking_ms"],
+            before[rel]["storage_writes"],
+            after[rel]["storage_writes"],
+        )
+
+    # The returning visitor's progress is unchanged by a load of a page they
+    # already visited last, so the current script must not rewrite it.
+    assert after[pages[0]]["storage_writes"] == 0
+    assert all(after[rel]["storage_writes"] <= before[rel]["storage_writes"] for rel in pages)
+
+    if not all(after[rel]["long_task_supported"] for rel in pages):
+        LOGGER.info("%s does not report Long Tasks; no blocking time recorded", browser_session.engine)
+        return
+    before_total = sum(before[rel]["blocking_ms"] for rel in pages)
+    after_total = sum(after[rel]["blocking_ms"] for rel in pages)
+    LOGGER.info("Total blocking time: %.0f ms before, %.0f ms after", before_total, after_total)
+    if COMPARE_TBT:
+        # Allow for run-to-run noise; deferral should never make things worse.
+        assert after_total <= before_total * 1.1 + 25, (before_total, after_total)
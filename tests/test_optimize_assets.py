@@ -0,0 +1,100 @@
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from tools import optimize_assets as oa
+
+
+def test_minify_css_keeps_significant_spaces():
+    css = """
+    /* header */
+    .a > .b ,  .c :hover {
+        content: "a ;  b";
+        width: calc(100% - 2rem);
+    }
+    @media screen and (max-width: 768px) { .d { color: red; } }
+    """
+    assert oa.minify_css(css) == (
+        '.a>.b,.c :hover{content:"a ;  b";width:calc(100% - 2rem)}'
+        "@media screen and (max-width:768px){.d{color:red}}"
+    )
+
+
+def test_minify_js_preserves_literals_and_line_breaks():
+    js = """
+    // comment
+    const re = /\\/+$/g; /* block */ const half = a / 2;
+    const html = `
+        <p>${items.map((x) => `<i>${x}</i>`).join('')}</p>
+    `;
+    function f() {
+        return
+            1
+    }
+    let b = a + +c - -d
+    const s = '// not a comment';
+    """
+    out = oa.minify_js(js)
+    assert "comment" not in out.replace("'// not a comment'", "")
+    assert "const re=/\\/+$/g;const half=a/2;" in out
+    assert "`\n        <p>${items.map((x) => `<i>${x}</i>`).join('')}</p>\n    `" in out
+    assert "return\n1" in out
+    assert "a+ +c- -d" in out
+
+
+@pytest.mark.skipif(not shutil.which("node"), reason="node is not installed")
+@pytest.mark.parametrize("script", ["onboarding.js", "mobile-nav.js"])
+def test_minified_site_scripts_still_parse(tmp_path, script):
+    out = tmp_path / script
+    out.write_text(oa.minify_js((PROJECT_ROOT / "_static" / "js" / script).read_text()))
+    subprocess.run(["node", "--check", str(out)], check=True)
+
+
+def _page(prefix: str, scripts=("onboarding", "mobile-nav")) -> str:
+    tags = "".join(f'    <script src="{prefix}_static/js/{name}.js?v=1"></script>\n' for name in scripts)
+    return (
+        "<html><head>\n"
+        f'    <link rel="stylesheet" type="text/css" href="{prefix}_static/css/custom.css?v=2" />\n'
+        f"{tags}</head><body></body></html>\n"
+    )
+
+
+def test_optimize_site_bundles_hashes_and_rewrites(tmp_path):
+    static = tmp_path / "_static"
+    (static / "css").mkdir(parents=True)
+    (static / "js").mkdir()
+    (static / "css" / "custom.css").write_text("body {\n    margin: 0;\n}\n")
+    (static / "css" / "custom.css.backup").write_text("old")
+    (static / "js" / "onboarding.js").write_text("(function () {\n    window.a = 1;\n})();\n")
+    (static / "js" / "mobile-nav.js").write_text("(function () { window.b = 2 })()\n")
+    (static / "js" / "site.0123456789.js").write_text("stale")
+    (tmp_path / "easy").mkdir()
+    (tmp_path / "README.html").write_text(_page(""))
+    (tmp_path / "easy" / "01.html").write_text(_page("../"))
+    (tmp_path / "search.html").write_text(_page("", scripts=("mobile-nav",)))
+
+    report = oa.optimize_site(tmp_path)
+    css, js = (result.output for result in report.bundles)
+    assert css.startswith("css/custom.") and js.startswith("js/site.")
+    assert (static / js).read_text() == "(function(){window.a=1;})();\n(function(){window.b=2})()\n"
+    assert report.removed == ["_static/css/custom.css.backup"]
+    assert not (static / "js" / "site.0123456789.js").exists()
+    assert report.after_bytes < report.before_bytes
+    assert (report.pages_rewritten, report.requests_saved) == (3, 2)
+
+    nested = (tmp_path / "easy" / "01.html").read_text()
+    assert f'href="../_static/{css}"' in nested
+    assert nested.count("<script") == 1 and f'<script defer src="../_static/{js}"' in nested
+    # A page without every script of the bundle keeps its own script tags.
+    partial = (tmp_path / "search.html").read_text()
+    assert "mobile-nav.js?v=1" in partial and f"_static/{css}" in partial
+
+    again = oa.optimize_site(tmp_path)
+    assert again.pages_rewritten == 0 and [r.output for r in again.bundles] == [css, js]
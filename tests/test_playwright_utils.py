@@ -0,0 +1,132 @@
+import asyncio
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from tools import playwright_utils as pu
+
+
+BASE_URL = "file:///site/_build/html/"
+HOME_PAGE = "README.html"
+
+
+def test_canonicalizer_links_dedupe_in_page_order():
+    hrefs = [
+        "easy/01.html#intro",
+        "https://example.com/",
+        None,
+        "#top",
+        "medium/",
+        "easy/01.html",
+        "./",
+        "_static/custom.css",
+    ]
+    links = pu.LinkCanonicalizer(BASE_URL, home_page=HOME_PAGE).links(hrefs)
+    assert links == ["easy/01.html", "medium/index.html", "README.html"]
+
+
+def test_extract_internal_links_uses_single_evaluate():
+    class FakePage:
+        url = BASE_URL + "hard/01.html"
+
+        def __init__(self):
+            self.calls = []
+
+        async def evaluate(self, script):
+            self.calls.append(script)
+            return ["02.html", "mailto:x@y.z", "../hard/02.html#a"]
+
+    page = FakePage()
+    links = asyncio.run(pu.extract_internal_links(page, BASE_URL, home_page=HOME_PAGE))
+    assert links == ["hard/02.html"]
+    assert page.calls == [pu.LINK_EXTRACTION_JS]
+
+
+def test_crawl_frontier_dedupes_and_prioritises():
+    frontier = pu.CrawlFrontier(["README.html"], priority={"easy/01.html", "hard/01.html"})
+    assert frontier.extend(["genindex.html", "easy/01.html", "README.html"]) == 2
+    assert frontier.push("hard/01.html")
+    assert not frontier.push("genindex.html")
+
+    order = [frontier.pop() for _ in range(len(frontier))]
+    assert order == ["easy/01.html", "hard/01.html", "README.html", "genindex.html"]
+    assert "README.html" in frontier and not frontier
+    assert not frontier.push("README.html")
+    assert frontier.seen == 4
+
+
+def test_link_canonicalizer_resolves_per_page_and_counts_hits():
+    canon = pu.LinkCanonicalizer(BASE_URL, home_page=HOME_PAGE, maxsize=2)
+    page = BASE_URL + "easy/01.html"
+    assert canon("02.html", page) == "easy/02.html"
+    assert canon("../README.html#top", page) == "README.html"
+    assert canon("02.html", page) == "easy/02.html"
+    assert canon("02.html") == pu.normalize_internal_href(BASE_URL, "02.html", home_page=HOME_PAGE)
+    assert canon("#top", page) is None
+    assert canon("https://example.com/", page) is None
+    assert (canon.hits, canon.misses) == (1, 4)
+    assert "1 hits, 4 misses" in canon.stats() and "2/2 cached" in canon.stats()
+
+
+def test_serve_directory_and_block_heavy_resources(tmp_path):
+    from urllib.request import urlopen
+
+    (tmp_path / "README.html").write_text("<a href='x.html'>x</a>")
+    with pu.serve_directory(tmp_path) as base_url:
+        assert base_url.startswith("http://127.0.0.1:")
+        with urlopen(base_url + "README.html") as response:
+            assert b"x.html" in response.read()
+
+    class FakeRoute:
+        def __init__(self, resource_type):
+            self.request = type("Request", (), {"resource_type": resource_type})()
+            self.action = None
+
+        async def abort(self):
+            self.action = "abort"
+
+        async def continue_(self):
+            self.action = "continue"
+
+    class FakeContext:
+        async def route(self, pattern, handler):
+            self.pattern, self.handler = pattern, handler
+
+    async def exercise():
+        context = FakeContext()
+        await pu.block_heavy_resources(context)
+        routes = [FakeRoute(kind) for kind in ("image", "font", "document", "script")]
+        for route in routes:
+            await context.handler(route)
+        return context.pattern, [route.action for route in routes]
+
+    pattern, actions = asyncio.run(exercise())
+    assert pattern == "**/*"
+    assert actions == ["abort", "abort", "continue", "continue"]
+
+
+def test_performance_budget_and_metrics_report(tmp_path):
+    class FakePage:
+        async def evaluate(self, script):
+            assert script == pu.PAGE_METRICS_JS
+            return {"dom_content_loaded_ms": 120.5, "load_ms": None, "dom_nodes": 900, "transfer_bytes": 2048}
+
+    metrics = {
+        "README.html": asyncio.run(pu.collect_page_metrics(FakePage())),
+        "hard/01.html": {"dom_content_loaded_ms": 80.0, "load_ms": 900.0, "dom_nodes": 20_000},
+    }
+    budget = pu.PerformanceBudget.from_env({"SITE_BUDGET_LOAD_MS": "500", "SITE_BUDGET_TRANSFER_BYTES": "0"})
+    assert budget.load_ms == 500 and budget.transfer_bytes is None
+    assert budget.violations(metrics["README.html"]) == []
+
+    report = pu.write_metrics_report(tmp_path / "metrics.json", metrics, budget)
+    assert report["violations"] == {"hard/01.html": ["load_ms 900 > 500", "dom_nodes 20000 > 15000"]}
+    assert report["missing"] == {
+        "README.html": ["first_contentful_paint_ms", "load_ms"],
+        "hard/01.html": ["first_contentful_paint_ms"],
+    }
+    assert report["summary"]["dom_nodes"] == {"mean": 10_450, "max": 20_000}
+    assert "load_ms" in report["summary"] and (tmp_path / "metrics.json").exists()
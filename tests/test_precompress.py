@@ -0,0 +1,102 @@
+import gzip
+import os
+import sys
+from pathlib import Path
+from urllib.request import Request, urlopen
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from tools import precompress as pc
+from tools.playwright_utils import serve_directory
+
+
+def _make_site(root: Path) -> None:
+    (root / "easy").mkdir(parents=True)
+    (root / "README.html").write_text("<p>hello</p>\n" * 200)
+    (root / "easy" / "01.html").write_text("<div>lesson</div>\n" * 100)
+    (root / "tiny.js").write_text("x()")
+    (root / "logo.png").write_bytes(b"\x89PNG" * 500)
+    (root / "gone.html.gz").write_bytes(b"stale")
+    (root / "data.csv.gz").write_bytes(gzip.compress(b"a,b\n1,2\n"))
+
+
+def test_precompress_site_writes_siblings_and_prunes(tmp_path):
+    _make_site(tmp_path)
+    report = pc.precompress_site(tmp_path, encodings=("gzip",))
+
+    assert report.files == 2 and report.removed == ["gone.html.gz"]
+    assert gzip.decompress((tmp_path / "README.html.gz").read_bytes()) == (tmp_path / "README.html").read_bytes()
+    assert (tmp_path / "easy" / "01.html.gz").exists()
+    assert not (tmp_path / "tiny.js.gz").exists() and not (tmp_path / "logo.png.gz").exists()
+    assert report.compressed_bytes["gzip"] < report.original_bytes
+
+    # Unchanged sources reuse their siblings; edited ones are recompressed.
+    sibling = tmp_path / "README.html.gz"
+    os.utime(sibling, ns=(0, sibling.stat().st_mtime_ns + 10**9))
+    before = sibling.stat().st_mtime_ns
+    pc.precompress_site(tmp_path, encodings=("gzip",))
+    assert sibling.stat().st_mtime_ns == before
+    (tmp_path / "README.html").write_text("<p>changed</p>\n" * 200)
+    os.utime(tmp_path / "README.html", ns=(0, before + 10**9))
+    pc.precompress_site(tmp_path, encodings=("gzip",))
+    assert b"changed" in gzip.decompress(sibling.read_bytes())
+
+    # Shipped archives are not siblings; a page that shrank loses its sibling.
+    assert (tmp_path / "data.csv.gz").exists()
+    (tmp_path / "easy" / "01.html").write_text("<div>short</div>\n")
+    report = pc.precompress_site(tmp_path, encodings=("gzip",))
+    assert report.removed == ["easy/01.html.gz"]
+
+
+def test_precompressed_server_negotiates_encoding(tmp_path):
+    _make_site(tmp_path)
+    pc.precompress_site(tmp_path, encodings=("gzip",))
+
+    def get(base_url, path, encoding):
+        headers = {"Accept-Encoding": encoding} if encoding else {}
+        with urlopen(Request(base_url + path, headers=headers)) as response:
+            return response.headers, response.read()
+
+    with serve_directory(tmp_path, precompressed=True) as base_url:
+        headers, body = get(base_url, "README.html", "br;q=0, gzip")
+        assert headers["Content-Encoding"] == "gzip"
+        assert headers["Content-Type"] == "text/html"
+        assert headers["Vary"] == "Accept-Encoding"
+        assert gzip.decompress(body) == (tmp_path / "README.html").read_bytes()
+
+        headers, body = get(base_url, "README.html", None)
+        assert headers["Content-Encoding"] is None
+        assert body == (tmp_path / "README.html").read_bytes()
+
+        headers, _ = get(base_url, "tiny.js", "gzip")
+        assert headers["Content-Encoding"] is None
+
+        # A sibling older than its source is stale and not served.
+        sibling = tmp_path / "README.html.gz"
+        os.utime(sibling, ns=(0, (tmp_path / "README.html").stat().st_mtime_ns - 10**9))
+        headers, body = get(base_url, "README.html", "gzip")
+        assert headers["Content-Encoding"] is None
+        assert body == (tmp_path / "README.html").read_bytes()
+
+    with serve_directory(tmp_path) as base_url:
+        headers, _ = get(base_url, "README.html", "gzip")
+        assert headers["Content-Encoding"] is None
+
+
+def test_brotli_siblings_when_available(tmp_path):
+    brotli = pytest.importorskip("brotli")
+    _make_site(tmp_path)
+    report = pc.precompress_site(tmp_path, encodings=("gzip", "br"), jobs=2)
+    assert report.compressed_bytes["br"] < report.original_bytes
+    payload = (tmp_path / "README.html.br").read_bytes()
+    assert brotli.decompress(payload) == (tmp_path / "README.html").read_bytes()
+
+    with serve_directory(tmp_path, precompressed=True) as base_url:
+        request = Request(base_url + "README.html", headers={"Accept-Encoding": "gzip, br"})
+        with urlopen(request) as response:
+            assert response.headers["Content-Encoding"] == "br"
+            assert response.read() == payload
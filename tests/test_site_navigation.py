@@ -1,16 +1,26 @@
 import asyncio
 import contextlib
 import logging
-import shutil
-import subprocess
-import sys
-from collections import deque
+import os
+import time
 from pathlib import Path
 
 import pytest
-from playwright.async_api import Error, async_playwright
 
-from tools.playwright_utils import load_expected_paths, normalize_internal_href
+pytest.importorskip("playwright.async_api")
+
+from tools import build_book
+from tools.playwright_utils import (
+    CrawlFrontier,
+    LinkCanonicalizer,
+    PerformanceBudget,
+    block_heavy_resources,
+    collect_page_metrics,
+    extract_internal_links,
+    load_expected_paths,
+    serve_directory,
+    write_metrics_report,
+)
 
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
@@ -20,117 +30,169 @@ BASE_URL = DOCS_ROOT.resolve().as_uri().rstrip("/") + "/"
 HOME_PAGE = "README.html"
 NAV_TIMEOUT_MS = 15_000
 MAX_EXTRA_PAGES = 25
+CRAWL_WORKERS = int(os.environ.get("SITE_CRAWL_WORKERS", "4"))
+# Fast mode serves the build over loopback HTTP so images, fonts and media can
+# be blocked, and only waits for DOMContentLoaded. Set SITE_CRAWL_JS=0 to also
+# disable JavaScript for pure link checks.
+FAST_CRAWL = os.environ.get("SITE_CRAWL_FAST", "1") != "0"
+CRAWL_JS = os.environ.get("SITE_CRAWL_JS", "1") != "0"
+# Per-page timing/size metrics are written here and checked against budgets
+# (override limits with SITE_BUDGET_<METRIC>, e.g. SITE_BUDGET_DOM_NODES=20000).
+# A full crawl records them as it goes. Fast-mode timings and transfer sizes
+# would be incomplete, so there they need a second pass that waits for ``load``
+# with nothing blocked; set SITE_METRICS=1 to run it.
+COLLECT_METRICS = os.environ.get("SITE_METRICS", "0") != "0"
+METRICS_REPORT = Path(os.environ.get("SITE_METRICS_REPORT", PROJECT_ROOT / "_build" / "site-metrics.json"))
 
 LOGGER = logging.getLogger(__name__)
 LOGGER.addHandler(logging.NullHandler())
 
 
 def _ensure_html_build() -> None:
-    if DOCS_ROOT.exists():
-        return
-
-    LOGGER.info("HTML build not found; running `jupyter-book build .`")
-    jb_bin = shutil.which("jupyter-book")
-    if not jb_bin:
-        candidates = [
-            Path(sys.executable).with_name("jupyter-book"),
-            Path.home() / "Library" / "Python" / f"{sys.version_info.major}.{sys.version_info.minor}" / "bin" / "jupyter-book",
-        ]
-        for candidate in candidates:
-            if candidate.exists():
-                jb_bin = str(candidate)
-                break
-    if not jb_bin:
-        raise RuntimeError("jupyter-book CLI not found on PATH")
-
-    subprocess.run([jb_bin, "build", "."], check=True, cwd=PROJECT_ROOT)
-
-
-async def _launch_browser(playwright):
-    errors = []
-    for launcher, name in (
-        (playwright.chromium, "Chromium"),
-        (playwright.firefox, "Firefox"),
-        (playwright.webkit, "WebKit"),
-    ):
-        try:
-            LOGGER.debug("Attempting to launch %s", name)
-            browser = await launcher.launch(headless=True)
-            return browser, None
-        except Error as exc:  # pragma: no cover - depends on environment capabilities
-            LOGGER.warning("Failed to launch %s: %s", name, exc)
-            errors.append(f"{name}: {exc}")
-    return None, "; ".join(errors)
+    """Build or refresh the site; a no-op when no _toc.yml input changed."""
+    build_book.build(PROJECT_ROOT)
 
 
-async def _crawl_site(expected_pages):
-    _ensure_html_build()
+async def _crawl_site(context, expected_pages, workers=CRAWL_WORKERS, fast=FAST_CRAWL, metrics=None):
+    """Crawl from the home page with ``workers`` pages of ``context``; returns visited paths.
 
-    async with async_playwright() as p:
-        browser, err = await _launch_browser(p)
-        if not browser:
-            return None, err
+    Outside fast mode, page metrics are recorded into ``metrics`` when given.
+    """
+    _ensure_html_build()
 
-        context = await browser.new_context()
-        page = await context.new_page()
-        page.set_default_navigation_timeout(NAV_TIMEOUT_MS)
-        page.set_default_timeout(NAV_TIMEOUT_MS)
+    server = serve_directory(DOCS_ROOT) if fast else contextlib.nullcontext(BASE_URL)
+    with server as base_url:
+        if fast:
+            await block_heavy_resources(context)
+        pages = []
+        for _ in range(max(1, workers)):
+            page = await context.new_page()
+            page.set_default_navigation_timeout(NAV_TIMEOUT_MS)
+            page.set_default_timeout(NAV_TIMEOUT_MS)
+            pages.append(page)
 
         visited = set()
-        queue = deque([HOME_PAGE])
+        frontier = CrawlFrontier([HOME_PAGE], priority=expected_pages)
+        canonicalizer = LinkCanonicalizer(base_url, home_page=HOME_PAGE)
+        wakeup = asyncio.Condition()
+        in_flight = 0
+        finished = False
         max_pages = len(expected_pages) + MAX_EXTRA_PAGES
+        wait_until = "domcontentloaded" if fast else "load"
+        page_seconds = []
+
+        async def next_path():
+            nonlocal in_flight
+            async with wakeup:
+                await wakeup.wait_for(lambda: finished or frontier or not in_flight)
+                if finished or not frontier:
+                    return None
+                in_flight += 1
+                return frontier.pop()
+
+        async def crawl(page):
+            nonlocal in_flight, finished
+            while (rel_path := await next_path()) is not None:
+                try:
+                    target_url = f"{base_url}{rel_path}"
+                    LOGGER.info("Visiting %s (%d/%d)", rel_path, len(visited) + 1, len(expected_pages))
+                    started = time.perf_counter()
+                    await page.goto(target_url, wait_until=wait_until)
+                    page_seconds.append(time.perf_counter() - started)
+                    visited.add(rel_path)
+                    if metrics is not None and not fast:
+                        metrics[rel_path] = await collect_page_metrics(page)
+                    frontier.extend(
+                        await extract_internal_links(
+                            page, base_url, home_page=HOME_PAGE, canonicalizer=canonicalizer
+                        )
+                    )
 
+                    if expected_pages.issubset(visited):
+                        LOGGER.info("Reached all expected pages; stopping crawl.")
+                        finished = True
+                    elif len(visited) > max_pages:
+                        LOGGER.warning(
+                            "Visited %d pages, exceeding the allowed %d (expected %d). Aborting crawl.",
+                            len(visited),
+                            max_pages,
+                            len(expected_pages),
+                        )
+                        finished = True
+                finally:
+                    async with wakeup:
+                        in_flight -= 1
+                        wakeup.notify_all()
+
+        tasks = [asyncio.create_task(crawl(page)) for page in pages]
         try:
-            while queue:
-                rel_path = queue.popleft()
-                if rel_path in visited:
-                    continue
-
-                target_url = f"{BASE_URL}{rel_path}"
-                LOGGER.info("Visiting %s (%d/%d)", rel_path, len(visited) + 1, len(expected_pages))
-                await page.goto(target_url)
-                visited.add(rel_path)
-
-                anchors = await page.locator("a[href]").all()
-                for anchor in anchors:
-                    href = await anchor.get_attribute("href")
-                    candidate = normalize_internal_href(BASE_URL, href, home_page=HOME_PAGE)
-                    if not candidate:
-                        continue
-                    if candidate in visited or candidate in queue:
-                        continue
-                    queue.append(candidate)
-
-                if expected_pages.issubset(visited):
-                    LOGGER.info("Reached all expected pages; stopping crawl.")
-                    break
-
-                if len(visited) > max_pages:
-                    LOGGER.warning(
-                        "Visited %d pages, exceeding the allowed %d (expected %d). Aborting crawl.",
-                        len(visited),
-                        max_pages,
-                        len(expected_pages),
-                    )
-                    break
+            await asyncio.gather(*tasks)
         finally:
-            with contextlib.suppress(Exception):
-                await page.close()
-            with contextlib.suppress(Exception):
-                await context.close()
-            with contextlib.suppress(Exception):
-                await browser.close()
-
-    return visited, None
-
-
-def test_site_navigation_bfs(caplog):
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            LOGGER.info(
+                "Crawled %d page(s), %.0f ms per page (%s mode); %s",
+                len(visited),
+                1000 * sum(page_seconds) / max(len(page_seconds), 1),
+                "fast" if fast else "full",
+                canonicalizer.stats(),
+            )
+            for page in pages:
+                with contextlib.suppress(Exception):
+                    await page.close()
+
+    return visited
+
+
+async def _measure_pages(browser, rel_paths, workers=CRAWL_WORKERS):
+    """Full ``load`` of each page with ``workers`` pages of a fresh, unblocked context."""
+    metrics = {}
+    remaining = iter(sorted(rel_paths))
+    context = await browser.new_context()
+    context.set_default_navigation_timeout(NAV_TIMEOUT_MS)
+
+    async def measure(page, base_url):
+        for rel_path in remaining:
+            await page.goto(f"{base_url}{rel_path}", wait_until="load")
+            metrics[rel_path] = await collect_page_metrics(page)
+
+    try:
+        pages = [await context.new_page() for _ in range(max(1, workers))]
+        with serve_directory(DOCS_ROOT) as base_url:
+            await asyncio.gather(*(measure(page, base_url) for page in pages))
+    finally:
+        await context.close()
+    return metrics
+
+
+@pytest.mark.browser_context(java_script_enabled=CRAWL_JS)
+def test_site_navigation_bfs(caplog, browser_session, browser_context):
     caplog.set_level(logging.INFO)
     expected = load_expected_paths(TOC_PATH)
 
-    visited, err = asyncio.run(_crawl_site(expected))
-    if visited is None:
-        pytest.skip(f"Playwright browser launch failed: {err}")
-
+    metrics = {}
+    visited = browser_session.run(_crawl_site(browser_context, expected, metrics=metrics))
     missing = sorted(expected - visited)
     assert not missing, f"Missing pages during crawl: {missing}"
+
+    if FAST_CRAWL:
+        if not COLLECT_METRICS:
+            LOGGER.info("Fast crawl; set SITE_METRICS=1 to record page metrics")
+            return
+        metrics = browser_session.run(_measure_pages(browser_session.browser, expected))
+    metrics = {page: values for page, values in metrics.items() if page in expected}
+
+    report = write_metrics_report(METRICS_REPORT, metrics, PerformanceBudget.from_env())
+    LOGGER.info("Wrote page metrics for %d page(s) to %s", len(metrics), METRICS_REPORT)
+    for page, absent in report["missing"].items():
+        LOGGER.warning("%s: no value for budgeted %s; not checked", page, ", ".join(absent))
+    # Paint timing is engine-specific, but every engine reports these after ``load``.
+    unmeasured = [
+        page
+        for page, absent in report["missing"].items()
+        if {"dom_content_loaded_ms", "load_ms"} & set(absent)
+    ]
+    assert not unmeasured, f"Pages without load timings: {unmeasured}"
+    over = [f"{page}: {', '.join(problems)}" for page, problems in report["violations"].items()]
+    assert not over, "Pages over performance budget:\n" + "\n".join(over)
@@ -0,0 +1,390 @@
+#!/usr/bin/env python3
+"""Incremental Jupyter Book build driver with input fingerprinting.
+
+Every source listed in ``_toc.yml`` plus ``_toc.yml``, ``_config.yml`` and
+``_static/`` is fingerprinted into ``_build/.build-manifest.json`` after a
+successful build. Later runs compare against it, report which pages are stale
+and skip ``jupyter-book build`` entirely when nothing changed.
+
+With ``--jobs N`` the book is built through Sphinx's parallel mode: worker
+processes read and render chunks of pages, their environments are merged into
+one, and the single ``_build/html`` site is written by ``N`` writers.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import shutil
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence
+
+if __package__ in (None, ""):  # allow `python tools/build_book.py`
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from tools import optimize_assets, precompress
+from tools.playwright_utils import load_expected_paths
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+TOC_NAME = "_toc.yml"
+CONFIG_NAME = "_config.yml"
+STATIC_DIR = "_static"
+BUILD_DIR = "_build"
+MANIFEST_NAME = ".build-manifest.json"
+# Jupyter Book resolves a ``file:`` entry to the first of these that exists.
+SOURCE_SUFFIXES = (".ipynb", ".md", ".myst", ".rst")
+
+LOGGER = logging.getLogger(__name__)
+
+
+def source_for(root: Path, page: str) -> Optional[str]:
+    """Return the source file behind a built page such as ``easy/01.html``."""
+    stem = page[: -len(".html")] if page.endswith(".html") else page
+    for suffix in SOURCE_SUFFIXES:
+        if (root / f"{stem}{suffix}").is_file():
+            return f"{stem}{suffix}"
+    return None
+
+
+def site_pages(root: Path, toc_name: str = TOC_NAME) -> Dict[str, Optional[str]]:
+    """Map every page listed in the table of contents to its source (or ``None``)."""
+    return {page: source_for(root, page) for page in sorted(load_expected_paths(root / toc_name))}
+
+
+def global_inputs(root: Path, toc_name: str = TOC_NAME) -> List[str]:
+    """Inputs that affect every page: the TOC, the config and all static assets."""
+    inputs = [name for name in (toc_name, CONFIG_NAME) if (root / name).is_file()]
+    static = root / STATIC_DIR
+    if static.is_dir():
+        inputs.extend(
+            sorted(path.relative_to(root).as_posix() for path in static.rglob("*") if path.is_file())
+        )
+    return inputs
+
+
+def file_digest(path: Path) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    with path.open("rb") as fh:
+        for chunk in iter(lambda: fh.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class BuildManifest:
+    """Fingerprints of the inputs used by the last successful build.
+
+    Digests are only recomputed for files whose size or mtime changed, so an
+    up-to-date check costs one ``stat`` per input.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.files: Dict[str, Dict[str, object]] = {}
+        self.pages: Dict[str, Optional[str]] = {}
+        if path.exists():
+            try:
+                data = json.loads(path.read_text())
+                self.files = data.get("files", {})
+                self.pages = data.get("pages", {})
+            except (OSError, ValueError):
+                LOGGER.warning("Ignoring unreadable build manifest at %s", path)
+
+    def fingerprint(self, root: Path, inputs: Sequence[str]) -> Dict[str, Dict[str, object]]:
+        """Return ``{input: {size, mtime_ns, digest}}``, reusing unchanged digests."""
+        current: Dict[str, Dict[str, object]] = {}
+        for rel_path in inputs:
+            path = root / rel_path
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            previous = self.files.get(rel_path)
+            if previous and previous.get("size") == stat.st_size and previous.get("mtime_ns") == stat.st_mtime_ns:
+                digest = previous["digest"]
+            else:
+                digest = file_digest(path)
+            current[rel_path] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "digest": digest}
+        return current
+
+    def save(self, files: Dict[str, Dict[str, object]], pages: Dict[str, Optional[str]]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"files": files, "pages": pages, "built": time.time()}, indent=1))
+        os.replace(tmp, self.path)
+        self.files, self.pages = files, pages
+
+
+@dataclass
+class BuildPlan:
+    """What changed since the last build and which pages it makes stale."""
+
+    pages: Dict[str, Optional[str]]
+    fingerprints: Dict[str, Dict[str, object]]
+    changed: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    stale: List[str] = field(default_factory=list)
+    missing_sources: List[str] = field(default_factory=list)
+    full: bool = False
+
+    @property
+    def up_to_date(self) -> bool:
+        return not self.stale and not self.removed
+
+
+def plan_build(root: Path, manifest: BuildManifest, *, toc_name: str = TOC_NAME) -> BuildPlan:
+    """Compare current inputs against ``manifest`` and list the stale pages.
+
+    A change to any global input (see :func:`global_inputs`) or to the set of
+    pages makes the whole site stale; otherwise only pages whose source
+    changed, or whose HTML output is missing, are.
+    """
+    pages = site_pages(root, toc_name)
+    shared = global_inputs(root, toc_name)
+    sources = sorted({source for source in pages.values() if source})
+    fingerprints = manifest.fingerprint(root, shared + sources)
+
+    plan = BuildPlan(pages=pages, fingerprints=fingerprints)
+    plan.missing_sources = sorted(page for page, source in pages.items() if source is None)
+    plan.changed = sorted(
+        rel_path
+        for rel_path, entry in fingerprints.items()
+        if manifest.files.get(rel_path, {}).get("digest") != entry["digest"]
+    )
+    plan.removed = sorted(set(manifest.files) - set(fingerprints))
+    plan.full = (
+        not manifest.files
+        or pages != manifest.pages
+        or any(rel_path in plan.changed or rel_path in plan.removed for rel_path in shared)
+    )
+
+    html_root = root / BUILD_DIR / "html"
+    changed = set(plan.changed)
+    plan.stale = sorted(
+        page
+        for page, source in pages.items()
+        if source
+        and (plan.full or source in changed or not (html_root / page).is_file())
+    )
+    return plan
+
+
+def tracks(pages: Iterable[str]) -> Dict[str, List[str]]:
+    """Group pages by track, i.e. their top-level directory (``root`` for the rest)."""
+    grouped: Dict[str, List[str]] = {}
+    for page in sorted(pages):
+        track = page.split("/", 1)[0] if "/" in page else "root"
+        grouped.setdefault(track, []).append(page)
+    return grouped
+
+
+def default_jobs(pages: Iterable[str]) -> int:
+    """One worker per track, capped at the number of CPUs."""
+    return max(1, min(os.cpu_count() or 1, len(tracks(pages))))
+
+
+def sphinx_build(
+    root: Path,
+    *,
+    jobs: int,
+    force_all: bool = False,
+    freshenv: bool = False,
+    toc_name: str = TOC_NAME,
+) -> None:
+    """Build the book in-process like ``jupyter-book build``, with ``jobs`` Sphinx workers.
+
+    ``force_all`` together with ``freshenv`` matches ``jupyter-book build
+    --all``: every page is rewritten and the pickled environment is discarded
+    rather than reused.
+
+    Parallel reading and writing only happen when every extension declares
+    itself parallel-safe; Sphinx logs a warning and falls back to serial
+    otherwise.
+    """
+    from jupyter_book.sphinx import build_sphinx
+
+    config = root / CONFIG_NAME
+    result = build_sphinx(
+        root,
+        root / BUILD_DIR / "html",
+        noconfig=True,
+        path_config=str(config) if config.is_file() else None,
+        confoverrides={"external_toc_path": (root / toc_name).as_posix(), "latex_individualpages": False},
+        force_all=force_all,
+        freshenv=freshenv,
+        jobs=jobs,
+        quiet=True,
+    )
+    if isinstance(result, BaseException):
+        raise RuntimeError(f"Sphinx build failed: {result}") from result
+    if result:
+        raise RuntimeError(f"Sphinx build exited with status {result}")
+
+
+def find_jupyter_book() -> Optional[str]:
+    """Locate the ``jupyter-book`` CLI, including per-user install locations."""
+    found = shutil.which("jupyter-book")
+    if found:
+        return found
+    candidates = [
+        Path(sys.executable).with_name("jupyter-book"),
+        Path.home() / "Library" / "Python" / f"{sys.version_info.major}.{sys.version_info.minor}" / "bin" / "jupyter-book",
+    ]
+    for candidate in candidates:
+        if candidate.exists():
+            return str(candidate)
+    return None
+
+
+def build(
+    root: Path = PROJECT_ROOT,
+    *,
+    force: bool = False,
+    toc_name: str = TOC_NAME,
+    command: Optional[Sequence[str]] = None,
+    jobs: int = 1,
+    optimize: bool = True,
+    compress: bool = True,
+) -> BuildPlan:
+    """Rebuild the book if (and only if) its inputs changed since the last build.
+
+    ``command`` overrides the builder (``jupyter-book build <root>`` by
+    default); ``--all`` is appended when global inputs changed so Sphinx does
+    not keep stale cached doctrees. ``jobs > 1`` builds in-process with
+    parallel Sphinx workers instead. With ``optimize`` the custom static
+    assets are then bundled and minified (see :mod:`tools.optimize_assets`),
+    and with ``compress`` ``.gz``/``.br`` siblings are written (see
+    :mod:`tools.precompress`). The manifest is only updated on success.
+    """
+    manifest = BuildManifest(root / BUILD_DIR / MANIFEST_NAME)
+    plan = plan_build(root, manifest, toc_name=toc_name)
+    for page in plan.missing_sources:
+        LOGGER.warning("No source found for %s listed in %s", page, toc_name)
+    if plan.up_to_date and not force:
+        LOGGER.info("Site is up to date (%d page(s)); skipping build.", len(plan.pages))
+        return plan
+
+    if plan.changed:
+        LOGGER.info("Changed inputs: %s", ", ".join(plan.changed))
+    if plan.removed:
+        LOGGER.info("Removed inputs: %s", ", ".join(plan.removed))
+    LOGGER.info(
+        "%d of %d page(s) stale%s",
+        len(plan.stale),
+        len(plan.pages),
+        " (full rebuild)" if plan.full or force else "",
+    )
+    for track, pages in tracks(plan.stale).items():
+        LOGGER.debug("Stale in %s: %s", track, ", ".join(pages))
+
+    start = time.perf_counter()
+    if jobs > 1 and command is None:
+        LOGGER.info("Building with %d parallel Sphinx worker(s)", jobs)
+        rebuild_all = plan.full or force
+        sphinx_build(root, jobs=jobs, force_all=rebuild_all, freshenv=rebuild_all, toc_name=toc_name)
+    else:
+        if command is None:
+            jb_bin = find_jupyter_book()
+            if not jb_bin:
+                raise RuntimeError("jupyter-book CLI not found on PATH")
+            command = [jb_bin, "build", str(root)]
+        argv = list(command) + (["--all"] if plan.full or force else [])
+        subprocess.run(argv, check=True, cwd=root)
+
+    if optimize:
+        optimize_assets.log_report(optimize_assets.optimize_site(root / BUILD_DIR / "html"))
+    if compress:
+        started = time.perf_counter()
+        report = precompress.precompress_site(root / BUILD_DIR / "html", jobs=os.cpu_count() or 1)
+        precompress.log_report(report, time.perf_counter() - started)
+    LOGGER.info("Build finished in %.1fs", time.perf_counter() - start)
+    manifest.save(plan.fingerprints, plan.pages)
+    return plan
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--root",
+        type=Path,
+        default=PROJECT_ROOT,
+        help="Book directory containing _toc.yml and _config.yml (default: repository root).",
+    )
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Only report stale pages; exit 1 if a rebuild is needed.",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Rebuild everything even if no inputs changed.",
+    )
+    parser.add_argument(
+        "--no-optimize",
+        action="store_true",
+        help="Skip bundling and minifying _static assets after the build.",
+    )
+    parser.add_argument(
+        "--no-compress",
+        action="store_true",
+        help="Skip writing precompressed .gz/.br siblings after the build.",
+    )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        default="1",
+        help="Parallel Sphinx workers, or 'auto' for one per track up to the CPU count (default: 1).",
+    )
+    parser.add_argument(
+        "--log-level",
+        default="INFO",
+        choices=["CRITICAL", "ERROR", "WARNING", "INFO", "DEBUG"],
+        help="Logging verbosity (default: INFO).",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=getattr(logging, args.log_level),
+        format="%(levelname)s %(message)s",
+    )
+    root = args.root.resolve()
+
+    if args.check:
+        plan = plan_build(root, BuildManifest(root / BUILD_DIR / MANIFEST_NAME))
+        for track, pages in tracks(plan.stale).items():
+            LOGGER.info("Stale in %s (%d): %s", track, len(pages), ", ".join(pages))
+        for rel_path in plan.removed:
+            LOGGER.info("Removed input: %s", rel_path)
+        LOGGER.info(
+            "%s: %d of %d page(s) stale",
+            "Up to date" if plan.up_to_date else "Rebuild needed",
+            len(plan.stale),
+            len(plan.pages),
+        )
+        return 0 if plan.up_to_date else 1
+
+    if args.jobs == "auto":
+        jobs = default_jobs(site_pages(root))
+    else:
+        try:
+            jobs = max(1, int(args.jobs))
+        except ValueError:
+            parser.error(f"--jobs must be an integer or 'auto', not {args.jobs!r}")
+    try:
+        build(root, force=args.force, jobs=jobs, optimize=not args.no_optimize, compress=not args.no_compress)
+    except (RuntimeError, subprocess.CalledProcessError) as exc:
+        LOGGER.error("Build failed: %s", exc)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover - entry point exercised via CLI
+    raise SystemExit(main())
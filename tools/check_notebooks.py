@@ -5,62 +5,540 @@ from __future__ import annotations
 
 import argparse
 import ast
+import functools
+import hashlib
 import importlib
+import importlib.metadata
+import importlib.util
 import json
 import logging
+import multiprocessing.util
+import os
 import subprocess
 import sys
+import time
+from concurrent.futures import (
+    Executor,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    as_completed,
+)
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable, List, Set, Tuple
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
 
 
 DEFAULT_NOTEBOOKS = [
     Path("hard/10_performance_computing.ipynb"),
     Path("hard/11_cuda_and_parallel_computing.ipynb"),
 ]
+CACHE_DIR = Path(".nbexec-cache")
+ENGINES = ("nbconvert", "nbclient")
+PROBES = ("import", "spec", "subprocess")
 
 
-def collect_imports(nb_path: Path) -> Set[str]:
-    """Return the set of top-level modules imported in the notebook."""
-    raw = json.loads(nb_path.read_text())
+def cell_imports(source: str) -> List[str]:
+    """Return the sorted top-level modules imported by one code cell."""
+    try:
+        tree = ast.parse(source)
+    except SyntaxError:
+        # Skip cells that are intentionally incomplete (e.g., exercise stubs)
+        return []
+
     modules: Set[str] = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                modules.add(alias.name.split(".", maxsplit=1)[0])
+        elif isinstance(node, ast.ImportFrom) and node.module:
+            modules.add(node.module.split(".", maxsplit=1)[0])
+    return sorted(modules)
 
-    for cell in raw.get("cells", []):
-        if cell.get("cell_type") != "code":
+
+def _code_sources(nb_path: Path) -> List[str]:
+    return _sources_of(json.loads(nb_path.read_text()))
+
+
+def _sources_of(raw: Mapping[str, Any]) -> List[str]:
+    return [
+        "".join(cell.get("source", []))
+        for cell in raw.get("cells", [])
+        if cell.get("cell_type") == "code"
+    ]
+
+
+def _cell_key(source: str) -> str:
+    return hashlib.blake2b(source.encode(), digest_size=16).hexdigest()
+
+
+def collect_imports(
+    nb_path: Path, cell_cache: Optional[Dict[str, List[str]]] = None
+) -> Set[str]:
+    """Return the set of top-level modules imported in the notebook.
+
+    ``cell_cache`` maps cell-source hashes to import lists; cells already in
+    it are not re-parsed and newly parsed cells are added to it.
+    """
+    modules: Set[str] = set()
+    for source in _code_sources(nb_path):
+        if cell_cache is None:
+            modules.update(cell_imports(source))
             continue
-        source = "".join(cell.get("source", []))
-        try:
-            tree = ast.parse(source)
-        except SyntaxError:
-            # Skip cells that are intentionally incomplete (e.g., exercise stubs)
+        key = _cell_key(source)
+        if key not in cell_cache:
+            cell_cache[key] = cell_imports(source)
+        modules.update(cell_cache[key])
+    return modules
+
+
+class ImportCache:
+    """Per-cell import sets and per-notebook scan results, optionally on disk.
+
+    Notebooks whose size and mtime are unchanged are answered without being
+    read at all; edited notebooks only re-parse cells whose source changed.
+    """
+
+    def __init__(self, path: Optional[Path] = None) -> None:
+        self.path = path
+        self.cells: Dict[str, List[str]] = {}
+        self.notebooks: Dict[str, Dict[str, Any]] = {}
+        self.dirty = False
+        if path is not None:
+            try:
+                data = json.loads(path.read_text())
+            except (OSError, ValueError):
+                return
+            self.cells = data.get("cells", {})
+            self.notebooks = data.get("notebooks", {})
+
+    def save(self) -> None:
+        """Persist the cache, dropping cells no longer referenced by a notebook."""
+        if self.path is None or not self.dirty:
+            return
+        referenced = {
+            key for entry in self.notebooks.values() for key in entry["cells"]
+        }
+        self.cells = {k: v for k, v in self.cells.items() if k in referenced}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"cells": self.cells, "notebooks": self.notebooks}))
+        os.replace(tmp, self.path)
+        self.dirty = False
+
+
+_KNOWN_CELLS: frozenset = frozenset()
+
+
+def _init_scan_worker(known: frozenset) -> None:
+    global _KNOWN_CELLS
+    _KNOWN_CELLS = known
+
+
+def _scan_notebook(nb_path: Path) -> Tuple[List[str], Dict[str, List[str]]]:
+    """Hash every code cell, parsing only those missing from ``_KNOWN_CELLS``."""
+    keys: List[str] = []
+    parsed: Dict[str, List[str]] = {}
+    for source in _code_sources(nb_path):
+        key = _cell_key(source)
+        keys.append(key)
+        if key not in _KNOWN_CELLS and key not in parsed:
+            parsed[key] = cell_imports(source)
+    return keys, parsed
+
+
+def make_scan_executor(jobs: int, known: frozenset) -> Executor:
+    """Return the pool used to parse stale notebooks in parallel."""
+    return ProcessPoolExecutor(
+        max_workers=jobs, initializer=_init_scan_worker, initargs=(known,)
+    )
+
+
+def scan_imports(
+    notebooks: Iterable[Path], jobs: int = 1, cache: Optional[ImportCache] = None
+) -> Dict[Path, Set[str]]:
+    """Return the imports of every notebook, reusing and updating ``cache``."""
+    cache = cache if cache is not None else ImportCache()
+    results: Dict[Path, Set[str]] = {}
+    stale: List[Tuple[Path, str, List[int]]] = []
+    for nb_path in notebooks:
+        stat = nb_path.stat()
+        signature = [stat.st_mtime_ns, stat.st_size]
+        name = str(nb_path.resolve())
+        entry = cache.notebooks.get(name)
+        if entry is not None and entry["stat"] == signature:
+            results[nb_path] = set(entry["modules"])
+        else:
+            stale.append((nb_path, name, signature))
+
+    if not stale:
+        return results
+
+    known = frozenset(cache.cells)
+    if jobs > 1 and len(stale) > 1:
+        with make_scan_executor(min(jobs, len(stale)), known) as executor:
+            scans = list(executor.map(_scan_notebook, [item[0] for item in stale]))
+    else:
+        _init_scan_worker(known)
+        scans = [_scan_notebook(item[0]) for item in stale]
+
+    for (nb_path, name, signature), (keys, parsed) in zip(stale, scans):
+        cache.cells.update(parsed)
+        modules = set().union(*(cache.cells[key] for key in keys))
+        cache.notebooks[name] = {
+            "stat": signature,
+            "cells": sorted(set(keys)),
+            "modules": sorted(modules),
+        }
+        results[nb_path] = modules
+    cache.dirty = True
+    logging.getLogger(__name__).debug(
+        "Scanned %d notebook(s); %d reused from cache",
+        len(stale),
+        len(results) - len(stale),
+    )
+    return results
+
+
+def _git(*args: str, cwd: Optional[Path] = None) -> str:
+    proc = subprocess.run(
+        ["git", *args], cwd=cwd, check=True, capture_output=True, text=True
+    )
+    return proc.stdout
+
+
+def _sources_at(ref: str, rel_path: str, cwd: Path) -> Optional[List[str]]:
+    """Code-cell sources of ``rel_path`` at ``ref``, or None if absent there."""
+    try:
+        raw = json.loads(_git("show", f"{ref}:{rel_path}", cwd=cwd))
+    except (subprocess.CalledProcessError, ValueError):
+        return None
+    return _sources_of(raw)
+
+
+def changed_notebooks(ref: str, cwd: Optional[Path] = None) -> Dict[Path, List[int]]:
+    """Return notebooks whose code changed relative to ``ref``.
+
+    Covers committed, staged, unstaged and untracked notebooks. Values list
+    the indices (among code cells) of cells whose source is new since
+    ``ref``; notebooks with only markdown or output changes are left out.
+    Raises ``subprocess.CalledProcessError`` if ``ref`` cannot be resolved.
+    """
+    cwd = (cwd or Path.cwd()).resolve()
+    top = Path(_git("rev-parse", "--show-toplevel", cwd=cwd).strip())
+    _git("rev-parse", "--verify", "--quiet", f"{ref}^{{commit}}", cwd=cwd)
+    names = _git(
+        "diff", "--name-only", "-z", "--diff-filter=d", ref, "--", "*.ipynb", cwd=top
+    ).split("\0")
+    names += _git(
+        "ls-files", "--others", "--exclude-standard", "-z", "--", "*.ipynb", cwd=top
+    ).split("\0")
+
+    changed: Dict[Path, List[int]] = {}
+    for name in sorted(set(filter(None, names))):
+        path = top / name
+        old = _sources_at(ref, name, top)
+        new = _code_sources(path)
+        previous = {_cell_key(source) for source in old or []}
+        cells = [i for i, src in enumerate(new) if _cell_key(src) not in previous]
+        if old == new:
             continue
+        try:
+            path = path.relative_to(cwd)
+        except ValueError:
+            pass
+        changed[path] = cells
+    return changed
 
-        for node in ast.walk(tree):
-            if isinstance(node, ast.Import):
-                for alias in node.names:
-                    modules.add(alias.name.split(".", maxsplit=1)[0])
-            elif isinstance(node, ast.ImportFrom) and node.module:
-                modules.add(node.module.split(".", maxsplit=1)[0])
 
-    return modules
+_PROBE_CACHE: Dict[Tuple[str, str, str], Tuple[bool, str]] = {}
+_SUBPROCESS_PROBE = "import importlib, sys; importlib.import_module(sys.argv[1])"
+
+
+def _probe_import(name: str) -> Tuple[bool, str]:
+    try:
+        importlib.import_module(name)
+    except Exception as exc:  # pragma: no cover - defensive reporting
+        return False, f"{exc.__class__.__name__}: {exc}"
+    return True, "ok"
+
+
+def _probe_spec(name: str) -> Tuple[bool, str]:
+    if name in sys.modules:
+        return True, "ok (loaded)"
+    try:
+        spec = importlib.util.find_spec(name)
+    except (ImportError, ValueError) as exc:
+        return False, f"{exc.__class__.__name__}: {exc}"
+    if spec is None:
+        return False, f"ModuleNotFoundError: No module named '{name}'"
+    return True, "ok (found)"
+
+
+def _probe_subprocess(name: str, python: str, timeout: int) -> Tuple[bool, str]:
+    try:
+        proc = subprocess.run(
+            [python, "-c", _SUBPROCESS_PROBE, name],
+            timeout=timeout,
+            check=False,
+            capture_output=True,
+            text=True,
+        )
+    except subprocess.TimeoutExpired:
+        return False, f"TimeoutExpired: import took longer than {timeout}s"
+    if proc.returncode != 0:
+        lines = proc.stderr.strip().splitlines()
+        return False, lines[-1] if lines else f"exit code {proc.returncode}"
+    return True, "ok (imported)"
+
+
+def check_modules(
+    modules: Iterable[str],
+    *,
+    probe: str = "import",
+    python: Optional[str] = None,
+    jobs: int = 8,
+    timeout: int = 120,
+) -> List[Tuple[str, bool, str]]:
+    """Check that each module is available, returning status and error detail.
 
+    ``probe`` selects how: ``"import"`` imports in this process, ``"spec"``
+    only locates modules with ``importlib.util.find_spec`` (nothing is
+    executed), and ``"subprocess"`` locates them and then confirms that
+    non-stdlib modules import cleanly in parallel short-lived interpreters
+    (``python``, default: this one). Results are memoised per interpreter
+    and probe mode for the lifetime of the process.
+    """
+    python = python or sys.executable
+    names = sorted(set(modules))
+    cached = {name: _PROBE_CACHE.get((python, probe, name)) for name in names}
+    todo = [name for name, hit in cached.items() if hit is None]
+
+    if probe == "import":
+        found = {name: _probe_import(name) for name in todo}
+    else:
+        found = {name: _probe_spec(name) for name in todo}
+
+    if probe == "subprocess":
+        stdlib = set(getattr(sys, "stdlib_module_names", ())) | set(
+            sys.builtin_module_names
+        )
+        confirm = [name for name in todo if found[name][0] and name not in stdlib]
+        if confirm:
+            workers = max(1, min(jobs, len(confirm)))
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                verdicts = pool.map(
+                    lambda name: _probe_subprocess(name, python, timeout), confirm
+                )
+                found.update(zip(confirm, verdicts))
 
-def check_modules(modules: Iterable[str]) -> List[Tuple[str, bool, str]]:
-    """Attempt to import each module, returning status and error detail."""
     results: List[Tuple[str, bool, str]] = []
-    for name in sorted(set(modules)):
-        try:
-            importlib.import_module(name)
-        except Exception as exc:  # pragma: no cover - defensive reporting
-            results.append((name, False, f"{exc.__class__.__name__}: {exc}"))
-        else:
-            results.append((name, True, "ok"))
+    for name in names:
+        hit = cached[name]
+        if hit is None:
+            hit = found[name]
+            _PROBE_CACHE[(python, probe, name)] = hit
+        results.append((name, *hit))
     return results
 
 
-def execute_notebook(nb_path: Path, timeout: int) -> int:
-    """Execute notebook via nbconvert; returns subprocess return code."""
-    cache_dir = Path(".nbexec-cache")
+_PROFILER_CODE = """\
+def _nbcheck_profiler(out_path):
+    import json, os, sys, time
+    try:
+        import resource
+    except ImportError:  # Windows has no getrusage
+        resource = None
+
+    def current_rss_kb():
+        # Resident set size right now (Linux); None where /proc is unavailable.
+        try:
+            with open("/proc/self/statm") as fh:
+                pages = int(fh.read().split()[1])
+        except (OSError, ValueError, IndexError):
+            return None
+        return pages * os.sysconf("SC_PAGE_SIZE") // 1024
+
+    def reset_peak():
+        # Writing 5 to clear_refs resets VmHWM to the current RSS (Linux).
+        try:
+            with open("/proc/self/clear_refs", "w") as fh:
+                fh.write("5")
+        except OSError:
+            return False
+        return True
+
+    def peak_since_reset_kb():
+        try:
+            with open("/proc/self/status") as fh:
+                for line in fh:
+                    if line.startswith("VmHWM:"):
+                        return int(line.split()[1])
+        except (OSError, ValueError, IndexError):
+            pass
+        return None
+
+    def process_peak_kb():
+        # ru_maxrss is the process's lifetime high-water mark (carried over
+        # between notebooks on a reused kernel), only a fallback.
+        if resource is None:
+            return None
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak // 1024 if sys.platform == "darwin" else peak  # bytes on macOS
+
+    ip = get_ipython()
+    for event, callback in getattr(ip, "_nbcheck_profiler_hooks", []):
+        ip.events.unregister(event, callback)
+    ip._nbcheck_profiler_hooks = []
+    if out_path is None:
+        return
+
+    records, started = [], {{}}
+
+    def pre_run_cell(info):
+        started["wall"] = time.perf_counter()
+        started["cpu"] = time.process_time()
+        started["rss"] = current_rss_kb()
+        started["peak_reset"] = reset_peak()
+
+    def post_run_cell(result):
+        if not started:
+            return
+        rss, before = current_rss_kb(), started["rss"]
+        peak = peak_since_reset_kb() if started["peak_reset"] else None
+        scope = "cell"
+        if peak is None:
+            peak, scope = process_peak_kb(), "process"
+        records.append({{
+            "wall_s": time.perf_counter() - started["wall"],
+            "cpu_s": time.process_time() - started["cpu"],
+            "rss_kb": rss,
+            "rss_delta_kb": None if None in (rss, before) else rss - before,
+            "peak_rss_kb": peak,
+            "peak_rss_scope": scope,
+            "error": not result.success,
+        }})
+        started.clear()
+        with open(out_path, "w") as fh:
+            json.dump(records, fh)
+
+    hooks = [("pre_run_cell", pre_run_cell), ("post_run_cell", post_run_cell)]
+    for event, callback in hooks:
+        ip.events.register(event, callback)
+    ip._nbcheck_profiler_hooks = hooks
+
+
+_nbcheck_profiler({out!r})
+del _nbcheck_profiler
+"""
+
+
+def profiler_source(out_path: Optional[Path]) -> str:
+    """Kernel code that (re)installs per-cell profiling hooks writing to ``out_path``.
+
+    Passing ``None`` only removes hooks left behind on a reused kernel.
+    """
+    return _PROFILER_CODE.format(out=str(out_path.resolve()) if out_path else None)
+
+
+def profile_records_path(nb_path: Path) -> Path:
+    """Where the kernel writes raw per-cell records for ``nb_path``."""
+    digest = hashlib.sha256(str(nb_path.resolve()).encode()).hexdigest()[:8]
+    return CACHE_DIR / "profiles" / f"{nb_path.stem}-{digest}.json"
+
+
+def load_cell_profile(nb_path: Path, records_path: Path) -> List[Dict[str, Any]]:
+    """Pair raw kernel records with the notebook's non-empty code cells.
+
+    Kernels only run (and therefore only report) code cells with source, in
+    notebook order, so records map positionally onto those cells.
+    """
+    try:
+        records = json.loads(records_path.read_text())
+    except (OSError, ValueError):
+        records = []
+    raw = json.loads(nb_path.read_text())
+    profile: List[Dict[str, Any]] = []
+    code_cells = (
+        (index, "".join(cell.get("source", [])))
+        for index, cell in enumerate(raw.get("cells", []))
+        if cell.get("cell_type") == "code"
+    )
+    executed = ((index, src) for index, src in code_cells if src.strip())
+    for (index, source), record in zip(executed, records):
+        first_line = next(line for line in source.splitlines() if line.strip())
+        profile.append({"cell": index, "source": first_line.strip()[:60], **record})
+    return profile
+
+
+def write_profile_report(
+    outcomes: Iterable["ExecutionOutcome"], report_path: Path, top: int = 10
+) -> None:
+    """Write the per-cell JSON report and log the ``top`` slowest cells."""
+    logger = logging.getLogger(__name__)
+    profiled = [outcome for outcome in outcomes if outcome.profile is not None]
+    report = {
+        "generated": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": sys.version.split()[0],
+        "notebooks": {
+            str(outcome.path): {
+                "returncode": outcome.returncode,
+                "duration_s": outcome.duration,
+                "cells": outcome.profile,
+            }
+            for outcome in profiled
+        },
+    }
+    report_path.parent.mkdir(parents=True, exist_ok=True)
+    report_path.write_text(json.dumps(report, indent=2))
+    logger.info("Cell profile written to %s", report_path)
+
+    rows = sorted(
+        ((outcome.path, cell) for outcome in profiled for cell in outcome.profile),
+        key=lambda row: row[1]["wall_s"],
+        reverse=True,
+    )[:top]
+    if not rows:
+        return
+    logger.info("Slowest %d cell(s):", len(rows))
+    # A peak marked "*" is the kernel's lifetime high-water mark, not the cell's.
+    logger.info(
+        "  %8s %8s %9s %10s  %s", "wall s", "cpu s", "peak MB", "RSS +/-MB", "cell"
+    )
+    for nb_path, cell in rows:
+        peak, delta = cell.get("peak_rss_kb"), cell.get("rss_delta_kb")
+        marker = "*" if cell.get("peak_rss_scope") == "process" else ""
+        logger.info(
+            "  %8.2f %8.2f %9s %10s  %s[%d] %s",
+            cell["wall_s"],
+            cell["cpu_s"],
+            f"{peak / 1024:.1f}{marker}" if peak is not None else "n/a",
+            f"{delta / 1024:+.1f}" if delta is not None else "n/a",
+            nb_path,
+            cell["cell"],
+            cell["source"],
+        )
+
+
+def execute_notebook(
+    nb_path: Path, timeout: int, profile_out: Optional[Path] = None
+) -> int:
+    """Execute notebook via nbconvert; returns subprocess return code.
+
+    With ``profile_out`` the kernel is started with a startup file that
+    records per-cell timings there (see :func:`profiler_source`).
+    """
+    cache_dir = CACHE_DIR
     cache_dir.mkdir(exist_ok=True)
     output_name = nb_path.with_suffix("").name + "__executed.ipynb"
     logging.getLogger(__name__).debug(
@@ -80,6 +558,13 @@ def execute_notebook(nb_path: Path, timeout: int) -> int:
         str(cache_dir),
         str(nb_path),
     ]
+    if profile_out is not None:
+        startup = profile_out.with_suffix(".py")
+        startup.parent.mkdir(parents=True, exist_ok=True)
+        startup.write_text(profiler_source(profile_out))
+        exec_files = json.dumps([str(startup.resolve())])
+        kernel_args = [f"--IPKernelApp.exec_files={exec_files}"]
+        cmd.insert(-1, f"--ExecutePreprocessor.extra_arguments={kernel_args!r}")
     try:
         proc = subprocess.run(
             cmd,
@@ -101,15 +586,977 @@ def execute_notebook(nb_path: Path, timeout: int) -> int:
     return proc.returncode
 
 
+_RESET_CODE = """\
+get_ipython().run_line_magic("reset", "-f")
+import os as _nbcheck_os
+_nbcheck_os.chdir({cwd!r})
+del _nbcheck_os
+"""
+
+
+class KernelPool:
+    """Warm Jupyter kernels reused across notebooks executed in one process.
+
+    Kernels are namespace-reset and moved to the notebook's directory before
+    each notebook, so already-imported modules stay loaded between runs.
+    Kernels that die or time out are shut down instead of being returned.
+    """
+
+    def __init__(self, max_idle: int = 1) -> None:
+        self.max_idle = max_idle
+        self._idle: Dict[str, List[Any]] = {}
+
+    def acquire(self, kernel_name: str) -> Any:
+        """Return an idle kernel manager for ``kernel_name``, starting one if needed."""
+        from jupyter_client.manager import AsyncKernelManager
+        from jupyter_core.utils import run_sync
+
+        idle = self._idle.get(kernel_name, [])
+        while idle:
+            km = idle.pop()
+            if run_sync(km.is_alive)():
+                return km
+            run_sync(km.shutdown_kernel)(now=True)
+
+        logging.getLogger(__name__).debug("Starting %s kernel", kernel_name)
+        km = AsyncKernelManager(kernel_name=kernel_name)
+        run_sync(km.start_kernel)()
+        return km
+
+    def prewarm(self, kernel_name: str, modules: Iterable[str]) -> None:
+        """Start an idle kernel with ``modules`` already imported.
+
+        The namespace reset before each notebook clears the names, but the
+        modules stay in ``sys.modules`` so the notebook's own imports are free.
+        """
+        from jupyter_core.utils import run_sync
+
+        code = "\n".join(
+            f"try:\n    import {name}\nexcept Exception:\n    pass"
+            for name in sorted(modules)
+        )
+        km = self.acquire(kernel_name)
+
+        async def run() -> None:
+            kc = km.client()
+            kc.start_channels()
+            try:
+                await kc.wait_for_ready(timeout=60)
+                await kc.execute_interactive(
+                    code, silent=True, store_history=False, timeout=600
+                )
+            finally:
+                kc.stop_channels()
+
+        healthy = False
+        try:
+            run_sync(run)()
+            healthy = True
+        except Exception as exc:  # pragma: no cover - warm-up is best effort
+            logging.getLogger(__name__).warning("Kernel warm-up failed: %s", exc)
+        finally:
+            self.release(km, healthy=healthy)
+
+    def release(self, km: Any, *, healthy: bool = True) -> None:
+        """Return a kernel to the pool, or shut it down when unusable or surplus."""
+        from jupyter_core.utils import run_sync
+
+        idle = self._idle.setdefault(km.kernel_name, [])
+        if healthy and len(idle) < self.max_idle and run_sync(km.is_alive)():
+            idle.append(km)
+            return
+        run_sync(km.shutdown_kernel)(now=True)
+
+    def shutdown(self) -> None:
+        """Stop every idle kernel."""
+        from jupyter_core.utils import run_sync
+
+        for kernels in self._idle.values():
+            for km in kernels:
+                try:
+                    run_sync(km.shutdown_kernel)(now=True)
+                except Exception:  # pragma: no cover - best-effort cleanup
+                    pass
+        self._idle.clear()
+
+
+_KERNEL_POOL: Optional[KernelPool] = None
+
+
+def kernel_pool() -> KernelPool:
+    """Return this process's kernel pool, creating it on first use."""
+    global _KERNEL_POOL
+    if _KERNEL_POOL is None:
+        _KERNEL_POOL = KernelPool()
+        # Finalize (unlike atexit) also runs in multiprocessing pool workers.
+        multiprocessing.util.Finalize(
+            _KERNEL_POOL, _KERNEL_POOL.shutdown, exitpriority=10
+        )
+    return _KERNEL_POOL
+
+
+def execute_notebook_inprocess(
+    nb_path: Path,
+    timeout: int,
+    pool: Optional[KernelPool] = None,
+    profile_out: Optional[Path] = None,
+) -> int:
+    """Execute notebook with nbclient on a warm pooled kernel; returns 0 or 1.
+
+    Mirrors :func:`execute_notebook`: cell errors are allowed, the timeout
+    bounds the whole notebook and raises ``subprocess.TimeoutExpired``, and
+    the executed copy is written to ``.nbexec-cache``.
+    """
+    import nbformat
+    from nbclient import NotebookClient
+    from nbclient.exceptions import CellTimeoutError, DeadKernelError
+
+    logger = logging.getLogger(__name__)
+    logger.debug("Executing notebook %s in-process (timeout=%s)", nb_path, timeout)
+    pool = pool if pool is not None else kernel_pool()
+    nb = nbformat.read(nb_path, as_version=4)
+    kernel_name = nb.metadata.get("kernelspec", {}).get("name", "python3")
+    cwd = str(nb_path.resolve().parent)
+    deadline = time.monotonic() + timeout
+
+    async def reset_kernel(**_: Any) -> None:
+        await client.kc.execute_interactive(
+            _RESET_CODE.format(cwd=cwd) + profiler_source(profile_out),
+            silent=True,
+            store_history=False,
+            timeout=timeout,
+        )
+
+    km = pool.acquire(kernel_name)
+    client = NotebookClient(
+        nb,
+        km=km,
+        kernel_name=kernel_name,
+        allow_errors=True,
+        timeout_func=lambda _cell: max(deadline - time.monotonic(), 0.001),
+        on_notebook_start=reset_kernel,
+        resources={"metadata": {"path": cwd}},
+    )
+    healthy = False
+    try:
+        client.execute()
+        healthy = True
+    except CellTimeoutError as exc:
+        logger.error("Execution timed out: %s", exc)
+        raise subprocess.TimeoutExpired(cmd=str(nb_path), timeout=timeout) from exc
+    except DeadKernelError as exc:
+        logger.warning("Kernel died while executing %s: %s", nb_path, exc)
+        return 1
+    finally:
+        if client.kc is not None:
+            client.kc.stop_channels()
+        pool.release(km, healthy=healthy)
+
+    CACHE_DIR.mkdir(exist_ok=True)
+    output_name = nb_path.with_suffix("").name + "__executed.ipynb"
+    nbformat.write(nb, CACHE_DIR / output_name)
+    return 0
+
+
+@dataclass
+class ExecutionOutcome:
+    """Result of executing one notebook, as reported back from a worker."""
+
+    path: Path
+    returncode: Optional[int]  # None when the execution timed out
+    duration: float
+    cached: bool = False
+    profile: Optional[List[Dict[str, Any]]] = None
+
+
+@functools.lru_cache(maxsize=None)
+def _packages_distributions() -> Mapping[str, List[str]]:
+    return importlib.metadata.packages_distributions()
+
+
+def module_version(name: str) -> str:
+    """Return the installed distribution version backing a top-level module."""
+    stdlib = getattr(sys, "stdlib_module_names", ())
+    if name in stdlib or name in sys.builtin_module_names:
+        return "stdlib"
+    versions = []
+    for dist in sorted(_packages_distributions().get(name, [])):
+        try:
+            versions.append(f"{dist}=={importlib.metadata.version(dist)}")
+        except importlib.metadata.PackageNotFoundError:
+            continue
+    return ",".join(versions) or "unknown"
+
+
+def notebook_fingerprint(
+    nb_path: Path,
+    modules: Iterable[str],
+    *,
+    engine: str = "nbconvert",
+    timeout: int = 600,
+) -> str:
+    """Hash code-cell sources, the Python version and resolved module versions.
+
+    Markdown edits and stored outputs do not affect the fingerprint, so only
+    changes that can alter the execution verdict invalidate cached results.
+    The resolved path is included because notebooks run relative to their
+    own directory; the engine and timeout because a notebook can time out or
+    fail under one and pass under another.
+    """
+    payload = {
+        "notebook": str(nb_path.resolve()),
+        "engine": engine,
+        "timeout": timeout,
+        "sources": _code_sources(nb_path),
+        "python": sys.version,
+        "modules": {name: module_version(name) for name in sorted(set(modules))},
+    }
+    encoded = json.dumps(payload, sort_keys=True).encode()
+    return hashlib.sha256(encoded).hexdigest()
+
+
+class ExecutionCache:
+    """Persistent store of execution verdicts keyed by notebook fingerprint."""
+
+    def __init__(
+        self,
+        root: Optional[Path] = None,
+        *,
+        max_age: float = 30 * 86400,
+        max_bytes: int = 500 * 1024 * 1024,
+    ) -> None:
+        self.root = root if root is not None else CACHE_DIR
+        self.verdict_dir = self.root / "verdicts"
+        self.max_age = max_age
+        self.max_bytes = max_bytes
+
+    def _entry(self, key: str) -> Path:
+        return self.verdict_dir / f"{key}.json"
+
+    def get(self, key: str) -> Optional[ExecutionOutcome]:
+        """Return the cached outcome for ``key`` if present and not expired."""
+        entry = self._entry(key)
+        try:
+            data = json.loads(entry.read_text())
+        except (OSError, ValueError):
+            return None
+        if time.time() - data.get("created", 0) > self.max_age:
+            entry.unlink(missing_ok=True)
+            return None
+        return ExecutionOutcome(
+            Path(data["notebook"]), data["returncode"], data["duration"], cached=True
+        )
+
+    def put(self, key: str, outcome: ExecutionOutcome) -> None:
+        """Record a finished execution; timeouts are not cached."""
+        if outcome.returncode is None:
+            return
+        self.verdict_dir.mkdir(parents=True, exist_ok=True)
+        entry = self._entry(key)
+        tmp = entry.with_suffix(".tmp")
+        tmp.write_text(
+            json.dumps(
+                {
+                    "notebook": str(outcome.path),
+                    "returncode": outcome.returncode,
+                    "duration": outcome.duration,
+                    "created": time.time(),
+                }
+            )
+        )
+        os.replace(tmp, entry)
+
+    def evict(self) -> int:
+        """Drop expired verdicts, then oldest files until under ``max_bytes``."""
+        if not self.root.exists():
+            return 0
+        now = time.time()
+        removed = 0
+        files = []
+        for path in self.root.rglob("*"):
+            if not path.is_file():
+                continue
+            stat = path.stat()
+            if path.parent == self.verdict_dir and now - stat.st_mtime > self.max_age:
+                path.unlink(missing_ok=True)
+                removed += 1
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files, key=lambda item: item[0]):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+
+        if removed:
+            logging.getLogger(__name__).debug(
+                "Evicted %d cache file(s) from %s", removed, self.root
+            )
+        return removed
+
+
+def run_execution(
+    nb_path: Path, timeout: int, engine: str = "nbconvert", profile: bool = False
+) -> ExecutionOutcome:
+    """Execute a notebook and capture the outcome instead of raising on timeout."""
+    records_path: Optional[Path] = None
+    if profile:
+        records_path = profile_records_path(nb_path)
+        records_path.parent.mkdir(parents=True, exist_ok=True)
+        records_path.unlink(missing_ok=True)
+
+    start = time.perf_counter()
+    try:
+        if engine == "nbclient":
+            rc: Optional[int] = execute_notebook_inprocess(
+                nb_path, timeout=timeout, profile_out=records_path
+            )
+        else:
+            rc = execute_notebook(nb_path, timeout=timeout, profile_out=records_path)
+    except subprocess.TimeoutExpired:
+        rc = None
+    outcome = ExecutionOutcome(nb_path, rc, time.perf_counter() - start)
+    if records_path is not None:
+        # Partial records survive timeouts, which is when they matter most.
+        outcome.profile = load_cell_profile(nb_path, records_path)
+    return outcome
+
+
+class TimingHistory:
+    """Smoothed per-notebook execution durations persisted between runs."""
+
+    def __init__(self, path: Optional[Path] = None, *, alpha: float = 0.5) -> None:
+        self.path = path
+        self.alpha = alpha
+        self.durations: Dict[str, float] = {}
+        if path is not None:
+            try:
+                self.durations = json.loads(path.read_text())
+            except (OSError, ValueError):
+                pass
+
+    def update(self, nb_path: Path, duration: float) -> None:
+        name = str(nb_path.resolve())
+        previous = self.durations.get(name)
+        if previous is not None:
+            duration = self.alpha * duration + (1 - self.alpha) * previous
+        self.durations[name] = duration
+
+    def estimates(self, notebooks: Iterable[Path]) -> Dict[Path, float]:
+        """Expected runtimes; notebooks never timed get the median of the rest."""
+        known = sorted(self.durations.values())
+        default = known[len(known) // 2] if known else 1.0
+        return {
+            nb_path: self.durations.get(str(nb_path.resolve()), default)
+            for nb_path in notebooks
+        }
+
+    def save(self) -> None:
+        if self.path is None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self.durations, indent=1, sort_keys=True))
+        os.replace(tmp, self.path)
+
+
+AFFINITY = 0.25  # fraction of runtime assumed saved when every heavy import is warm
+
+
+def _third_party(modules: Iterable[str]) -> Set[str]:
+    stdlib = set(getattr(sys, "stdlib_module_names", ())) | set(
+        sys.builtin_module_names
+    )
+    return {name for name in modules if name not in stdlib}
+
+
+def plan_schedule(
+    notebooks: List[Path],
+    imports: Mapping[Path, Set[str]],
+    estimates: Mapping[Path, float],
+    jobs: int,
+) -> List[List[Path]]:
+    """Split notebooks into per-worker lanes, longest expected runtime first.
+
+    Each notebook joins the lane where it is expected to finish soonest. A
+    lane that already imports some of the notebook's third-party modules is
+    credited with up to ``AFFINITY`` of its runtime, so notebooks sharing
+    heavy imports gravitate to the same warm worker when loads are close.
+    Only meaningful for the nbclient engine, whose workers reuse a kernel.
+    """
+    lane_count = max(1, min(jobs, len(notebooks)))
+    lanes: List[List[Path]] = [[] for _ in range(lane_count)]
+    loads = [0.0] * lane_count
+    warm: List[Set[str]] = [set() for _ in range(lane_count)]
+
+    order = sorted(notebooks, key=lambda nb: estimates.get(nb, 0.0), reverse=True)
+    for nb_path in order:
+        heavy = _third_party(imports.get(nb_path, ()))
+        estimate = estimates.get(nb_path, 0.0)
+
+        def finish(lane: int) -> float:
+            share = len(heavy & warm[lane]) / len(heavy) if heavy else 0.0
+            return loads[lane] + estimate * (1 - AFFINITY * share)
+
+        best = min(range(lane_count), key=lambda lane: (finish(lane), lane))
+        loads[best] = finish(best)
+        lanes[best].append(nb_path)
+        warm[best] |= heavy
+    return lanes
+
+
+def _init_worker(log_level: int, preload: Iterable[str] = ()) -> None:
+    """Configure logging inside pool workers so nbconvert warnings stay visible.
+
+    ``preload`` modules are imported into the worker's warm kernel up front.
+    """
+    logging.basicConfig(level=log_level, format="%(levelname)s %(message)s")
+    if preload:
+        kernel_pool().prewarm("python3", preload)
+
+
+def make_executor(
+    jobs: int, log_level: int = logging.INFO, preload: Iterable[str] = ()
+) -> Executor:
+    """Return the pool used for ``--jobs`` execution."""
+    return ProcessPoolExecutor(
+        max_workers=jobs, initializer=_init_worker, initargs=(log_level, tuple(preload))
+    )
+
+
+def report_execution(outcome: ExecutionOutcome, *, label: str = "") -> int:
+    """Log an execution outcome; returns 1 on failure and 0 on success."""
+    logger = logging.getLogger(__name__)
+    prefix = f"[{label}] " if label else ""
+    if outcome.returncode is None:
+        logger.error("%sExecution timed out.", prefix)
+        return 1
+    if outcome.returncode != 0:
+        logger.error(
+            "%sExecution failed with exit code %s.", prefix, outcome.returncode
+        )
+        return 1
+    if outcome.cached:
+        logger.info("%sExecution succeeded (cached verdict).", prefix)
+    else:
+        logger.info("%sExecution succeeded (%.1fs).", prefix, outcome.duration)
+    return 0
+
+
+def execute_parallel(
+    notebooks: List[Path],
+    timeout: int,
+    jobs: int,
+    on_outcome: Optional[Callable[[ExecutionOutcome], None]] = None,
+    on_error: Optional[Callable[[Path, BaseException], None]] = None,
+    engine: str = "nbconvert",
+    profile: bool = False,
+    imports: Optional[Mapping[Path, Set[str]]] = None,
+    estimates: Optional[Mapping[Path, float]] = None,
+) -> int:
+    """Execute notebooks concurrently, logging each result as it finishes.
+
+    With the nbclient engine, notebooks are pinned to per-worker lanes by
+    :func:`plan_schedule` and each worker pre-imports its lane's third-party
+    modules into its warm kernel before the first notebook arrives. The
+    nbconvert engine starts a fresh kernel per notebook, so there is nothing
+    to keep warm: notebooks go longest-first into one shared pool, and any
+    idle worker takes the next one. A notebook whose worker raised instead of
+    returning an outcome is passed to ``on_error``.
+    """
+    logger = logging.getLogger(__name__)
+    logger.info("Executing %d notebook(s) with %d workers...", len(notebooks), jobs)
+    imports = imports or {}
+    estimates = estimates or {}
+    log_level = logging.getLogger().getEffectiveLevel()
+    exit_code = 0
+    executors: List[Executor] = []
+    futures = {}
+    try:
+        if engine == "nbclient":
+            lanes = plan_schedule(notebooks, imports, estimates, jobs)
+            for index, lane in enumerate(filter(None, lanes), start=1):
+                heavy = set().union(*(_third_party(imports.get(nb, ())) for nb in lane))
+                logger.debug(
+                    "Worker %d: %s (expected %.1fs, preloading %s)",
+                    index,
+                    ", ".join(str(nb) for nb in lane),
+                    sum(estimates.get(nb, 0.0) for nb in lane),
+                    ", ".join(sorted(heavy)) or "nothing",
+                )
+                executors.append(make_executor(1, log_level, sorted(heavy)))
+                for nb_path in lane:
+                    future = executors[-1].submit(
+                        run_execution, nb_path, timeout, engine, profile
+                    )
+                    futures[future] = nb_path
+        else:
+            executors.append(make_executor(min(jobs, len(notebooks)), log_level))
+            order = sorted(
+                notebooks, key=lambda nb: estimates.get(nb, 0.0), reverse=True
+            )
+            for nb_path in order:
+                future = executors[-1].submit(
+                    run_execution, nb_path, timeout, engine, profile
+                )
+                futures[future] = nb_path
+        for future in as_completed(futures):
+            nb_path = futures[future]
+            try:
+                outcome = future.result()
+            except Exception as exc:  # worker crashed (e.g. BrokenProcessPool)
+                logger.error(
+                    "[%s] Execution raised %s: %s",
+                    nb_path,
+                    exc.__class__.__name__,
+                    exc,
+                )
+                if on_error is not None:
+                    on_error(nb_path, exc)
+                exit_code = 1
+                continue
+            if on_outcome is not None:
+                on_outcome(outcome)
+            exit_code |= report_execution(outcome, label=str(nb_path))
+    finally:
+        for executor in executors:
+            executor.shutdown(wait=True, cancel_futures=True)
+    return exit_code
+
+
+class ResultStream:
+    """Structured results written as they happen, for dashboards and CI.
+
+    ``events`` receives one JSON object per line (``"-"`` for stdout) and is
+    flushed after every event. ``junit`` is rewritten atomically whenever a
+    notebook reaches a verdict, so it is always a complete, valid report.
+    With ``execute`` a notebook's verdict is its execution result; otherwise
+    it is the dependency check.
+    """
+
+    def __init__(
+        self,
+        events: Optional[Path] = None,
+        junit: Optional[Path] = None,
+        *,
+        execute: bool = False,
+    ) -> None:
+        self.junit = junit
+        self.execute = execute
+        self._cases: List[Dict[str, Any]] = []
+        self._events: Optional[Any] = None
+        if events is not None and str(events) == "-":
+            self._events = sys.stdout
+        elif events is not None:
+            events.parent.mkdir(parents=True, exist_ok=True)
+            self._events = events.open("w")
+
+    def emit(self, event: str, nb_path: Path, **fields: Any) -> None:
+        if self._events is None:
+            return
+        record = {"event": event, "time": time.time(), "notebook": str(nb_path)}
+        record.update(fields)
+        self._events.write(json.dumps(record) + "\n")
+        self._events.flush()
+
+    def started(self, nb_path: Path) -> None:
+        self.emit("notebook_started", nb_path)
+
+    def dependencies(
+        self, nb_path: Path, results: List[Tuple[str, bool, str]], missing: List[str]
+    ) -> None:
+        self.emit(
+            "dependencies_checked",
+            nb_path,
+            ok=not missing,
+            missing=missing,
+            modules={name: {"ok": ok, "detail": detail} for name, ok, detail in results},
+        )
+        if missing:
+            self._case(nb_path, 0.0, "failure", f"Missing modules: {', '.join(missing)}")
+        elif not self.execute:
+            self._case(nb_path, 0.0)
+
+    def not_found(self, nb_path: Path) -> None:
+        self.emit("notebook_not_found", nb_path)
+        self._case(nb_path, 0.0, "error", "Notebook not found")
+
+    def finished(self, outcome: ExecutionOutcome) -> None:
+        self.emit(
+            "execution_finished",
+            outcome.path,
+            returncode=outcome.returncode,
+            timed_out=outcome.returncode is None,
+            duration_s=outcome.duration,
+            cached=outcome.cached,
+        )
+        if outcome.returncode is None:
+            self._case(outcome.path, outcome.duration, "failure", "Execution timed out")
+        elif outcome.returncode != 0:
+            message = f"Execution failed with exit code {outcome.returncode}"
+            self._case(outcome.path, outcome.duration, "failure", message)
+        else:
+            self._case(outcome.path, outcome.duration)
+
+    def errored(self, nb_path: Path, exc: BaseException) -> None:
+        """Record an execution that raised instead of producing an outcome."""
+        message = f"Execution raised {exc.__class__.__name__}: {exc}"
+        self.emit(
+            "execution_failed",
+            nb_path,
+            error=exc.__class__.__name__,
+            message=str(exc),
+        )
+        self._case(nb_path, 0.0, "error", message)
+
+    def _case(
+        self,
+        nb_path: Path,
+        duration: float,
+        kind: Optional[str] = None,
+        message: str = "",
+    ) -> None:
+        if self.junit is None:
+            return
+        self._cases.append(
+            {"name": str(nb_path), "time": duration, "kind": kind, "message": message}
+        )
+        self._write_junit()
+
+    def _write_junit(self) -> None:
+        import xml.etree.ElementTree as ET
+
+        assert self.junit is not None
+        failures = sum(case["kind"] == "failure" for case in self._cases)
+        errors = sum(case["kind"] == "error" for case in self._cases)
+        suite = ET.Element(
+            "testsuite",
+            name="check_notebooks",
+            tests=str(len(self._cases)),
+            failures=str(failures),
+            errors=str(errors),
+            time=f"{sum(case['time'] for case in self._cases):.3f}",
+        )
+        for case in self._cases:
+            element = ET.SubElement(
+                suite,
+                "testcase",
+                classname="check_notebooks",
+                name=case["name"],
+                time=f"{case['time']:.3f}",
+            )
+            if case["kind"] is not None:
+                ET.SubElement(element, case["kind"], message=case["message"])
+        self.junit.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.junit.with_suffix(".tmp")
+        ET.ElementTree(suite).write(tmp, encoding="utf-8", xml_declaration=True)
+        os.replace(tmp, self.junit)
+
+    def close(self) -> None:
+        if self._events is not None and self._events is not sys.stdout:
+            self._events.close()
+        self._events = None
+
+
+@dataclass
+class CellSize:
+    """Serialized sizes of one cell, in bytes."""
+
+    index: int
+    cell_type: str
+    source_bytes: int
+    output_bytes: int = 0
+    image_bytes: int = 0
+
+
+@dataclass
+class NotebookSize:
+    """Size breakdown of one notebook, after any stripping."""
+
+    path: Path
+    file_bytes: int
+    cells: List[CellSize]
+    original_bytes: int = 0
+    stripped_outputs: int = 0
+
+    @property
+    def source_bytes(self) -> int:
+        return sum(cell.source_bytes for cell in self.cells)
+
+    @property
+    def output_bytes(self) -> int:
+        return sum(cell.output_bytes for cell in self.cells)
+
+    @property
+    def image_bytes(self) -> int:
+        return sum(cell.image_bytes for cell in self.cells)
+
+
+@dataclass(frozen=True)
+class SizeBudget:
+    """Upper bounds in bytes; ``None`` disables a limit."""
+
+    notebook_bytes: Optional[int] = 128 * 1024
+    cell_source_bytes: Optional[int] = 16 * 1024
+    cell_output_bytes: Optional[int] = 64 * 1024
+
+    def violations(self, size: NotebookSize) -> List[str]:
+        problems = []
+        if self.notebook_bytes is not None and size.file_bytes > self.notebook_bytes:
+            problems.append(
+                f"notebook is {size.file_bytes / 1024:.1f} KB "
+                f"(budget {self.notebook_bytes / 1024:g} KB)"
+            )
+        for cell in size.cells:
+            for label, value, limit in (
+                ("source", cell.source_bytes, self.cell_source_bytes),
+                ("outputs", cell.output_bytes, self.cell_output_bytes),
+            ):
+                if limit is not None and value > limit:
+                    problems.append(
+                        f"cell {cell.index} {label} is {value / 1024:.1f} KB "
+                        f"(budget {limit / 1024:g} KB)"
+                    )
+        return problems
+
+
+def _joined(value: Any) -> str:
+    return "".join(value) if isinstance(value, list) else (value or "")
+
+
+def _json_bytes(value: Any) -> int:
+    return len(json.dumps(value, ensure_ascii=False).encode())
+
+
+def measure_cells(raw: Mapping[str, Any]) -> List[CellSize]:
+    """Per-cell source, output and embedded-image sizes of a raw notebook."""
+    sizes = []
+    for index, cell in enumerate(raw.get("cells", [])):
+        outputs = cell.get("outputs", [])
+        images = sum(
+            len(_joined(value))
+            for output in outputs
+            for mime, value in output.get("data", {}).items()
+            if mime.startswith("image/")
+        )
+        sizes.append(
+            CellSize(
+                index,
+                cell.get("cell_type", "code"),
+                len(_joined(cell.get("source")).encode()),
+                _json_bytes(outputs) if outputs else 0,
+                images,
+            )
+        )
+    return sizes
+
+
+def _truncate(text: str, limit: int) -> List[str]:
+    """Keep about the first ``limit`` bytes of ``text`` (whole lines) and a marker."""
+    head = text.encode()[:limit].decode(errors="ignore")
+    if "\n" in head:
+        head = head[: head.rindex("\n") + 1]
+    elif head:
+        head += "\n"
+    total_kb = len(text.encode()) / 1024
+    marker = f"... [output truncated by check_notebooks.py: {total_kb:.1f} KB total]\n"
+    return (head + marker).splitlines(keepends=True)
+
+
+def strip_outputs(
+    raw: Mapping[str, Any], *, max_output_bytes: int, max_image_bytes: int
+) -> int:
+    """Truncate oversized text outputs and drop oversized images in place.
+
+    Returns the number of outputs changed. An image with no other
+    representation is replaced by a ``text/plain`` placeholder, and an
+    oversized ``text/html`` is dropped when ``text/plain`` is available.
+    """
+    changed = 0
+    for cell in raw.get("cells", []):
+        for output in cell.get("outputs", []):
+            before = _json_bytes(output)
+            if output.get("output_type") == "stream":
+                text = _joined(output.get("text"))
+                if len(text.encode()) > max_output_bytes:
+                    output["text"] = _truncate(text, max_output_bytes)
+            data = output.get("data", {})
+            for mime in list(data):
+                size = len(_joined(data[mime]).encode())
+                if mime.startswith("image/") and size > max_image_bytes:
+                    del data[mime]
+                    output.get("metadata", {}).pop(mime, None)
+                    data.setdefault(
+                        "text/plain",
+                        [
+                            f"[{mime} output removed by check_notebooks.py: "
+                            f"{size / 1024:.1f} KB]"
+                        ],
+                    )
+                elif mime.startswith("text/") and size > max_output_bytes:
+                    if mime != "text/plain" and "text/plain" in data:
+                        del data[mime]
+                    else:
+                        data[mime] = _truncate(_joined(data[mime]), max_output_bytes)
+            changed += _json_bytes(output) != before
+    return changed
+
+
+def notebook_size(
+    nb_path: Path,
+    *,
+    strip: bool = False,
+    max_output_bytes: int = 16 * 1024,
+    max_image_bytes: int = 64 * 1024,
+) -> NotebookSize:
+    """Measure ``nb_path``; with ``strip``, shrink its outputs and rewrite it.
+
+    The raw JSON is edited directly (no nbformat validation) and streamed to
+    a temporary file in nbformat's own layout, then swapped in atomically, so
+    untouched notebooks are never rewritten and diffs stay minimal.
+    """
+    original = nb_path.stat().st_size
+    with nb_path.open(encoding="utf-8") as fh:
+        raw = json.load(fh)
+
+    stripped = 0
+    if strip:
+        stripped = strip_outputs(
+            raw, max_output_bytes=max_output_bytes, max_image_bytes=max_image_bytes
+        )
+        if stripped:
+            tmp = nb_path.with_name(f".{nb_path.name}.tmp")
+            with tmp.open("w", encoding="utf-8") as fh:
+                for chunk in json.JSONEncoder(
+                    sort_keys=True, indent=1, ensure_ascii=False
+                ).iterencode(raw):
+                    fh.write(chunk)
+                fh.write("\n")
+            os.replace(tmp, nb_path)
+
+    return NotebookSize(
+        nb_path,
+        nb_path.stat().st_size,
+        measure_cells(raw),
+        original_bytes=original,
+        stripped_outputs=stripped,
+    )
+
+
+def all_notebooks(root: Path = Path(".")) -> List[Path]:
+    """Every notebook under ``root``, skipping build output, caches and checkpoints."""
+    return sorted(
+        path
+        for path in root.rglob("*.ipynb")
+        if not any(
+            part.startswith(("_", ".")) for part in path.relative_to(root).parts[:-1]
+        )
+    )
+
+
+def check_sizes(
+    notebooks: Sequence[Path],
+    budget: SizeBudget,
+    *,
+    jobs: int = 1,
+    strip: bool = False,
+    max_output_bytes: int = 16 * 1024,
+    max_image_bytes: int = 64 * 1024,
+    top: int = 5,
+) -> int:
+    """Report notebook sizes (optionally stripping first) and enforce ``budget``."""
+    logger = logging.getLogger(__name__)
+    measure = functools.partial(
+        notebook_size,
+        strip=strip,
+        max_output_bytes=max_output_bytes,
+        max_image_bytes=max_image_bytes,
+    )
+    if jobs > 1 and len(notebooks) > 1:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(notebooks))) as executor:
+            sizes = list(executor.map(measure, notebooks))
+    else:
+        sizes = [measure(nb_path) for nb_path in notebooks]
+
+    exit_code = 0
+    logger.info(
+        "%-52s %9s %9s %9s %9s",
+        "notebook",
+        "file KB",
+        "source KB",
+        "output KB",
+        "image KB",
+    )
+    for size in sorted(sizes, key=lambda item: item.file_bytes, reverse=True):
+        logger.info(
+            "%-52s %9.1f %9.1f %9.1f %9.1f",
+            size.path,
+            size.file_bytes / 1024,
+            size.source_bytes / 1024,
+            size.output_bytes / 1024,
+            size.image_bytes / 1024,
+        )
+        if size.stripped_outputs:
+            logger.info(
+                "  stripped %d output(s), %.1f KB -> %.1f KB",
+                size.stripped_outputs,
+                size.original_bytes / 1024,
+                size.file_bytes / 1024,
+            )
+        for problem in budget.violations(size):
+            logger.error("  over budget: %s", problem)
+            exit_code = 1
+
+    cells = sorted(
+        (
+            (cell.source_bytes + cell.output_bytes, size.path, cell)
+            for size in sizes
+            for cell in size.cells
+        ),
+        key=lambda item: item[0],
+        reverse=True,
+    )
+    if cells and top > 0:
+        logger.info("Largest cells:")
+        for total, nb_path, cell in cells[:top]:
+            logger.info(
+                "  %6.1f KB  %s cell %d (%s; outputs %.1f KB)",
+                total / 1024,
+                nb_path,
+                cell.index,
+                cell.cell_type,
+                cell.output_bytes / 1024,
+            )
+    logger.info(
+        "%d notebook(s), %.1f KB total; %d output(s) stripped",
+        len(sizes),
+        sum(size.file_bytes for size in sizes) / 1024,
+        sum(size.stripped_outputs for size in sizes),
+    )
+    return exit_code
+
+
 def main() -> int:
     parser = argparse.ArgumentParser(description=__doc__)
     parser.add_argument(
         "notebooks",
         nargs="*",
         type=Path,
-        default=DEFAULT_NOTEBOOKS,
+        default=None,
         help="Notebook paths to inspect (defaults to key hard-track notebooks).",
     )
+    parser.add_argument(
+        "--changed-since",
+        metavar="REF",
+        default=None,
+        help=(
+            "Only check notebooks whose code cells changed relative to this git "
+            "ref (restricted to the given paths or directories, if any)."
+        ),
+    )
     parser.add_argument(
         "--execute",
         action="store_true",
@@ -121,12 +1568,125 @@ def main() -> int:
         default=600,
         help="Execution timeout per notebook in seconds (when using --execute).",
     )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=1,
+        help="Number of notebooks to execute concurrently (default: 1, serial).",
+    )
+    parser.add_argument(
+        "--engine",
+        choices=ENGINES,
+        default="nbconvert",
+        help=(
+            "Execution backend: 'nbconvert' spawns a subprocess per notebook; "
+            "'nbclient' runs in-process on reusable warm kernels."
+        ),
+    )
+    parser.add_argument(
+        "--probe",
+        choices=PROBES,
+        default="spec",
+        help=(
+            "How to check dependencies: 'spec' locates modules without importing "
+            "them (default), 'subprocess' also imports them in parallel isolated "
+            "interpreters, 'import' imports them into this process."
+        ),
+    )
+    parser.add_argument(
+        "--profile",
+        type=Path,
+        default=None,
+        metavar="REPORT.json",
+        help="Record wall/CPU time and peak RSS per code cell; write a JSON report.",
+    )
+    parser.add_argument(
+        "--profile-top",
+        type=int,
+        default=10,
+        help="Number of slowest cells to list in the log with --profile (default: 10).",
+    )
+    parser.add_argument(
+        "--events",
+        type=Path,
+        default=None,
+        metavar="EVENTS.jsonl",
+        help="Stream newline-delimited JSON result events to this file ('-' for stdout).",
+    )
+    parser.add_argument(
+        "--junit",
+        type=Path,
+        default=None,
+        metavar="REPORT.xml",
+        help="Write a JUnit XML report, updated as each notebook finishes.",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Ignore cached import scans and execution verdicts; re-run everything.",
+    )
+    parser.add_argument(
+        "--cache-max-age",
+        type=float,
+        default=30.0,
+        help="Days before a cached execution verdict expires (default: 30).",
+    )
+    parser.add_argument(
+        "--cache-max-size",
+        type=float,
+        default=500.0,
+        help="Maximum size of .nbexec-cache in MB before oldest files are evicted.",
+    )
     parser.add_argument(
         "--optional",
         action="append",
         default=[],
         help="Module names to treat as optional (missing entries will not block execution).",
     )
+    parser.add_argument(
+        "--sizes",
+        action="store_true",
+        help=(
+            "Report per-notebook and per-cell source/output sizes and enforce the "
+            "size budgets instead of checking dependencies (defaults to every notebook)."
+        ),
+    )
+    parser.add_argument(
+        "--strip",
+        action="store_true",
+        help="With --sizes, truncate oversized outputs and drop oversized images in place.",
+    )
+    parser.add_argument(
+        "--truncate-output-kb",
+        type=float,
+        default=16.0,
+        help="Text outputs larger than this are truncated by --strip (default: 16).",
+    )
+    parser.add_argument(
+        "--drop-image-kb",
+        type=float,
+        default=64.0,
+        help="Embedded images larger than this are removed by --strip (default: 64).",
+    )
+    parser.add_argument(
+        "--budget-notebook-kb",
+        type=float,
+        default=128.0,
+        help="Maximum notebook file size; 0 disables the check (default: 128).",
+    )
+    parser.add_argument(
+        "--budget-cell-source-kb",
+        type=float,
+        default=16.0,
+        help="Maximum source size of a single cell; 0 disables the check (default: 16).",
+    )
+    parser.add_argument(
+        "--budget-cell-output-kb",
+        type=float,
+        default=64.0,
+        help="Maximum output size of a single cell; 0 disables the check (default: 64).",
+    )
     parser.add_argument(
         "--log-level",
         default="INFO",
@@ -141,21 +1701,108 @@ def main() -> int:
     )
     logger = logging.getLogger(__name__)
 
+    if args.sizes:
+        notebooks = args.notebooks or all_notebooks()
+        missing_paths = [nb_path for nb_path in notebooks if not nb_path.exists()]
+        for nb_path in missing_paths:
+            logger.error("%s not found", nb_path)
+
+        def kb(value: float) -> Optional[int]:
+            return int(value * 1024) if value > 0 else None
+
+        budget = SizeBudget(
+            notebook_bytes=kb(args.budget_notebook_kb),
+            cell_source_bytes=kb(args.budget_cell_source_kb),
+            cell_output_bytes=kb(args.budget_cell_output_kb),
+        )
+        exit_code = check_sizes(
+            [nb_path for nb_path in notebooks if nb_path.exists()],
+            budget,
+            jobs=args.jobs,
+            strip=args.strip,
+            max_output_bytes=int(args.truncate_output_kb * 1024),
+            max_image_bytes=int(args.drop_image_kb * 1024),
+        )
+        return exit_code | bool(missing_paths)
+
+    if args.changed_since is not None:
+        try:
+            changed = changed_notebooks(args.changed_since)
+        except (OSError, subprocess.CalledProcessError) as exc:
+            logger.error("Cannot diff against %s: %s", args.changed_since, exc)
+            return 1
+        if args.notebooks:
+            scopes = [path.resolve() for path in args.notebooks]
+            changed = {
+                nb_path: cells
+                for nb_path, cells in changed.items()
+                if any(
+                    nb_path.resolve() == scope or scope in nb_path.resolve().parents
+                    for scope in scopes
+                )
+            }
+        logger.info(
+            "%d notebook(s) changed since %s", len(changed), args.changed_since
+        )
+        for nb_path, cells in changed.items():
+            logger.info(
+                "  - %s (code cells changed: %s)",
+                nb_path,
+                ", ".join(map(str, cells)) or "removed/reordered only",
+            )
+        args.notebooks = list(changed)
+    elif not args.notebooks:
+        args.notebooks = DEFAULT_NOTEBOOKS
+
+    cache: Optional[ExecutionCache] = None
+    if args.execute and not args.no_cache:
+        cache = ExecutionCache(
+            max_age=args.cache_max_age * 86400,
+            max_bytes=int(args.cache_max_size * 1024 * 1024),
+        )
+        cache.evict()
+    keys: Dict[Path, str] = {}
+    history = TimingHistory(CACHE_DIR / "timings.json" if args.execute else None)
+    profiled: List[ExecutionOutcome] = []
+    profile = args.profile is not None
+    stream = ResultStream(args.events, args.junit, execute=args.execute)
+
+    def record(outcome: ExecutionOutcome) -> None:
+        stream.finished(outcome)
+        if cache is not None and outcome.path in keys:
+            cache.put(keys[outcome.path], outcome)
+        if not outcome.cached:
+            history.update(outcome.path, outcome.duration)
+        if outcome.profile is not None:
+            profiled.append(outcome)
+
+    import_cache = ImportCache(None if args.no_cache else CACHE_DIR / "imports.json")
+    imports = scan_imports(
+        [nb_path for nb_path in args.notebooks if nb_path.exists()],
+        jobs=args.jobs,
+        cache=import_cache,
+    )
+    import_cache.save()
+
     exit_code = 0
+    pending: List[Path] = []
     for nb_path in args.notebooks:
         if not nb_path.exists():
             logger.error("%s not found", nb_path)
+            stream.not_found(nb_path)
             exit_code = 1
             continue
 
         logger.info("Notebook: %s", nb_path)
-        modules = collect_imports(nb_path)
+        stream.started(nb_path)
+        modules = imports[nb_path]
         optional = set(args.optional)
-        results = check_modules(modules)
+        results = check_modules(modules, probe=args.probe, jobs=max(args.jobs, 8))
 
         missing = [
             name for name, ok, _ in results if not ok and name not in optional
         ]
+        stream.dependencies(nb_path, results, missing)
         if results:
             logger.info("Dependency check:")
             for name, ok, detail in results:
@@ -175,18 +1822,41 @@ def main() -> int:
             continue
 
         if args.execute:
+            if cache is not None:
+                keys[nb_path] = notebook_fingerprint(
+                    nb_path, modules, engine=args.engine, timeout=args.timeout
+                )
+                cached = None if profile else cache.get(keys[nb_path])
+                if cached is not None:
+                    cached.path = nb_path
+                    stream.finished(cached)
+                    exit_code |= report_execution(cached, label=str(nb_path))
+                    continue
+            if args.jobs > 1:
+                pending.append(nb_path)
+                continue
             logger.info("Executing notebook...")
-            try:
-                rc = execute_notebook(nb_path, timeout=args.timeout)
-            except subprocess.TimeoutExpired:
-                logger.error("Execution timed out.")
-                exit_code = 1
-            else:
-                if rc == 0:
-                    logger.info("Execution succeeded.")
-                else:
-                    logger.error("Execution failed with exit code %s.", rc)
-                    exit_code = 1
+            outcome = run_execution(nb_path, args.timeout, args.engine, profile)
+            record(outcome)
+            exit_code |= report_execution(outcome)
+
+    if pending:
+        exit_code |= execute_parallel(
+            pending,
+            args.timeout,
+            args.jobs,
+            on_outcome=record,
+            on_error=stream.errored,
+            engine=args.engine,
+            profile=profile,
+            imports=imports,
+            estimates=history.estimates(pending),
+        )
+    history.save()
+    stream.close()
+
+    if profile:
+        write_profile_report(profiled, args.profile, top=args.profile_top)
 
     return exit_code
 
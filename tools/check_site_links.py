@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""Browserless reachability and broken-link check for the built Jupyter Book site."""
+
+from __future__ import annotations
+
+import argparse
+import functools
+import logging
+import os
+import re
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import urljoin
+
+if __package__ in (None, ""):  # allow `python tools/check_site_links.py`
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from tools.playwright_utils import LinkCanonicalizer, load_expected_paths
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_SITE = PROJECT_ROOT / "_build" / "html"
+DEFAULT_TOC = PROJECT_ROOT / "_toc.yml"
+HOME_PAGE = "README.html"
+CHUNK_SIZE = 64 * 1024
+# Only anchor start tags reach the HTML parser; notebook pages are mostly
+# highlighted-code spans, which would otherwise dominate parsing time.
+_ANCHOR_TAG = re.compile(r"<a\s[^>]*>", re.IGNORECASE)
+
+
+class _AnchorParser(HTMLParser):
+    """Collects the raw ``href`` values of the anchor tags it is fed."""
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.hrefs: List[str] = []
+
+    def handle_starttag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        if tag != "a":
+            return
+        for name, value in attrs:
+            if name == "href" and value:
+                self.hrefs.append(value)
+
+
+def page_links(site_root: Path, rel_path: str) -> List[str]:
+    """Return canonical internal links on one built page, streaming the file."""
+    parser = _AnchorParser()
+    tail = ""
+    with (site_root / rel_path).open(encoding="utf-8", errors="replace") as fh:
+        for chunk in iter(lambda: fh.read(CHUNK_SIZE), ""):
+            buffer = tail + chunk
+            # Keep a possibly unfinished tag for the next chunk.
+            cut = buffer.rfind(">") + 1
+            for match in _ANCHOR_TAG.finditer(buffer, 0, cut):
+                parser.feed(match.group())
+            tail = buffer[cut:]
+    parser.close()
+
+    canonicalizer = _canonicalizer(site_root.resolve().as_uri().rstrip("/") + "/")
+    return canonicalizer.links(parser.hrefs, page_url=urljoin(canonicalizer.base_url, rel_path))
+
+
+@functools.lru_cache(maxsize=None)
+def _canonicalizer(base_url: str) -> LinkCanonicalizer:
+    """One shared canonicaliser per site root and process."""
+    return LinkCanonicalizer(base_url, home_page=HOME_PAGE)
+
+
+def _page_links_task(args: Tuple[Path, str]) -> Tuple[str, List[str]]:
+    site_root, rel_path = args
+    return rel_path, page_links(site_root, rel_path)
+
+
+def html_pages(site_root: Path) -> List[str]:
+    """Built pages, skipping Sphinx internals such as ``_static`` and ``_sources``."""
+    pages = []
+    for dirpath, dirnames, filenames in os.walk(site_root):
+        dirnames[:] = [d for d in dirnames if not d.startswith(("_", "."))]
+        for name in filenames:
+            if name.endswith(".html"):
+                pages.append((Path(dirpath) / name).relative_to(site_root).as_posix())
+    return sorted(pages)
+
+
+@dataclass
+class LinkReport:
+    """Link graph of the built site and the problems found in it."""
+
+    graph: Dict[str, List[str]]
+    reachable: Set[str]
+    unreachable: List[str] = field(default_factory=list)
+    unbuilt: List[str] = field(default_factory=list)
+    broken: List[Tuple[str, str]] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not (self.unreachable or self.unbuilt or self.broken)
+
+
+def build_link_graph(site_root: Path, jobs: int = 1) -> Dict[str, List[str]]:
+    """Parse every built page (in a process pool when ``jobs > 1``)."""
+    pages = html_pages(site_root)
+    tasks = [(site_root, rel_path) for rel_path in pages]
+    if jobs > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(tasks))) as executor:
+            results = executor.map(_page_links_task, tasks, chunksize=4)
+            return dict(results)
+    return dict(map(_page_links_task, tasks))
+
+
+def check_site(
+    site_root: Path,
+    expected: Iterable[str],
+    *,
+    home_page: str = HOME_PAGE,
+    jobs: int = 1,
+) -> LinkReport:
+    """Build the link graph, then walk it from ``home_page`` like the crawl test does."""
+    graph = build_link_graph(site_root, jobs=jobs)
+    reachable: Set[str] = set()
+    queue = deque([home_page])
+    while queue:
+        rel_path = queue.popleft()
+        if rel_path in reachable or rel_path not in graph:
+            continue
+        reachable.add(rel_path)
+        queue.extend(link for link in graph[rel_path] if link not in reachable)
+
+    expected = set(expected)
+    return LinkReport(
+        graph=graph,
+        reachable=reachable,
+        unreachable=sorted(page for page in expected - reachable if page in graph),
+        unbuilt=sorted(page for page in expected if page not in graph),
+        broken=sorted(
+            (page, link)
+            for page, links in graph.items()
+            for link in links
+            if link not in graph
+        ),
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--site",
+        type=Path,
+        default=DEFAULT_SITE,
+        help="Built HTML directory (default: _build/html).",
+    )
+    parser.add_argument(
+        "--toc",
+        type=Path,
+        default=DEFAULT_TOC,
+        help="Jupyter Book table of contents listing the expected pages.",
+    )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Processes used to parse HTML files (default: CPU count).",
+    )
+    parser.add_argument(
+        "--log-level",
+        default="INFO",
+        choices=["CRITICAL", "ERROR", "WARNING", "INFO", "DEBUG"],
+        help="Logging verbosity (default: INFO).",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=getattr(logging, args.log_level),
+        format="%(levelname)s %(message)s",
+    )
+    logger = logging.getLogger(__name__)
+
+    if not args.site.exists():
+        logger.error("Built site not found at %s", args.site)
+        return 1
+
+    start = time.perf_counter()
+    report = check_site(args.site, load_expected_paths(args.toc), jobs=args.jobs)
+    logger.info(
+        "Parsed %d page(s) and %d link(s) in %.2fs; %d reachable from %s",
+        len(report.graph),
+        sum(len(links) for links in report.graph.values()),
+        time.perf_counter() - start,
+        len(report.reachable),
+        HOME_PAGE,
+    )
+    for page in report.unbuilt:
+        logger.error("Listed in _toc.yml but not built: %s", page)
+    for page in report.unreachable:
+        logger.error("Unreachable from %s: %s", HOME_PAGE, page)
+    for page, link in report.broken:
+        logger.error("Broken link in %s -> %s", page, link)
+    if report.ok:
+        logger.info("All _toc.yml pages reachable; no broken internal links.")
+    return 0 if report.ok else 1
+
+
+if __name__ == "__main__":  # pragma: no cover - entry point exercised via CLI
+    raise SystemExit(main())
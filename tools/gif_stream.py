@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""Streaming animated-GIF writer with bounded memory.
+
+Frames are appended to the output file as they arrive instead of being held
+until the end. Each frame is downscaled onto a fixed canvas, quantised to its
+own 256-colour palette and spliced into the file by a background thread, so
+memory use depends on the queue size rather than on how many frames there are.
+"""
+
+from __future__ import annotations
+
+import io
+import logging
+import queue
+import struct
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, BinaryIO, Optional, Tuple, Union
+
+if TYPE_CHECKING:  # pragma: no cover - Pillow is only needed when frames are encoded
+    from PIL import Image
+
+LOGGER = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+def _skip_sub_blocks(data: bytes, pos: int) -> int:
+    """Return the position just past a run of GIF data sub-blocks."""
+    while data[pos]:
+        pos += data[pos] + 1
+    return pos + 1
+
+
+def split_single_frame_gif(data: bytes) -> Tuple[bytes, bytes, bytes]:
+    """Split a one-frame GIF into (colour table, image descriptor, image data).
+
+    The colour table is the global one Pillow writes for a single frame; the
+    caller re-attaches it as a local table so every frame keeps its palette.
+    """
+    if data[:6] not in (b"GIF87a", b"GIF89a"):
+        raise ValueError("not a GIF stream")
+    flags = data[10]
+    pos = 13
+    table = b""
+    if flags & 0x80:
+        size = 3 * (2 << (flags & 0x07))
+        table = data[pos : pos + size]
+        pos += size
+
+    while pos < len(data):
+        block = data[pos]
+        if block == 0x21:  # extension: introducer, label, sub-blocks
+            pos = _skip_sub_blocks(data, pos + 2)
+        elif block == 0x2C:
+            descriptor = bytearray(data[pos : pos + 10])
+            pos += 10
+            if descriptor[9] & 0x80:  # Pillow wrote a local table; prefer it
+                size = 3 * (2 << (descriptor[9] & 0x07))
+                table = data[pos : pos + size]
+                pos += size
+            end = _skip_sub_blocks(data, pos + 1)  # LZW minimum code size, then data
+            return table, bytes(descriptor), data[pos:end]
+        else:
+            break
+    raise ValueError("GIF stream has no image block")
+
+
+class StreamingGifWriter:
+    """Append frames to an animated GIF from a background encoder thread.
+
+    ``add`` accepts encoded image bytes (e.g. a Playwright PNG screenshot) and
+    blocks once ``max_pending`` frames are waiting, which bounds memory. Frames
+    are scaled to the width of ``size`` and cropped to its height; shorter
+    frames are padded with ``background``.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        size: Tuple[int, int] = (640, 400),
+        duration: float = 0.5,
+        max_pending: int = 4,
+        background: Tuple[int, int, int] = (255, 255, 255),
+    ) -> None:
+        self.path = path
+        self.size = size
+        self.delay_cs = max(2, round(duration * 100))
+        self.background = background
+        self.frames = 0
+        self.error: Optional[BaseException] = None
+        self._pending: "queue.Queue[object]" = queue.Queue(maxsize=max(1, max_pending))
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._fh: BinaryIO = path.open("wb")
+        self._write_header()
+        self._thread = threading.Thread(target=self._run, name="gif-encoder", daemon=True)
+        self._thread.start()
+
+    def _write_header(self) -> None:
+        width, height = self.size
+        self._fh.write(b"GIF89a" + struct.pack("<HHBBB", width, height, 0, 0, 0))
+        # NETSCAPE2.0 application extension: loop forever.
+        self._fh.write(b"\x21\xff\x0bNETSCAPE2.0\x03\x01\x00\x00\x00")
+
+    def add(self, image: Union[bytes, bytearray]) -> None:
+        """Queue one encoded image; blocks while the encoder is behind."""
+        if self.error is not None:
+            raise RuntimeError("GIF encoder failed") from self.error
+        self._pending.put(bytes(image))
+
+    def _run(self) -> None:
+        while True:
+            item = self._pending.get()
+            if item is _STOP:
+                return
+            if self.error is not None:
+                continue  # drain so producers never block on a dead encoder
+            try:
+                self._append(item)  # type: ignore[arg-type]
+            except Exception as exc:  # pragma: no cover - surfaced via add()/close()
+                LOGGER.warning("Unable to encode GIF frame: %s", exc)
+                self.error = exc
+
+    def render(self, image: bytes) -> "Image.Image":
+        """Fit one frame to the canvas width, keep the top, and quantise it.
+
+        Full-page screenshots can be many viewports tall, so the source is
+        cropped to the visible part before resampling.
+        """
+        from PIL import Image
+
+        width, height = self.size
+        with Image.open(io.BytesIO(image)) as source:
+            scale = width / source.width
+            visible = min(source.height, max(1, round(height / scale)))
+            frame = source.convert("RGB").crop((0, 0, source.width, visible))
+        frame = frame.resize((width, max(1, round(visible * scale))), Image.Resampling.LANCZOS)
+        canvas = Image.new("RGB", self.size, self.background)
+        canvas.paste(frame, (0, 0))
+        return canvas.quantize(colors=256, method=Image.Quantize.MEDIANCUT)
+
+    def _append(self, image: bytes) -> None:
+        buffer = io.BytesIO()
+        self.render(image).save(buffer, format="GIF")
+        table, descriptor, data = split_single_frame_gif(buffer.getvalue())
+
+        # Graphics control extension: restore to background, per-frame delay.
+        self._fh.write(b"\x21\xf9\x04\x08" + struct.pack("<H", self.delay_cs) + b"\x00\x00")
+        flags = descriptor[9] & 0x40  # keep the interlace bit only
+        if table:
+            bits = max((len(table) // 3 - 1).bit_length(), 1)
+            table = table.ljust(3 * (1 << bits), b"\x00")
+            flags |= 0x80 | (bits - 1)
+        self._fh.write(descriptor[:9] + bytes([flags]) + table + data)
+        self.frames += 1
+
+    def close(self) -> int:
+        """Finish pending frames, write the trailer and return the frame count."""
+        if self._thread.is_alive():
+            self._pending.put(_STOP)
+            self._thread.join()
+        if not self._fh.closed:
+            self._fh.write(b"\x3b")
+            self._fh.close()
+        if self.error is not None:
+            raise RuntimeError("GIF encoder failed") from self.error
+        return self.frames
+
+    def __enter__(self) -> "StreamingGifWriter":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
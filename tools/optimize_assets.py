@@ -0,0 +1,460 @@
+#!/usr/bin/env python3
+"""Minify, bundle and content-hash the site's custom static assets after a build.
+
+Sphinx copies ``_static/`` verbatim and links each file separately with a
+``?v=`` query. This post-build step writes one minified, content-hashed file
+per bundle (e.g. ``_static/js/site.3f9c2a1b7d.js``), rewrites the references
+in every built page to point at it, and removes stray ``*.backup`` files from
+the output. Hashed names change whenever content does, so they can be served
+with far-future cache headers.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import logging
+import os
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_SITE = PROJECT_ROOT / "_build" / "html"
+HASH_LENGTH = 10
+
+LOGGER = logging.getLogger(__name__)
+
+
+# --------------------------------------------------------------------------- CSS
+
+
+def minify_css(source: str) -> str:
+    """Strip comments and redundant whitespace from a stylesheet.
+
+    Deliberately conservative: strings are copied verbatim and spaces are only
+    dropped around ``{ } ; , >`` and after ``:``, so descendant selectors such
+    as ``div :hover``, ``calc(a - b)`` and ``and (`` in media queries survive.
+    """
+    out: List[str] = []
+    i, n = 0, len(source)
+    while i < n:
+        char = source[i]
+        if char in "\"'":
+            end = _string_end(source, i)
+            out.append(source[i:end])
+            i = end
+        elif source.startswith("/*", i):
+            end = source.find("*/", i + 2)
+            i = n if end < 0 else end + 2
+            out.append(" ")
+        elif char.isspace():
+            while i < n and source[i].isspace():
+                i += 1
+            out.append(" ")
+        else:
+            out.append(char)
+            i += 1
+    def squeeze(chunk: str) -> str:
+        chunk = re.sub(r" ?([{};,>]) ?", r"\1", re.sub(r" +", " ", chunk))
+        return chunk.replace(": ", ":").replace(";}", "}")
+
+    return _outside_strings("".join(out), squeeze).strip()
+
+
+def _outside_strings(text: str, transform: Callable[[str], str]) -> str:
+    """Apply ``transform`` to the parts of ``text`` that are not quoted strings."""
+    parts: List[str] = []
+    start = i = 0
+    while i < len(text):
+        if text[i] in "\"'":
+            parts.append(transform(text[start:i]))
+            end = _string_end(text, i)
+            parts.append(text[i:end])
+            start = i = end
+        else:
+            i += 1
+    parts.append(transform(text[start:]))
+    return "".join(parts)
+
+
+def _string_end(text: str, start: int) -> int:
+    """Index just past the quoted string at ``start``."""
+    quote = text[start]
+    i = start + 1
+    while i < len(text):
+        if text[i] == "\\":
+            i += 2
+        elif text[i] == quote:
+            return i + 1
+        elif text[i] == "\n":
+            return i  # unterminated; leave the rest alone
+        else:
+            i += 1
+    return len(text)
+
+
+# ---------------------------------------------------------------------------- JS
+
+_IDENT = re.compile(r"[A-Za-z0-9_$\\]")
+# A ``/`` after one of these starts a regular expression literal, not a division.
+_REGEX_AFTER_PUNCT = set("(,=:[!&|?{};+-*%<>~^")
+_REGEX_AFTER_WORDS = {
+    "return", "typeof", "instanceof", "in", "of", "new", "delete", "void",
+    "throw", "case", "do", "else", "yield", "await",
+}
+
+
+def minify_js(source: str) -> str:
+    """Remove comments, indentation and blank lines from a script.
+
+    This is a whitespace-and-comments pass, not a renaming minifier. Strings,
+    template literals (including ``${...}`` expressions) and regular
+    expression literals are copied verbatim. Line breaks are kept wherever
+    automatic semicolon insertion could depend on them, so the output parses
+    exactly like the input.
+    """
+    out: List[str] = []
+    i, n = 0, len(source)
+    last_word = ""
+
+    def last_char() -> str:
+        return out[-1][-1] if out else ""
+
+    def regex_allowed() -> bool:
+        prev = last_char()
+        if not prev or prev == "\n":
+            return True
+        if _IDENT.match(prev):
+            return last_word in _REGEX_AFTER_WORDS
+        return prev in _REGEX_AFTER_PUNCT
+
+    while i < n:
+        char = source[i]
+        if char in "\"'":
+            end = _string_end(source, i)
+            out.append(source[i:end])
+            i, last_word = end, ""
+        elif char == "`":
+            end = _template_end(source, i)
+            out.append(source[i:end])
+            i, last_word = end, ""
+        elif source.startswith("//", i):
+            end = source.find("\n", i)
+            i = n if end < 0 else end  # the newline itself is handled as whitespace
+        elif source.startswith("/*", i):
+            end = source.find("*/", i + 2)
+            end = n if end < 0 else end + 2
+            _emit_space(out, source, end, newline="\n" in source[i:end])
+            i = end
+        elif char == "/" and regex_allowed():
+            end = _regex_end(source, i)
+            out.append(source[i:end])
+            i, last_word = end, ""
+        elif char.isspace():
+            start = i
+            while i < n and source[i].isspace():
+                i += 1
+            _emit_space(out, source, i, newline="\n" in source[start:i])
+        elif _IDENT.match(char):
+            start = i
+            while i < n and _IDENT.match(source[i]):
+                i += 2 if source[i] == "\\" else 1
+            last_word = source[start:i]
+            out.append(last_word)
+        else:
+            out.append(char)
+            i += 1
+            last_word = ""
+    return "".join(out).strip() + "\n"
+
+
+def _emit_space(out: List[str], source: str, next_index: int, *, newline: bool) -> None:
+    """Append the smallest separator that keeps the tokens around it apart."""
+    prev = out[-1][-1] if out else ""
+    nxt = source[next_index] if next_index < len(source) else ""
+    if not prev or prev in " \n" or not nxt:
+        return
+    if newline:
+        # A line break can only matter for semicolon insertion when it ends a
+        # statement that is not already terminated.
+        if prev not in "{;,(" and nxt not in "})]":
+            out.append("\n")
+            return
+    if (
+        (_IDENT.match(prev) and _IDENT.match(nxt))
+        or (prev in "+-" and nxt == prev)
+        or (len(out[-1]) > 1 and out[-1][0] == "/" and _IDENT.match(nxt))  # `/re/ in x`
+        or (prev.isdigit() and nxt == ".")  # `1 .toString()`
+    ):
+        out.append(" ")
+
+
+def _template_end(source: str, start: int) -> int:
+    """Index just past the template literal at ``start``, skipping ``${...}`` bodies."""
+    i = start + 1
+    while i < len(source):
+        char = source[i]
+        if char == "\\":
+            i += 2
+        elif char == "`":
+            return i + 1
+        elif source.startswith("${", i):
+            i = _expression_end(source, i + 2)
+        else:
+            i += 1
+    return len(source)
+
+
+def _expression_end(source: str, start: int) -> int:
+    """Index just past the ``}`` closing a template expression opened before ``start``."""
+    depth = 1
+    i = start
+    while i < len(source):
+        char = source[i]
+        if char in "\"'":
+            i = _string_end(source, i)
+        elif char == "`":
+            i = _template_end(source, i)
+        elif char == "{":
+            depth += 1
+            i += 1
+        elif char == "}":
+            depth -= 1
+            i += 1
+            if not depth:
+                return i
+        else:
+            i += 1
+    return len(source)
+
+
+def _regex_end(source: str, start: int) -> int:
+    """Index just past the regular expression literal (and flags) at ``start``."""
+    i = start + 1
+    in_class = False
+    while i < len(source):
+        char = source[i]
+        if char == "\\":
+            i += 2
+            continue
+        if char == "\n":
+            return i  # not a regex after all; copy up to the line end verbatim
+        if char == "[":
+            in_class = True
+        elif char == "]":
+            in_class = False
+        elif char == "/" and not in_class:
+            i += 1
+            while i < len(source) and source[i].isalpha():
+                i += 1
+            return i
+        i += 1
+    return len(source)
+
+
+# ----------------------------------------------------------------------- bundling
+
+
+@dataclass(frozen=True)
+class AssetBundle:
+    """Files under ``_static/`` that are shipped as one hashed output.
+
+    ``name`` is the output path without hash or suffix, e.g. ``js/site``.
+    Sources keep their order; for scripts it must match the page order.
+    ``defer`` marks the bundled script tag so it no longer blocks parsing.
+    """
+
+    name: str
+    kind: str  # "css" or "js"
+    sources: Tuple[str, ...]
+    defer: bool = False
+
+
+DEFAULT_BUNDLES = (
+    AssetBundle("css/custom", "css", ("css/custom.css",)),
+    # Both scripts wait for DOMContentLoaded, which deferred scripts precede.
+    AssetBundle("js/site", "js", ("js/onboarding.js", "js/mobile-nav.js"), defer=True),
+)
+
+_MINIFIERS: Dict[str, Callable[[str], str]] = {"css": minify_css, "js": minify_js}
+_SEPARATORS = {"css": "\n", "js": ";\n"}
+_TAG_PATTERNS = {
+    "css": r'[ \t]*<link\b[^>]*?\bhref="(?P<prefix>[^"]*?)_static/{src}(?:\?[^"]*)?"[^>]*>[ \t]*\n?',
+    "js": r'[ \t]*<script\b[^>]*?\bsrc="(?P<prefix>[^"]*?)_static/{src}(?:\?[^"]*)?"[^>]*>\s*</script>[ \t]*\n?',
+}
+
+
+@dataclass
+class BundleResult:
+    bundle: AssetBundle
+    output: str  # path under _static/
+    before_bytes: int
+    after_bytes: int
+
+
+@dataclass
+class OptimizeReport:
+    """Outcome of :func:`optimize_site`."""
+
+    bundles: List[BundleResult] = field(default_factory=list)
+    pages_rewritten: int = 0
+    requests_saved: int = 0
+    removed: List[str] = field(default_factory=list)
+
+    @property
+    def before_bytes(self) -> int:
+        return sum(result.before_bytes for result in self.bundles)
+
+    @property
+    def after_bytes(self) -> int:
+        return sum(result.after_bytes for result in self.bundles)
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=16).hexdigest()[:HASH_LENGTH]
+
+
+def bundle_text(kind: str, sources: Sequence[str]) -> str:
+    """Minify ``sources`` and join them the way a ``kind`` bundle is written."""
+    minify = _MINIFIERS[kind]
+    return _SEPARATORS[kind].join(minify(text).rstrip("\n;") for text in sources) + "\n"
+
+
+def build_bundle(static_root: Path, bundle: AssetBundle) -> Optional[BundleResult]:
+    """Write the minified, hashed bundle; ``None`` when a source is missing."""
+    paths = [static_root / source for source in bundle.sources]
+    missing = [str(path) for path in paths if not path.is_file()]
+    if missing:
+        LOGGER.debug("Skipping bundle %s; missing %s", bundle.name, ", ".join(missing))
+        return None
+
+    raw = [path.read_bytes() for path in paths]
+    data = bundle_text(bundle.kind, [chunk.decode("utf-8") for chunk in raw]).encode("utf-8")
+    output = f"{bundle.name}.{content_hash(data)}.{bundle.kind}"
+    target = static_root / output
+    if not target.exists():
+        tmp = target.with_suffix(".tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, target)
+
+    # Drop bundles left behind by earlier builds with different content.
+    stale = re.compile(rf"{re.escape(Path(bundle.name).name)}\.[0-9a-f]{{{HASH_LENGTH}}}\.{bundle.kind}")
+    for old in target.parent.iterdir():
+        if old != target and stale.fullmatch(old.name):
+            old.unlink()
+    return BundleResult(bundle, output, sum(map(len, raw)), len(data))
+
+
+def rewrite_page(html: str, results: Sequence[BundleResult]) -> Tuple[str, int]:
+    """Point a page at the bundles; returns the new HTML and requests saved.
+
+    A bundle only replaces its sources on pages that load all of them, so a
+    page never gains a script it did not have.
+    """
+    saved = 0
+    for result in results:
+        pattern = _TAG_PATTERNS[result.bundle.kind]
+        matches = [
+            re.search(pattern.format(src=re.escape(source)), html) for source in result.bundle.sources
+        ]
+        if not all(matches):
+            continue
+        first, *rest = sorted(matches, key=lambda match: match.start())
+        attribute = "href" if result.bundle.kind == "css" else "src"
+        old_url = re.search(rf'\b{attribute}="([^"]*)"', first.group()).group(1)
+        tag = first.group().replace(old_url, f"{first.group('prefix')}_static/{result.output}", 1)
+        if result.bundle.defer and not re.search(r"\b(?:defer|async)\b", tag.split(">", 1)[0]):
+            tag = tag.replace("<script", "<script defer", 1)
+        for match in sorted(rest, key=lambda match: match.start(), reverse=True):
+            html = html[: match.start()] + html[match.end() :]
+        html = html[: first.start()] + tag + html[first.end() :]
+        saved += len(rest)
+    return html, saved
+
+
+def optimize_site(site_root: Path, bundles: Sequence[AssetBundle] = DEFAULT_BUNDLES) -> OptimizeReport:
+    """Bundle assets under ``site_root/_static`` and rewrite every built page."""
+    report = OptimizeReport()
+    static_root = site_root / "_static"
+    if not static_root.is_dir():
+        return report
+
+    for bundle in bundles:
+        result = build_bundle(static_root, bundle)
+        if result:
+            report.bundles.append(result)
+
+    for backup in sorted(static_root.rglob("*.backup")):
+        backup.unlink()
+        report.removed.append(backup.relative_to(site_root).as_posix())
+
+    if not report.bundles:
+        return report
+    for dirpath, dirnames, filenames in os.walk(site_root):
+        dirnames[:] = [d for d in dirnames if not d.startswith(("_", "."))]
+        for name in filenames:
+            if not name.endswith(".html"):
+                continue
+            path = Path(dirpath) / name
+            html = path.read_text(encoding="utf-8")
+            rewritten, saved = rewrite_page(html, report.bundles)
+            if rewritten != html:
+                path.write_text(rewritten, encoding="utf-8")
+                report.pages_rewritten += 1
+                report.requests_saved += saved
+    return report
+
+
+def log_report(report: OptimizeReport) -> None:
+    for result in report.bundles:
+        LOGGER.info(
+            "%-28s %2d file(s) %8d -> %7d bytes (-%.0f%%)",
+            result.output,
+            len(result.bundle.sources),
+            result.before_bytes,
+            result.after_bytes,
+            100 * (1 - result.after_bytes / max(result.before_bytes, 1)),
+        )
+    for rel_path in report.removed:
+        LOGGER.info("Removed %s from the build output", rel_path)
+    if report.bundles:
+        LOGGER.info(
+            "Assets %d -> %d bytes; rewrote %d page(s), %d fewer request(s) per page",
+            report.before_bytes,
+            report.after_bytes,
+            report.pages_rewritten,
+            report.requests_saved // max(report.pages_rewritten, 1),
+        )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--site",
+        type=Path,
+        default=DEFAULT_SITE,
+        help="Built HTML directory (default: _build/html).",
+    )
+    parser.add_argument(
+        "--log-level",
+        default="INFO",
+        choices=["CRITICAL", "ERROR", "WARNING", "INFO", "DEBUG"],
+        help="Logging verbosity (default: INFO).",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=getattr(logging, args.log_level),
+        format="%(levelname)s %(message)s",
+    )
+    if not args.site.exists():
+        LOGGER.error("Built site not found at %s", args.site)
+        return 1
+    log_report(optimize_site(args.site))
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover - entry point exercised via CLI
+    raise SystemExit(main())
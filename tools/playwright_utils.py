@@ -3,15 +3,57 @@
 
 from __future__ import annotations
 
+import contextlib
+import functools
+import json
 import logging
+import os
+import statistics
+import threading
+from collections import deque
+from dataclasses import dataclass, fields
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
-from typing import Optional, Set
+from typing import Any, Collection, Deque, Dict, Iterable, Iterator, List, Mapping, Optional, Set
 from urllib.parse import urldefrag, urljoin, urlparse
 
 import yaml
 
 LOGGER = logging.getLogger(__name__)
 
+# Request types a link crawl never needs; see block_heavy_resources().
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "font", "media"})
+
+# Hrefs that never lead to another page of the site.
+SKIPPED_HREF_PREFIXES = ("mailto:", "javascript:", "#")
+
+# Collects every raw href attribute in a single browser round-trip.
+LINK_EXTRACTION_JS = (
+    "() => Array.from(document.querySelectorAll('a[href]'), (a) => a.getAttribute('href'))"
+)
+
+# Navigation Timing, paint timings, DOM size and transferred bytes in a single
+# browser round-trip. Times are milliseconds from navigation start; entries the
+# browser has not recorded (e.g. ``load`` before the event fired) are null.
+PAGE_METRICS_JS = """() => {
+  const nav = performance.getEntriesByType('navigation')[0];
+  const since = (t) => (nav && t > 0 ? t - nav.startTime : null);
+  const paint = {};
+  for (const entry of performance.getEntriesByType('paint')) paint[entry.name] = entry.startTime;
+  const bytes = (entry) => entry.transferSize || entry.encodedBodySize || 0;
+  const resources = performance.getEntriesByType('resource');
+  return {
+    ttfb_ms: nav ? since(nav.responseStart) : null,
+    dom_content_loaded_ms: nav ? since(nav.domContentLoadedEventEnd) : null,
+    load_ms: nav ? since(nav.loadEventEnd) : null,
+    first_paint_ms: paint['first-paint'] ?? null,
+    first_contentful_paint_ms: paint['first-contentful-paint'] ?? null,
+    dom_nodes: document.getElementsByTagName('*').length,
+    resources: resources.length,
+    transfer_bytes: resources.reduce((total, entry) => total + bytes(entry), nav ? bytes(nav) : 0),
+  };
+}"""
+
 
 def load_expected_paths(toc_path: Path, *, suffix: str = ".html") -> Set[str]:
     """Return the set of HTML outputs defined in a Jupyter Book _toc.yml file."""
@@ -31,6 +73,50 @@ def load_expected_paths(toc_path: Path, *, suffix: str = ".html") -> Set[str]:
     return expected
 
 
+class CrawlFrontier:
+    """BFS work queue with O(1) membership checks and optional priority pages.
+
+    Every path is queued at most once: ``in`` answers "already queued or
+    popped", so callers never need to scan the queue. Paths in ``priority``
+    (typically the pages listed in ``_toc.yml``) are popped before the rest,
+    each group in FIFO order.
+    """
+
+    def __init__(self, start: Iterable[str] = (), *, priority: Iterable[str] = ()) -> None:
+        self.priority = set(priority)
+        self._first: Deque[str] = deque()
+        self._rest: Deque[str] = deque()
+        self._seen: Set[str] = set()
+        self.extend(start)
+
+    def push(self, path: str) -> bool:
+        """Queue ``path`` unless it was seen before; returns whether it was added."""
+        if path in self._seen:
+            return False
+        self._seen.add(path)
+        (self._first if path in self.priority else self._rest).append(path)
+        return True
+
+    def extend(self, paths: Iterable[str]) -> int:
+        """Queue every unseen path; returns how many were added."""
+        return sum(self.push(path) for path in paths)
+
+    def pop(self) -> str:
+        """Return the next path to visit; raises ``IndexError`` when empty."""
+        return self._first.popleft() if self._first else self._rest.popleft()
+
+    def __contains__(self, path: object) -> bool:
+        return path in self._seen
+
+    def __len__(self) -> int:
+        return len(self._first) + len(self._rest)
+
+    @property
+    def seen(self) -> int:
+        """Number of distinct paths ever queued."""
+        return len(self._seen)
+
+
 def canonicalize_relative(relative: str, *, home_page: str) -> Optional[str]:
     """Normalise a relative path into our canonical `.html` representation."""
     parsed = urlparse(relative)
@@ -56,7 +142,7 @@ def canonicalize_relative(relative: str, *, home_page: str) -> Optional[str]:
 
 def normalize_internal_href(base_url: str, href: str, *, home_page: str) -> Optional[str]:
     """Return a canonical relative path for internal links, or None when external."""
-    if not href or href.startswith(("mailto:", "javascript:", "#")):
+    if not href or href.startswith(SKIPPED_HREF_PREFIXES):
         return None
 
     absolute = urljoin(base_url, href)
@@ -67,3 +153,246 @@ def normalize_internal_href(base_url: str, href: str, *, home_page: str) -> Opti
 
     relative = absolute[len(base_url) :]
     return canonicalize_relative(relative, home_page=home_page)
+
+
+class LinkCanonicalizer:
+    """Memoised :func:`normalize_internal_href` keyed by ``(page URL, href)``.
+
+    Sidebar and navigation links repeat on every page of a Jupyter Book, so a
+    bounded LRU cache turns most lookups into a dictionary hit. Hrefs are
+    resolved against the page they appear on before being canonicalised, and
+    in-page anchors are skipped before the cache so they do not evict shared
+    links. ``hits``/``misses`` are exposed for crawl logs.
+    """
+
+    def __init__(self, base_url: str, *, home_page: str, maxsize: int = 8192) -> None:
+        self.base_url = base_url
+        self.home_page = home_page
+        self._cached = functools.lru_cache(maxsize=maxsize)(self._canonicalize)
+
+    def _canonicalize(self, page_url: str, href: str) -> Optional[str]:
+        absolute = urljoin(page_url, href)
+        return normalize_internal_href(self.base_url, absolute, home_page=self.home_page)
+
+    def __call__(self, href: Optional[str], page_url: Optional[str] = None) -> Optional[str]:
+        if not href or href.startswith(SKIPPED_HREF_PREFIXES):
+            return None
+        return self._cached(page_url or self.base_url, href)
+
+    def links(self, hrefs: Iterable[Optional[str]], page_url: Optional[str] = None) -> List[str]:
+        """Unique canonical internal paths from ``hrefs``, in page order."""
+        seen: Set[str] = set()
+        links: List[str] = []
+        for href in dict.fromkeys(hrefs):
+            candidate = self(href, page_url)
+            if candidate and candidate not in seen:
+                seen.add(candidate)
+                links.append(candidate)
+        return links
+
+    @property
+    def hits(self) -> int:
+        return self._cached.cache_info().hits
+
+    @property
+    def misses(self) -> int:
+        return self._cached.cache_info().misses
+
+    def stats(self) -> str:
+        """One-line summary for crawl logs."""
+        info = self._cached.cache_info()
+        lookups = info.hits + info.misses
+        rate = 100 * info.hits / lookups if lookups else 0.0
+        return (
+            f"link canonicalisation: {info.hits} hits, {info.misses} misses "
+            f"({rate:.0f}% hit rate), {info.currsize}/{info.maxsize} cached"
+        )
+
+
+async def extract_internal_links(
+    page: Any,
+    base_url: str,
+    *,
+    home_page: str,
+    canonicalizer: Optional[LinkCanonicalizer] = None,
+) -> List[str]:
+    """Return the canonical internal links on ``page`` using one ``evaluate`` call.
+
+    Pass a shared ``canonicalizer`` to reuse normalisation results across pages.
+    """
+    hrefs = await page.evaluate(LINK_EXTRACTION_JS)
+    if canonicalizer is None:
+        canonicalizer = LinkCanonicalizer(base_url, home_page=home_page)
+    return canonicalizer.links(hrefs, page_url=page.url)
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002 - stdlib signature
+        LOGGER.debug("static server: " + format, *args)
+
+
+class _PrecompressedHandler(_QuietHandler):
+    """Serves ``name.br``/``name.gz`` siblings when the client accepts them.
+
+    A sibling older than its source is stale and ignored.
+    """
+
+    encodings = (("br", ".br"), ("gzip", ".gz"))
+
+    def _accepted(self) -> Set[str]:
+        accepted = set()
+        for token in self.headers.get("Accept-Encoding", "").split(","):
+            name, _, params = token.partition(";")
+            params = params.replace(" ", "")
+            try:
+                quality = float(params[2:]) if params.startswith("q=") else 1.0
+            except ValueError:
+                quality = 1.0
+            if quality > 0:
+                accepted.add(name.strip().lower())
+        return accepted
+
+    def send_head(self):  # type: ignore[override] - stdlib returns Optional[BinaryIO]
+        path = self.translate_path(self.path)
+        if os.path.isfile(path):
+            accepted = self._accepted()
+            source_mtime = os.stat(path).st_mtime_ns
+            for encoding, suffix in self.encodings:
+                if encoding not in accepted or not os.path.isfile(path + suffix):
+                    continue
+                if os.stat(path + suffix).st_mtime_ns < source_mtime:
+                    continue
+                fh = open(path + suffix, "rb")
+                stat = os.fstat(fh.fileno())
+                self.send_response(200)
+                self.send_header("Content-Type", self.guess_type(path))
+                self.send_header("Content-Encoding", encoding)
+                self.send_header("Content-Length", str(stat.st_size))
+                self.send_header("Vary", "Accept-Encoding")
+                self.send_header("Last-Modified", self.date_time_string(stat.st_mtime))
+                self.end_headers()
+                return fh
+        return super().send_head()
+
+
+@contextlib.contextmanager
+def serve_directory(
+    root: Path, *, host: str = "127.0.0.1", port: int = 0, precompressed: bool = False
+) -> Iterator[str]:
+    """Serve ``root`` over HTTP on a background thread; yields the base URL.
+
+    Playwright request routing does not apply to ``file://`` pages, so crawls
+    that block resources need the built site served over loopback HTTP. With
+    ``precompressed`` the ``.br``/``.gz`` siblings written by
+    :mod:`tools.precompress` are sent with a matching ``Content-Encoding``.
+    """
+    handler_class = _PrecompressedHandler if precompressed else _QuietHandler
+    handler = functools.partial(handler_class, directory=str(root))
+    server = ThreadingHTTPServer((host, port), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://{host}:{server.server_address[1]}/"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+async def block_heavy_resources(
+    context: Any, resource_types: Collection[str] = BLOCKED_RESOURCE_TYPES
+) -> None:
+    """Abort requests of ``resource_types`` (images, fonts, media) for a browser context."""
+
+    async def handle(route: Any) -> None:
+        if route.request.resource_type in resource_types:
+            await route.abort()
+        else:
+            await route.continue_()
+
+    await context.route("**/*", handle)
+
+
+async def collect_page_metrics(page: Any) -> Dict[str, Any]:
+    """Return timing, DOM-size and transfer metrics for ``page`` in one ``evaluate``."""
+    return await page.evaluate(PAGE_METRICS_JS)
+
+
+@dataclass(frozen=True)
+class PerformanceBudget:
+    """Per-page upper bounds for metrics from :func:`collect_page_metrics`.
+
+    ``None`` disables a limit. Metrics the browser did not report are not
+    violations; :meth:`missing` lists them so callers can warn or fail.
+    Timings are only complete for pages measured after the ``load`` event
+    with no requests blocked.
+    """
+
+    dom_content_loaded_ms: Optional[float] = 5_000
+    first_contentful_paint_ms: Optional[float] = 5_000
+    load_ms: Optional[float] = 10_000
+    dom_nodes: Optional[int] = 15_000
+    transfer_bytes: Optional[int] = 8 * 1024 * 1024
+
+    @classmethod
+    def from_env(cls, environ: Mapping[str, str] = os.environ, prefix: str = "SITE_BUDGET_") -> "PerformanceBudget":
+        """Override limits from e.g. ``SITE_BUDGET_DOM_NODES=20000``; ``0`` disables one."""
+        overrides: Dict[str, Optional[float]] = {}
+        for spec in fields(cls):
+            raw = environ.get(prefix + spec.name.upper())
+            if raw is not None:
+                value = float(raw)
+                overrides[spec.name] = value if value > 0 else None
+        return cls(**overrides)
+
+    def violations(self, metrics: Mapping[str, Any]) -> List[str]:
+        """Describe every metric in ``metrics`` that exceeds its limit."""
+        problems = []
+        for spec in fields(self):
+            limit = getattr(self, spec.name)
+            value = metrics.get(spec.name)
+            if limit is not None and value is not None and value > limit:
+                problems.append(f"{spec.name} {value:g} > {limit:g}")
+        return problems
+
+    def missing(self, metrics: Mapping[str, Any]) -> List[str]:
+        """Names of budgeted metrics that ``metrics`` has no value for."""
+        return [
+            spec.name
+            for spec in fields(self)
+            if getattr(self, spec.name) is not None and metrics.get(spec.name) is None
+        ]
+
+
+def write_metrics_report(
+    path: Path, metrics: Mapping[str, Mapping[str, Any]], budget: Optional[PerformanceBudget] = None
+) -> Dict[str, Any]:
+    """Write per-page metrics plus a summary (mean/max per metric) as JSON.
+
+    Pages over ``budget`` are listed under ``violations``, and budgeted
+    metrics a page did not report under ``missing``. Returns the report.
+    """
+    summary: Dict[str, Dict[str, float]] = {}
+    for name in sorted({key for page in metrics.values() for key in page}):
+        values = [page[name] for page in metrics.values() if isinstance(page.get(name), (int, float))]
+        if values:
+            summary[name] = {"mean": statistics.mean(values), "max": max(values)}
+    report: Dict[str, Any] = {
+        "pages": {page: dict(metrics[page]) for page in sorted(metrics)},
+        "summary": summary,
+    }
+    if budget is not None:
+        report["budget"] = {spec.name: getattr(budget, spec.name) for spec in fields(budget)}
+        report["violations"] = {
+            page: problems
+            for page in sorted(metrics)
+            if (problems := budget.violations(metrics[page]))
+        }
+        report["missing"] = {
+            page: absent for page in sorted(metrics) if (absent := budget.missing(metrics[page]))
+        }
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(report, indent=2))
+    os.replace(tmp, path)
+    return report
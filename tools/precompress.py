@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""Write precompressed ``.gz``/``.br`` siblings for the built site's text assets.
+
+Static hosts and :func:`tools.playwright_utils.serve_directory` (with
+``precompressed=True``) can then send ``page.html.br`` with
+``Content-Encoding: br`` instead of compressing on every request. Files are
+compressed in a process pool; siblings newer than their source are reused, and
+siblings of sources that disappeared or fell below the size threshold are
+removed. Only siblings of compressible types are touched, so shipped archives
+such as ``data.csv.gz`` are left alone. Brotli output needs the optional
+``brotli`` package and is skipped without it.
+
+Run with ``--serve`` to preview the compressed site on a local port.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import importlib.util
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple
+
+if __package__ in (None, ""):  # allow `python tools/precompress.py`
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_SITE = PROJECT_ROOT / "_build" / "html"
+COMPRESSIBLE_SUFFIXES = (".html", ".css", ".js", ".svg", ".json")
+# Below this size the framing overhead outweighs the savings.
+MIN_SIZE = 512
+ENCODINGS = {"gzip": ".gz", "br": ".br"}
+# Maximum quality: roughly 20% smaller than gzip -9 here, at ~30x the CPU cost.
+# Siblings are reused across builds, so only changed files pay it.
+BROTLI_QUALITY = 11
+
+LOGGER = logging.getLogger(__name__)
+
+
+def available_encodings() -> Tuple[str, ...]:
+    """``gzip`` always; ``br`` when the ``brotli`` package is installed."""
+    if importlib.util.find_spec("brotli") is None:
+        return ("gzip",)
+    return ("gzip", "br")
+
+
+def _compress(data: bytes, encoding: str, brotli_quality: int = BROTLI_QUALITY) -> bytes:
+    if encoding == "gzip":
+        # mtime=0 keeps the output byte-identical across builds.
+        return gzip.compress(data, compresslevel=9, mtime=0)
+    import brotli
+
+    return brotli.compress(data, quality=brotli_quality)
+
+
+def compress_file(
+    path: Path, encodings: Sequence[str], brotli_quality: int = BROTLI_QUALITY
+) -> Dict[str, int]:
+    """Write missing or outdated siblings of ``path``; returns their sizes.
+
+    A sibling that would not be smaller than the source is not written (and an
+    old one is removed), so servers fall back to the plain file.
+    """
+    sizes: Dict[str, int] = {}
+    stat = path.stat()
+    data = None
+    for encoding in encodings:
+        target = path.with_name(path.name + ENCODINGS[encoding])
+        try:
+            if target.stat().st_mtime_ns >= stat.st_mtime_ns:
+                sizes[encoding] = target.stat().st_size
+                continue
+        except FileNotFoundError:
+            pass
+        if data is None:
+            data = path.read_bytes()
+        compressed = _compress(data, encoding, brotli_quality)
+        if len(compressed) >= len(data):
+            target.unlink(missing_ok=True)
+            continue
+        tmp = target.with_name(target.name + ".tmp")
+        tmp.write_bytes(compressed)
+        os.replace(tmp, target)
+        sizes[encoding] = len(compressed)
+    return sizes
+
+
+def _compress_task(args: Tuple[Path, Tuple[str, ...], int]) -> Tuple[Path, int, Dict[str, int]]:
+    path, encodings, brotli_quality = args
+    return path, path.stat().st_size, compress_file(path, encodings, brotli_quality)
+
+
+@dataclass
+class CompressionReport:
+    """Totals for one :func:`precompress_site` run."""
+
+    files: int = 0
+    original_bytes: int = 0
+    compressed_bytes: Dict[str, int] = field(default_factory=dict)
+    removed: List[str] = field(default_factory=list)
+
+    def ratio(self, encoding: str) -> float:
+        return self.compressed_bytes.get(encoding, 0) / max(self.original_bytes, 1)
+
+
+def compressible_files(site_root: Path, min_size: int = MIN_SIZE) -> List[Path]:
+    return sorted(
+        path
+        for path in site_root.rglob("*")
+        if path.suffix in COMPRESSIBLE_SUFFIXES and path.is_file() and path.stat().st_size >= min_size
+    )
+
+
+def precompress_site(
+    site_root: Path,
+    *,
+    encodings: Sequence[str] = (),
+    jobs: int = 1,
+    min_size: int = MIN_SIZE,
+    brotli_quality: int = BROTLI_QUALITY,
+) -> CompressionReport:
+    """Compress every HTML/CSS/JS (and SVG/JSON) file under ``site_root``.
+
+    ``encodings`` defaults to :func:`available_encodings`. Sizes in the report
+    cover files that have a sibling; the others are served uncompressed.
+    """
+    encodings = tuple(encodings or available_encodings())
+    report = CompressionReport(compressed_bytes={encoding: 0 for encoding in encodings})
+    if not site_root.is_dir():
+        return report
+
+    sources = compressible_files(site_root, min_size)
+    wanted = {path.with_name(path.name + ENCODINGS[encoding]) for path in sources for encoding in encodings}
+    for suffix in ENCODINGS.values():
+        for sibling in site_root.rglob(f"*{suffix}"):
+            if sibling.with_suffix("").suffix in COMPRESSIBLE_SUFFIXES and sibling not in wanted:
+                sibling.unlink()
+                report.removed.append(sibling.relative_to(site_root).as_posix())
+
+    tasks = [(path, encodings, brotli_quality) for path in sources]
+    if jobs > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(tasks))) as executor:
+            results = list(executor.map(_compress_task, tasks, chunksize=8))
+    else:
+        results = [_compress_task(task) for task in tasks]
+
+    for _, size, sizes in results:
+        report.files += 1
+        report.original_bytes += size
+        for encoding in encodings:
+            report.compressed_bytes[encoding] += sizes.get(encoding, size)
+    return report
+
+
+def log_report(report: CompressionReport, elapsed: float) -> None:
+    for encoding, total in report.compressed_bytes.items():
+        LOGGER.info(
+            "%-4s %d file(s): %d -> %d bytes (%.0f%% of original)",
+            encoding,
+            report.files,
+            report.original_bytes,
+            total,
+            100 * report.ratio(encoding),
+        )
+    if report.removed:
+        LOGGER.info("Removed %d orphaned sibling(s)", len(report.removed))
+    LOGGER.info("Precompression finished in %.2fs", elapsed)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--site",
+        type=Path,
+        default=DEFAULT_SITE,
+        help="Built HTML directory (default: _build/html).",
+    )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Processes used for compression (default: CPU count).",
+    )
+    parser.add_argument(
+        "--brotli-quality",
+        type=int,
+        default=BROTLI_QUALITY,
+        choices=range(12),
+        metavar="0-11",
+        help=f"Brotli quality; lower is much faster (default: {BROTLI_QUALITY}).",
+    )
+    parser.add_argument(
+        "--serve",
+        type=int,
+        metavar="PORT",
+        help="After compressing, serve the site with Content-Encoding negotiation on PORT.",
+    )
+    parser.add_argument(
+        "--log-level",
+        default="INFO",
+        choices=["CRITICAL", "ERROR", "WARNING", "INFO", "DEBUG"],
+        help="Logging verbosity (default: INFO).",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=getattr(logging, args.log_level),
+        format="%(levelname)s %(message)s",
+    )
+    if not args.site.exists():
+        LOGGER.error("Built site not found at %s", args.site)
+        return 1
+    if "br" not in available_encodings():
+        LOGGER.warning("brotli is not installed; writing gzip siblings only")
+
+    start = time.perf_counter()
+    log_report(precompress_site(args.site, jobs=args.jobs, brotli_quality=args.brotli_quality), time.perf_counter() - start)
+
+    if args.serve is not None:
+        from tools.playwright_utils import serve_directory
+
+        with serve_directory(args.site, port=args.serve, precompressed=True) as base_url:
+            LOGGER.info("Serving %s at %s (Ctrl-C to stop)", args.site, base_url)
+            try:
+                while True:
+                    time.sleep(3600)
+            except KeyboardInterrupt:
+                pass
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover - entry point exercised via CLI
+    raise SystemExit(main())